@@ -0,0 +1,9 @@
+import logging
+import sys
+
+from src.async_app import app
+
+logging.basicConfig(stream=sys.stderr)
+
+if __name__ == "__main__":
+    app.run()
@@ -0,0 +1,170 @@
+"""
+Benchmark of the throughput and latency of the sync stack (gunicorn with a
+sync worker) versus the async stack (hypercorn with the ASGI app) under
+concurrent requests. Both servers run a single worker process on the same
+database, so the difference is how many requests a worker overlaps while
+waiting on the database.
+
+Run from the project root with:
+    python -m benchmarks.async_stack --concurrency 64 --requests 2000
+
+Use --database-uri with a Postgres database for realistic database waits,
+the default sqlite database has almost none.
+"""
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src import api
+from src.config import Config
+from src.create_app import create_app
+from src.domain import SQLALCHEMY_DATABASE_URI, SERVICE_PREFIX
+from src.infrastructure import sqlalchemy_db as db, setup_sqlalchemy
+
+SERVERS = {
+    "gunicorn": [
+        sys.executable, "-m", "gunicorn", "wsgi:app", "--workers", "1",
+        "--worker-class", "sync", "--bind", "127.0.0.1:{port}"
+    ],
+    "hypercorn": [
+        sys.executable, "-m", "hypercorn", "asgi:app", "--workers", "1",
+        "--bind", "127.0.0.1:{port}"
+    ],
+}
+
+
+def create_database(database_uri, items):
+    config = Config()
+    config[SQLALCHEMY_DATABASE_URI] = database_uri
+    app = create_app(
+        config, dependency_container_packages=[api], setup_sqlalchemy=False
+    )
+    setup_sqlalchemy(app)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        app.container.todo_service().create_many([
+            {"title": f"Todo {index}", "description": "Description"}
+            for index in range(items)
+        ])
+
+
+def get_free_port():
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, timeout=30):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+
+    raise RuntimeError(f"The server on port {port} did not start")
+
+
+def run_load(port, path, requests, concurrency):
+    """
+    Sends the requests from concurrency threads that each reuse a
+    connection, and returns the wall time and the latencies in seconds.
+    """
+    local = threading.local()
+
+    def send(_):
+
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection(
+                "127.0.0.1", port, timeout=60
+            )
+
+        start = time.perf_counter()
+        local.connection.request("GET", path)
+        response = local.connection.getresponse()
+        response.read()
+
+        if response.status != 200:
+            raise RuntimeError(f"{path} returned {response.status}")
+
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(send, range(requests)))
+
+    return time.perf_counter() - start, latencies
+
+
+def benchmark_server(name, environment, path, args):
+    port = get_free_port()
+    command = [part.format(port=port) for part in SERVERS[name]]
+    server = subprocess.Popen(
+        command,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    try:
+        wait_for_server(port)
+        # Warm up the connection pool and the caches of the worker
+        run_load(port, path, args.concurrency, args.concurrency)
+        return run_load(port, path, args.requests, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--database-uri", default=None)
+    args = parser.parse_args()
+
+    database_uri = args.database_uri or "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "benchmark.db"
+    )
+    create_database(database_uri, args.items)
+    environment = {
+        **os.environ,
+        SQLALCHEMY_DATABASE_URI: database_uri,
+        SERVICE_PREFIX: "",
+    }
+    path = f"/v1/todo?itemized=true&per_page={args.per_page}"
+
+    print(
+        f"{'server':<12}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'max ms':>9}"
+    )
+
+    for name in SERVERS:
+        elapsed, latencies = benchmark_server(name, environment, path, args)
+        percentiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{name:<12}{len(latencies) / elapsed:>9.0f}"
+            f"{percentiles[49] * 1000:>9.1f}{percentiles[98] * 1000:>9.1f}"
+            f"{max(latencies) * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark of the CPU time versus the compressed size of the encodings
+and levels supported by the CompressionMiddleware.
+
+Run from the project root with:
+    python -m benchmarks.compression --items 1000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+from src.api.middleware import CompressionMiddleware
+
+LEVELS = {
+    "gzip": [1, 6, 9],
+    "deflate": [1, 6, 9],
+    "br": [1, 4, 6, 11],
+    "zstd": [1, 3, 9, 19],
+}
+
+
+def create_payload(items):
+    now = datetime.now(tz=timezone.utc).isoformat()
+    return json.dumps({
+        "items": [
+            {
+                "id": index,
+                "title": f"Todo {index}",
+                "description": "Description of the todo item",
+                "completed": index % 2 == 0,
+                "created_at": now,
+                "updated_at": None,
+            }
+            for index in range(items)
+        ]
+    }).encode()
+
+
+def measure(middleware, encoding, payload, repeat):
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        compressor = middleware.create_compressor(encoding)
+        data = compressor.compress(payload) + compressor.finish()
+
+    elapsed = (time.perf_counter() - start) / repeat
+    return len(data), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = create_payload(args.items)
+    print(f"uncompressed: {len(payload)} bytes")
+    print(f"{'encoding':<10}{'level':>6}{'bytes':>10}{'ratio':>8}{'ms':>9}")
+
+    for encoding, levels in LEVELS.items():
+        middleware = CompressionMiddleware(None)
+
+        if encoding not in middleware.encodings:
+            print(f"{encoding:<10} not installed")
+            continue
+
+        for level in levels:
+            middleware.levels[encoding] = level
+            size, elapsed = measure(
+                middleware, encoding, payload, args.repeat
+            )
+            print(
+                f"{encoding:<10}{level:>6}{size:>10}"
+                f"{len(payload) / size:>8.1f}{elapsed * 1000:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark of the per request overhead of injecting the todo service into a
+wired view with the transient scope (a new service and repository per
+injection, as before lifetime scopes), the request scope and the
+singleton scope, and of wiring the api.
+
+Run from the project root with:
+    python -m benchmarks.dependency_injection --requests 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from dependency_injector.wiring import inject, Provide
+
+from src import api
+from src.config import Config
+from src.create_app import create_app
+from src.dependency_container import DependencyContainer, \
+    setup_dependency_scopes
+from src.domain import SQLALCHEMY_DATABASE_URI, SCOPES
+
+
+@inject
+def view(todo_service=Provide[DependencyContainer.todo_service]):
+    return todo_service
+
+
+def create_benchmark_app(database_uri):
+    config = Config()
+    config[SQLALCHEMY_DATABASE_URI] = database_uri
+    return create_app(
+        config, dependency_container_modules=[sys.modules[__name__]]
+    )
+
+
+def measure(app, requests, injections):
+    """
+    Returns the mean time in microseconds of an app context, which Flask
+    pushes per request, with the given number of injections.
+    """
+    start = time.perf_counter()
+
+    for _ in range(requests):
+
+        with app.app_context():
+
+            for _ in range(injections):
+                view()
+
+    return (time.perf_counter() - start) / requests * 1000000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--injections", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_benchmark_app(
+        "sqlite:///" + os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    )
+    baseline = min(
+        measure(app, args.requests, 0) for _ in range(args.repeat)
+    )
+
+    print(f"{'scope':<12}{'us/request':>12}{'overhead us':>13}")
+
+    providers = ["todo_repository", "todo_service"]
+
+    for scope in SCOPES:
+
+        for name in providers:
+            app.container.providers[name].reset_override()
+
+        setup_dependency_scopes(
+            app.container, {name: scope for name in providers}
+        )
+        elapsed = min(
+            measure(app, args.requests, args.injections)
+            for _ in range(args.repeat)
+        )
+        print(f"{scope:<12}{elapsed:>12.2f}{elapsed - baseline:>13.2f}")
+
+    start = time.perf_counter()
+
+    for _ in range(args.repeat):
+        app.container.wire(packages=[api])
+
+    print(
+        f"wiring the api takes "
+        f"{(time.perf_counter() - start) / args.repeat * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
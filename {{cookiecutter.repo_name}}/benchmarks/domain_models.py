@@ -0,0 +1,82 @@
+"""
+Benchmark of the memory and creation time of the slotted domain models
+versus plain __dict__ classes (the previous implementation of Todo), and
+of their conversions from rows (from_row) and dicts (from_dict).
+
+Run from the project root with:
+    python -m benchmarks.domain_models --items 100000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from src.domain import Todo
+
+
+class DictTodo:
+
+    def __init__(
+        self,
+        title,
+        description,
+        created_at=None,
+        updated_at=None,
+        completed=False,
+        id=None
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.completed = completed
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+
+def measure(create, rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+    instances = [create(row) for row in rows]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(instances), elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    rows = [
+        (index, f"Todo {index}", "Description", False, now, None)
+        for index in range(args.items)
+    ]
+    candidates = [
+        (
+            "dict",
+            lambda row: DictTodo(
+                row[1], row[2], row[4], row[5], row[3], id=row[0]
+            )
+        ),
+        (
+            "slots",
+            lambda row: Todo(row[1], row[2], row[4], row[5], row[3], id=row[0])
+        ),
+        ("from_row", Todo.from_row),
+        (
+            "from_dict",
+            lambda row: Todo.from_dict(dict(zip(Todo._field_names, row)))
+        ),
+    ]
+
+    print(f"{'model':<10}{'ms':>9}{'bytes/item':>12}")
+
+    for name, create in candidates:
+        count, elapsed, size = measure(create, rows)
+        print(f"{name:<10}{elapsed * 1000:>9.1f}{size / count:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
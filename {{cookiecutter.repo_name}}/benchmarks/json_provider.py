@@ -0,0 +1,76 @@
+"""
+Benchmark of the encoders supported by the FastJSONProvider on list
+pages of todo items.
+
+Run from the project root with:
+    python -m benchmarks.json_provider --items 1000
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from flask import Flask
+
+from src.json_provider import FastJSONProvider, ORJSON_ENCODER, \
+    MSGSPEC_ENCODER, STDLIB_ENCODER, orjson, msgspec
+
+
+def create_page(items):
+    now = datetime.now(tz=timezone.utc)
+    return {
+        "items": [
+            {
+                "id": index,
+                "title": f"Todo {index}",
+                "description": "Description of the todo item",
+                "completed": index % 2 == 0,
+                "created_at": now,
+                "updated_at": None,
+            }
+            for index in range(items)
+        ],
+        "total": items,
+    }
+
+
+def measure(provider, page, repeat):
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        data = provider.dumps_bytes(page)
+
+    elapsed = (time.perf_counter() - start) / repeat
+    return len(data), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    page = create_page(args.items)
+    encoders = [STDLIB_ENCODER]
+
+    if msgspec is not None:
+        encoders.append(MSGSPEC_ENCODER)
+
+    if orjson is not None:
+        encoders.append(ORJSON_ENCODER)
+
+    print(f"{'encoder':<10}{'bytes':>10}{'ms':>9}{'speedup':>9}")
+    baseline = None
+
+    for encoder in encoders:
+        provider = FastJSONProvider(app, encoder=encoder)
+        size, elapsed = measure(provider, page, args.repeat)
+        baseline = baseline or elapsed
+        print(
+            f"{encoder:<10}{size:>10}{elapsed * 1000:>9.2f}"
+            f"{baseline / elapsed:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of list queries with statements cached by the shape of their
+QuerySpec versus statements that are built for every request.
+
+Run from the project root with:
+    python -m benchmarks.query_spec --requests 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src import api
+from src.config import Config
+from src.create_app import create_app
+from src.domain import SQLALCHEMY_DATABASE_URI
+from src.infrastructure import sqlalchemy_db as db, setup_sqlalchemy
+from src.infrastructure.repositories import SQLTodoRepository
+
+QUERIES = [
+    {"completed": "false", "per_page": "10", "sort": "-created_at"},
+    {"title__startswith": "Todo 1", "per_page": "10"},
+    {"created_at__gte": "2000-01-01T00:00:00", "page": "2"},
+]
+
+
+class UncachedTodoRepository(SQLTodoRepository):
+    """
+    Overrides _apply_query_params, which disables the statement cache.
+    """
+
+    def _apply_query_params(self, query, query_params):
+        return query
+
+
+def create_benchmark_app(database_uri):
+    config = Config()
+    config[SQLALCHEMY_DATABASE_URI] = database_uri
+    app = create_app(
+        config, dependency_container_packages=[api], setup_sqlalchemy=False
+    )
+    setup_sqlalchemy(app)
+    return app
+
+
+def measure(app, repository, requests):
+
+    with app.app_context():
+        start = time.perf_counter()
+
+        for index in range(requests):
+            repository.get_all(QUERIES[index % len(QUERIES)])
+
+        elapsed = time.perf_counter() - start
+        db.session.remove()
+
+    return elapsed / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--database-uri", default=None)
+    args = parser.parse_args()
+
+    database_uri = args.database_uri or "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "benchmark.db"
+    )
+    app = create_benchmark_app(database_uri)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        app.container.todo_service().create_many([
+            {"title": f"Todo {index}", "description": "Description"}
+            for index in range(args.items)
+        ])
+
+    print(f"{'statements':<12}{'us/request':>12}")
+
+    for name, repository in [
+        ("built", UncachedTodoRepository()),
+        ("cached", SQLTodoRepository()),
+    ]:
+        elapsed = measure(app, repository, args.requests)
+        print(f"{name:<12}{elapsed * 1000000:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
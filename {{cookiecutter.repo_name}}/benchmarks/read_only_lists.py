@@ -0,0 +1,82 @@
+"""
+Benchmark of the time and peak memory of listing todo items as ORM
+instances versus the read-only snapshots of READ_ONLY_LISTS.
+
+Run from the project root with:
+    python -m benchmarks.read_only_lists --items 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from src import api
+from src.api.schemas import TodoSchema, compile_schema
+from src.config import Config
+from src.create_app import create_app
+from src.domain import SQLALCHEMY_DATABASE_URI
+from src.infrastructure import sqlalchemy_db as db, setup_sqlalchemy
+
+
+def create_benchmark_app(database_uri):
+    config = Config()
+    config[SQLALCHEMY_DATABASE_URI] = database_uri
+    app = create_app(
+        config, dependency_container_packages=[api], setup_sqlalchemy=False
+    )
+    setup_sqlalchemy(app)
+    return app
+
+
+def measure(app, read_only, repeat):
+    serializer = compile_schema(TodoSchema)
+    elapsed = 0
+    peak = 0
+
+    for _ in range(repeat):
+
+        with app.app_context():
+            repository = app.container.todo_repository()
+            repository.READ_ONLY_LISTS = read_only
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = repository.get_all({"itemize": True})
+            serializer.dump(result["items"], many=True)
+            elapsed += time.perf_counter() - start
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            db.session.remove()
+
+    return elapsed / repeat, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-uri", default=None)
+    args = parser.parse_args()
+
+    database_uri = args.database_uri or "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "benchmark.db"
+    )
+    app = create_benchmark_app(database_uri)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        app.container.todo_service().create_many([
+            {"title": f"Todo {index}", "description": "Description"}
+            for index in range(args.items)
+        ])
+
+    print(f"{'path':<12}{'ms':>9}{'peak KiB':>11}")
+
+    for name, read_only in [("orm", False), ("read-only", True)]:
+        elapsed, peak = measure(app, read_only, args.repeat)
+        print(f"{name:<12}{elapsed * 1000:>9.1f}{peak / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark of the dump of list pages with the marshmallow TodoSchema
+versus the compiled serializer of the schema.
+
+Run from the project root with:
+    python -m benchmarks.serializers --items 1000
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from src.api.schemas import TodoSchema, compile_schema
+from src.domain import Todo
+
+
+def create_items(items):
+    now = datetime.now(tz=timezone.utc)
+    todos = []
+
+    for index in range(items):
+        todo = Todo(
+            title=f"Todo {index}",
+            description="Description of the todo item",
+            created_at=now,
+            completed=index % 2 == 0
+        )
+        todo.id = index
+        todos.append(todo)
+
+    return todos
+
+
+def measure(dump, items, repeat):
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        dump(items)
+
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    items = create_items(args.items)
+    schema = TodoSchema()
+    compiled_schema = compile_schema(TodoSchema)
+    assert schema.dump(items, many=True) \
+        == compiled_schema.dump(items, many=True)
+
+    baseline = measure(
+        lambda objs: TodoSchema().dump(objs, many=True), items, args.repeat
+    )
+    print(f"{'serializer':<14}{'ms':>9}{'speedup':>9}")
+    print(f"{'marshmallow':<14}{baseline * 1000:>9.2f}{1:>8.1f}x")
+    elapsed = measure(
+        lambda objs: compiled_schema.dump(objs, many=True),
+        items,
+        args.repeat
+    )
+    print(
+        f"{'compiled':<14}{elapsed * 1000:>9.2f}{baseline / elapsed:>8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
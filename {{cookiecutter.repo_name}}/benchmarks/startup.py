@@ -0,0 +1,151 @@
+"""
+Benchmark of the cold start of the app: the time to import create_app and
+the wall time of create_app per phase, for serving (without the
+management commands) and for the flask cli. Every run is a new python
+process, so imports are never cached between runs.
+
+Run from the project root with:
+    python -m benchmarks.startup --runs 5
+
+Save the results as a baseline and compare later runs against it to catch
+startup regressions, the comparison fails when a metric is more than
+--tolerance slower:
+    python -m benchmarks.startup --save startup.json
+    python -m benchmarks.startup --compare startup.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.domain import SQLALCHEMY_DATABASE_URI, LOAD_DOTENV
+
+# Runs in a new process, argv[1] is whether to set up the management
+CHILD = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from src.config import Config
+from src.create_app import create_app
+imported = time.perf_counter()
+app = create_app(Config, setup_management=sys.argv[1] == "true")
+created = time.perf_counter()
+print(json.dumps(dict(
+    import_ms=(imported - start) * 1000,
+    create_app_ms=(created - imported) * 1000,
+    phases=app.extensions["startup_timer"].to_dict()["phases"],
+)))
+"""
+
+
+def run_child(environment, management):
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, "true" if management else "false"],
+        env=environment,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def measure(environment, management, runs):
+    """
+    Returns the medians of the metrics and of the phases of the runs.
+    """
+    results = [run_child(environment, management) for _ in range(runs)]
+    metrics = {
+        key: statistics.median(result[key] for result in results)
+        for key in ["import_ms", "create_app_ms", "process_ms"]
+    }
+    phases = {
+        name: statistics.median(result["phases"][name] for result in results)
+        for name in results[0]["phases"]
+    }
+    return metrics, phases
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints the change of every metric against the baseline and returns
+    whether none is more than tolerance slower.
+    """
+    passed = True
+
+    for mode, metrics in results.items():
+
+        for key, value in metrics.items():
+            previous = baseline.get(mode, {}).get(key)
+
+            if not previous:
+                continue
+
+            change = value / previous - 1
+            regressed = change > tolerance
+            passed = passed and not regressed
+            print(
+                f"{mode:<12}{key:<16}{previous:>9.1f}{value:>9.1f}"
+                f"{change * 100:>+8.1f}%{' REGRESSION' if regressed else ''}"
+            )
+
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-uri", default=None)
+    parser.add_argument("--save", default=None)
+    parser.add_argument("--compare", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    environment = {
+        **os.environ,
+        SQLALCHEMY_DATABASE_URI: args.database_uri or "sqlite:///" +
+        os.path.join(tempfile.mkdtemp(), "benchmark.db"),
+        LOAD_DOTENV: "false",
+    }
+    results = {}
+
+    print(f"{'mode':<12}{'import ms':>11}{'create ms':>11}{'process ms':>12}")
+
+    for mode, management in [("serving", False), ("cli", True)]:
+        metrics, phases = measure(environment, management, args.runs)
+        results[mode] = metrics
+        print(
+            f"{mode:<12}{metrics['import_ms']:>11.1f}"
+            f"{metrics['create_app_ms']:>11.1f}"
+            f"{metrics['process_ms']:>12.1f}"
+        )
+
+        for name, duration in phases.items():
+            print(f"  {name:<32}{duration:>9.1f}")
+
+    if args.save is not None:
+
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare is not None:
+
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+        print(f"\n{'mode':<12}{'metric':<16}{'before':>9}{'after':>9}")
+
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
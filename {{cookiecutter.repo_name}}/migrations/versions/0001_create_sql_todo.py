@@ -0,0 +1,45 @@
+"""Create the sql_todo table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sql_todo',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('id')
+    )
+    op.create_index(
+        'ix_sql_todo_created_at_id', 'sql_todo', ['created_at', 'id']
+    )
+    op.create_index(
+        'ix_sql_todo_title',
+        'sql_todo',
+        ['title'],
+        postgresql_ops={'title': 'text_pattern_ops'}
+    )
+
+
+def downgrade():
+    op.drop_index('ix_sql_todo_title', table_name='sql_todo')
+    op.drop_index('ix_sql_todo_created_at_id', table_name='sql_todo')
+    op.drop_table('sql_todo')
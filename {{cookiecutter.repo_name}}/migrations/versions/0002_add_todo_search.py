@@ -0,0 +1,72 @@
+"""Add the full text search index of todos
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE sql_todo ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+        op.execute(
+            "CREATE INDEX ix_sql_todo_search_vector ON sql_todo "
+            "USING GIN (search_vector)"
+        )
+    elif dialect == 'sqlite':
+        insert_new = "INSERT INTO sql_todo_search(" \
+            "rowid, title, description) " \
+            "VALUES (new.id, new.title, new.description);"
+        delete_old = "INSERT INTO sql_todo_search(" \
+            "sql_todo_search, rowid, title, description) " \
+            "VALUES ('delete', old.id, old.title, old.description);"
+        op.execute(
+            "CREATE VIRTUAL TABLE sql_todo_search USING fts5("
+            "title, description, content='sql_todo', content_rowid='id')"
+        )
+        op.execute(
+            "CREATE TRIGGER sql_todo_search_insert AFTER INSERT ON sql_todo "
+            f"BEGIN {insert_new} END"
+        )
+        op.execute(
+            "CREATE TRIGGER sql_todo_search_delete AFTER DELETE ON sql_todo "
+            f"BEGIN {delete_old} END"
+        )
+        op.execute(
+            "CREATE TRIGGER sql_todo_search_update AFTER UPDATE ON sql_todo "
+            f"BEGIN {delete_old} {insert_new} END"
+        )
+        # Index the existing todos
+        op.execute(
+            "INSERT INTO sql_todo_search(sql_todo_search) VALUES ('rebuild')"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX ix_sql_todo_search_vector")
+        op.execute("ALTER TABLE sql_todo DROP COLUMN search_vector")
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE sql_todo_search")
+        op.execute("DROP TRIGGER sql_todo_search_insert")
+        op.execute("DROP TRIGGER sql_todo_search_delete")
+        op.execute("DROP TRIGGER sql_todo_search_update")
@@ -0,0 +1,41 @@
+"""Add the indexes of the filters and sort fields of todos
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_sql_todo_title_id', 'sql_todo', ['title', 'id'])
+    op.create_index(
+        'ix_sql_todo_completed_id', 'sql_todo', ['completed', 'id']
+    )
+    op.create_index(
+        'ix_sql_todo_updated_at_id', 'sql_todo', ['updated_at', 'id']
+    )
+
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "CREATE INDEX ix_sql_todo_title_nocase "
+            "ON sql_todo (title COLLATE NOCASE)"
+        )
+
+
+def downgrade():
+
+    if op.get_bind().dialect.name == 'sqlite':
+        op.drop_index('ix_sql_todo_title_nocase', table_name='sql_todo')
+
+    op.drop_index('ix_sql_todo_updated_at_id', table_name='sql_todo')
+    op.drop_index('ix_sql_todo_completed_id', table_name='sql_todo')
+    op.drop_index('ix_sql_todo_title_id', table_name='sql_todo')
@@ -1,11 +1,14 @@
 from .requests import get_query_param
-from .middleware import setup_prefix_middleware, post_data_required
+from .middleware import setup_prefix_middleware, post_data_required, \
+    bulk_data_required, setup_compression_middleware
 from .responses import create_response
 from .controllers import setup_blueprints
 
 __all__ = [
     'get_query_param',
     'setup_prefix_middleware',
+    'setup_compression_middleware',
     'post_data_required',
+    'bulk_data_required',
     'setup_blueprints'
 ]
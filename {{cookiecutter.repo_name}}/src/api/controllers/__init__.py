@@ -1,8 +1,10 @@
+from .pool import blueprint as pool_blueprint
 from .todo import blueprint as todo_blueprint
 
 
 def setup_blueprints(app) -> None:
     app.register_blueprint(todo_blueprint, url_prefix="/v1")
+    app.register_blueprint(pool_blueprint, url_prefix="/v1")
     return app
 
 
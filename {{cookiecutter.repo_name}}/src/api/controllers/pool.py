@@ -0,0 +1,21 @@
+from flask import Blueprint, current_app, jsonify
+
+from src.domain import ApiException, POOL_STATS_ENABLED
+from src.infrastructure import sqlalchemy_db, get_engines_pool_statistics
+
+blueprint = Blueprint('pool', __name__)
+
+
+@blueprint.route('/pool-stats', methods=['GET'])
+def get_pool_stats():
+    """
+    Returns the connection pool statistics of the worker process that
+    serves the request, only when POOL_STATS_ENABLED is set.
+    """
+
+    if not current_app.config.get(POOL_STATS_ENABLED, False):
+        raise ApiException("Not found", status_code=404)
+
+    return jsonify(
+        {"engines": get_engines_pool_statistics(sqlalchemy_db)}
+    ), 200
@@ -1,12 +1,18 @@
 import logging
 
 from dependency_injector.wiring import inject, Provide
-from flask import Blueprint, request
+from flask import Blueprint, request, jsonify, current_app
+from marshmallow import ValidationError
 
-from src.api.middleware import post_data_required
-from src.api.responses import create_response
-from src.api.schemas import TodoSchema
+from src.api.middleware import post_data_required, bulk_data_required
+from src.api.requests import get_query_param, get_query_spec, get_fields
+from src.api.responses import create_response, create_stream_response, \
+    JSON_MIMETYPE, STREAM_MIMETYPES, create_list_validators, \
+    is_not_modified, create_not_modified_response, create_precondition
+from src.api.schemas import TodoSchema, compile_schema
 from src.dependency_container import DependencyContainer
+from src.domain import MAX_PER_PAGE
+from src.error_handler import format_marshmallow_validation_error
 
 logger = logging.getLogger(__name__)
 blueprint = Blueprint('todo', __name__)
@@ -19,10 +25,52 @@ def create_todo(
     json_data,
     todo_service=Provide[DependencyContainer.todo_service]
 ):
-    validated_data = TodoSchema().load(json_data)
+    validated_data = compile_schema(TodoSchema).load(json_data)
     todo = todo_service.create(validated_data)
     return create_response(todo, TodoSchema, status_code=201)
 
+
+@blueprint.route('/todo/bulk', methods=['POST'])
+@bulk_data_required
+@inject
+def bulk_create_todo(
+    json_data,
+    todo_service=Provide[DependencyContainer.todo_service]
+):
+    # Invalid items are reported per index and skipped, unless the request
+    # is atomic in which case nothing is created
+    atomic = get_query_param("atomic", request.args, False)
+
+    try:
+        validated_data = compile_schema(TodoSchema).load(json_data, many=True)
+        errors = {}
+    except ValidationError as e:
+
+        if atomic is True:
+            raise e
+
+        errors = e.messages
+        validated_data = [
+            item for index, item in enumerate(e.valid_data)
+            if index not in errors
+        ]
+
+    todos = todo_service.create_many(validated_data) \
+        if len(validated_data) > 0 else []
+    response = {
+        "items": todos,
+        "errors": [
+            {
+                "index": index,
+                "error_message": format_marshmallow_validation_error(error)
+            }
+            for index, error in sorted(errors.items())
+        ]
+    }
+    status_code = 201 if len(todos) > 0 else 400
+    return create_response(response, TodoSchema, status_code=status_code)
+
+
 @blueprint.route('/todo/<int:id>', methods=['PATCH'])
 @post_data_required
 @inject
@@ -31,19 +79,86 @@ def update_todo(
     id,
     todo_service=Provide[DependencyContainer.todo_service]
 ):
-    validated_data = TodoSchema().load(json_data)
-    todo = todo_service.update(id, validated_data)
+    validated_data = compile_schema(TodoSchema).load(json_data)
+
+    # The If-Match header is checked by the update itself, against the
+    # current version in the database
+    todo = todo_service.update(id, validated_data, create_precondition())
     return create_response(todo, TodoSchema)
 
 
+@blueprint.route('/todo', methods=['PATCH'])
+@post_data_required
+@inject
+def bulk_update_todo(
+    json_data,
+    todo_service=Provide[DependencyContainer.todo_service]
+):
+    query_spec = get_query_spec(request.args)
+    validated_data = compile_schema(TodoSchema).load(json_data)
+    result = todo_service.update_all(query_spec, validated_data)
+    return jsonify(result), 200
+
+
+@blueprint.route('/todo', methods=['DELETE'])
+@inject
+def bulk_delete_todo(
+    todo_service=Provide[DependencyContainer.todo_service]
+):
+    result = todo_service.delete_all(get_query_spec(request.args))
+    return jsonify(result), 200
+
+
 @blueprint.route('/todo', methods=['GET'])
 @inject
 def get_todo(
     todo_service=Provide[DependencyContainer.todo_service]
 ):
-    query_params = request.args.to_dict()
-    todos = todo_service.get_all(query_params)
-    return create_response(todos, TodoSchema)
+    query_spec = get_query_spec(
+        request.args, current_app.config.get(MAX_PER_PAGE)
+    )
+    fields = get_fields(query_spec, compile_schema(TodoSchema))
+    serializer = compile_schema(TodoSchema, only=fields)
+
+    # Batched lookup of the todos of the ids in the order of the ids
+    if query_spec.ids is not None:
+        todos = todo_service.get_many(query_spec.ids)
+        return create_response(todos, serializer)
+
+    mimetype = request.accept_mimetypes.best_match(
+        [JSON_MIMETYPE, *STREAM_MIMETYPES], JSON_MIMETYPE
+    )
+
+    if mimetype in STREAM_MIMETYPES:
+        todos = todo_service.stream_all(query_spec)
+        return create_stream_response(todos, serializer, mimetype)
+
+    # The validators are created from the page, a conditional request
+    # saves its serialization and transfer
+    todos = todo_service.get_all(query_spec)
+    etag, last_modified = create_list_validators(query_spec, todos)
+
+    # Deletions do not change the last modified date of a list, therefore
+    # only the etag is used to evaluate the request
+    if is_not_modified(etag):
+        return create_not_modified_response(etag, last_modified)
+
+    return create_response(
+        todos, serializer, etag=etag, last_modified=last_modified
+    )
+
+
+@blueprint.route('/todo/search', methods=['GET'])
+@inject
+def search_todo(
+    todo_service=Provide[DependencyContainer.todo_service]
+):
+    query_spec = get_query_spec(
+        request.args, current_app.config.get(MAX_PER_PAGE)
+    )
+    fields = get_fields(query_spec, compile_schema(TodoSchema))
+    todos = todo_service.search(query_spec)
+    return create_response(todos, compile_schema(TodoSchema, only=fields))
 
 
 @blueprint.route('/todo/<int:id>', methods=['DELETE'])
@@ -1,8 +1,25 @@
+import json
+import zlib
 from functools import wraps
 
 from flask import request
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
 
-from src.domain import NoDataProvidedApiException, SERVICE_PREFIX
+from src.api.responses import NDJSON_MIMETYPE
+from src.domain import NoDataProvidedApiException, ApiException, \
+    SERVICE_PREFIX, COMPRESSION_ENABLED, COMPRESSION_LEVELS, \
+    COMPRESSION_MIN_SIZE, COMPRESSION_MIMETYPES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 
 def setup_prefix_middleware(app, prefix):
@@ -13,6 +30,19 @@ def setup_prefix_middleware(app, prefix):
     return app
 
 
+def setup_compression_middleware(app):
+
+    if app.config.get(COMPRESSION_ENABLED, False):
+        app.wsgi_app = CompressionMiddleware(
+            app.wsgi_app,
+            levels=app.config.get(COMPRESSION_LEVELS),
+            min_size=app.config.get(COMPRESSION_MIN_SIZE),
+            mimetypes=app.config.get(COMPRESSION_MIMETYPES),
+        )
+
+    return app
+
+
 class PrefixMiddleware(object):
     ROUTE_NOT_FOUND_MESSAGE = "This url does not belong to the app."
 
@@ -32,6 +62,228 @@ class PrefixMiddleware(object):
             return [self.ROUTE_NOT_FOUND_MESSAGE.encode()]
 
 
+class ZlibCompressor(object):
+
+    def __init__(self, level, wbits):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor(object):
+
+    def __init__(self, level):
+        self.compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+class ZstdCompressor(object):
+
+    def __init__(self, level):
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+class CompressionMiddleware(object):
+    """
+    Compresses response bodies with the best encoding that the client
+    accepts. Bodies smaller than min_size are sent uncompressed. Streamed
+    responses (without a Content-Length) are compressed incrementally and
+    flushed after every chunk, so clients receive every chunk right away.
+    Every response of a compressible mimetype varies on Accept-Encoding,
+    also when it is sent uncompressed, so caches never serve a compressed
+    body to a client that does not accept it or the other way around.
+    """
+    DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6, "deflate": 6}
+    DEFAULT_MIN_SIZE = 1024
+    DEFAULT_MIMETYPES = [
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/html",
+        "text/plain",
+    ]
+    NOT_COMPRESSED_STATUS_CODES = ["204", "206", "304"]
+
+    def __init__(self, wsgi_app, levels=None, min_size=None, mimetypes=None):
+        self.wsgi_app = wsgi_app
+        self.levels = {**self.DEFAULT_LEVELS, **(levels or {})}
+        self.min_size = self.DEFAULT_MIN_SIZE if min_size is None \
+            else min_size
+        self.mimetypes = mimetypes or self.DEFAULT_MIMETYPES
+        self.encodings = ["gzip", "deflate"]
+
+        # Preferred when the client accepts them with the same quality
+        if brotli is not None:
+            self.encodings.insert(0, "br")
+
+        if zstandard is not None:
+            self.encodings.insert(0, "zstd")
+
+    def negotiate(self, accept_encoding):
+
+        if not accept_encoding:
+            return None
+
+        accepted = parse_accept_header(accept_encoding)
+        encoding = accepted.best_match(self.encodings)
+
+        if encoding is None or accepted[encoding] == 0:
+            return None
+
+        return encoding
+
+    def create_compressor(self, encoding):
+        level = self.levels[encoding]
+
+        if encoding == "gzip":
+            return ZlibCompressor(level, 16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            return ZlibCompressor(level, zlib.MAX_WBITS)
+        elif encoding == "br":
+            return BrotliCompressor(level)
+
+        return ZstdCompressor(level)
+
+    def has_compressible_mimetype(self, headers):
+        mimetype = headers.get("Content-Type", "").split(";")[0].strip()
+        return mimetype in self.mimetypes
+
+    def is_compressible(self, status, headers):
+
+        if status.split(" ")[0] in self.NOT_COMPRESSED_STATUS_CODES:
+            return False
+
+        if "Content-Encoding" in headers:
+            return False
+
+        if "no-transform" in headers.get("Cache-Control", ""):
+            return False
+
+        return self.has_compressible_mimetype(headers)
+
+    def add_vary(self, headers):
+
+        if self.has_compressible_mimetype(headers) and "accept-encoding" \
+                not in ",".join(headers.getlist("Vary")).lower():
+            headers.add("Vary", "Accept-Encoding")
+
+        return headers
+
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ.get("HTTP_ACCEPT_ENCODING"))
+
+        if encoding is None or environ["REQUEST_METHOD"] == "HEAD":
+
+            def vary_start_response(status, headers, exc_info=None):
+                headers = self.add_vary(Headers(headers))
+                return start_response(
+                    status, headers.to_wsgi_list(), exc_info
+                )
+
+            return self.wsgi_app(environ, vary_start_response)
+
+        response = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            response["status"] = status
+            response["headers"] = Headers(headers)
+            response["exc_info"] = exc_info
+            return response.setdefault("written", []).append
+
+        app_iter = self.wsgi_app(environ, capture_start_response)
+        return self.generate(app_iter, encoding, response, start_response)
+
+    def generate(self, app_iter, encoding, response, start_response):
+
+        try:
+            chunks = iter(app_iter)
+            buffered = list(response.get("written", []))
+            buffered_size = sum(len(chunk) for chunk in buffered)
+            status = response["status"]
+            headers = response["headers"]
+            content_length = headers.get("Content-Length", type=int)
+            compress = self.is_compressible(status, headers) and \
+                (content_length is None or content_length >= self.min_size)
+
+            # Buffer the body until it is known whether it reaches min_size
+            while compress and buffered_size < self.min_size:
+                chunk = next(chunks, None)
+
+                if chunk is None:
+                    compress = False
+                    break
+
+                buffered.append(chunk)
+                buffered_size += len(chunk)
+
+            if not compress:
+                start_response(
+                    status,
+                    self.add_vary(headers).to_wsgi_list(),
+                    response["exc_info"]
+                )
+                yield from buffered
+                yield from chunks
+                return
+
+            compressor = self.create_compressor(encoding)
+            headers.remove("Content-Length")
+            headers["Content-Encoding"] = encoding
+            self.add_vary(headers)
+
+            # The compressed representation differs byte for byte
+            etag = headers.get("ETag")
+
+            if etag is not None and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            start_response(
+                status, headers.to_wsgi_list(), response["exc_info"]
+            )
+            data = compressor.compress(b"".join(buffered))
+
+            for chunk in chunks:
+                data += compressor.compress(chunk)
+
+                # Only flush streamed responses, flushing costs ratio
+                if content_length is None:
+                    data += compressor.flush()
+
+                if data:
+                    yield data
+                    data = b""
+
+            yield data + compressor.finish()
+        finally:
+
+            if hasattr(app_iter, "close"):
+                app_iter.close()
+
+
 def post_data_required(f):
     @wraps(f)
     def wrapped(*args, **kwargs):
@@ -41,3 +293,51 @@ def post_data_required(f):
         else:
             return f(json_data, *args, **kwargs)
     return wrapped
+
+
+def bulk_data_required(f):
+    """
+    Decorator that provides the request body as a list of items. The body
+    can either be a json array or newline delimited json.
+    """
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+
+        if request.mimetype == NDJSON_MIMETYPE:
+            json_data = parse_ndjson(request.get_data(as_text=True))
+        else:
+            json_data = request.get_json()
+
+        return f(validate_bulk_data(json_data), *args, **kwargs)
+    return wrapped
+
+
+def parse_ndjson(text):
+    """
+    Parses newline delimited json into a list of items, empty lines are
+    skipped.
+    """
+    json_data = []
+
+    for line_number, line in enumerate(text.splitlines(), start=1):
+
+        if line.strip() == "":
+            continue
+
+        try:
+            json_data.append(json.loads(line))
+        except ValueError:
+            raise ApiException(f"Invalid json on line {line_number}")
+
+    return json_data
+
+
+def validate_bulk_data(json_data):
+
+    if json_data is not None and not isinstance(json_data, list):
+        raise ApiException("Expected a list of items")
+
+    if json_data is None or len(json_data) == 0:
+        raise NoDataProvidedApiException()
+
+    return json_data
@@ -1,42 +1,49 @@
-def normalize_query_param(value):
-    """
-    Given a non-flattened query parameter value,
-    and if the value is a list only containing 1 item,
-    then the value is flattened.
+from src.domain import ApiException, QuerySpec, normalize_query
 
-    :param value: a value from a query parameter
-    :return: a normalized query parameter value
-    """
 
-    if len(value) == 1 and value[0].lower() in ["true", "false"]:
+def get_query_param(key, params, default=None, many=False):
+    query_params = normalize_query(params)
+    selection = query_params.get(key, default)
+
+    if isinstance(selection, list) and len(selection) > 1 and not many:
+        return selection[0]
 
-        if value[0].lower() == "true":
-            return True
-        return False
+    if many and not isinstance(selection, list):
+        selection = [selection]
 
-    return value if len(value) > 1 else value[0]
+    return selection
 
 
-def normalize_query(params):
+def get_query_spec(params, max_per_page=None):
     """
-    Converts query parameters from only containing one value for
-    each parameter, to include parameters with multiple values as lists.
+    Parses the query parameters of a request once into a QuerySpec, which
+    is passed down to the services and repositories.
 
-    :param params: a flask query parameters data structure
-    :return: a dict of normalized query parameters
+    :param params: a flask query parameters data structure or dict
+    :param max_per_page: upper bound of the page size, see MAX_PER_PAGE
     """
-    params_non_flat = params.to_dict(flat=False)
-    return {k: normalize_query_param(v) for k, v in params_non_flat.items()}
+    return QuerySpec.from_params(params, max_per_page=max_per_page)
 
 
-def get_query_param(key, params, default=None, many=False):
-    query_params = normalize_query(params)
-    selection = query_params.get(key, default)
+def get_fields(query_spec, schema):
+    """
+    Returns the fields of the schema selected with the comma separated
+    fields query parameter, or None when all fields are selected.
 
-    if isinstance(selection, list) and len(selection) > 1 and not many:
-        return selection[0]
+    :param query_spec: the QuerySpec of the request
+    :param schema: the compiled schema of which fields can be selected
+    :raises ApiException: if a selected field is not a field of the schema
+    """
+    fields = query_spec.fields
 
-    if many and not isinstance(selection, list):
-        selection = [selection]
+    if fields is None:
+        return None
 
-    return selection
+    unknown_fields = [
+        field for field in fields if field not in schema.dump_fields
+    ]
+
+    if len(unknown_fields) > 0:
+        raise ApiException(f"Unknown fields: {', '.join(unknown_fields)}")
+
+    return list(fields)
@@ -1,18 +1,270 @@
-from flask import jsonify
+import csv
+import hashlib
 import inspect
+import io
+from datetime import timezone
 
+from flask import jsonify, request as flask_request, Response, \
+    stream_with_context, current_app
+from werkzeug.http import http_date
 
-def create_response(item, serializer, status_code=200):
+from src.api.schemas import compile_schema
+
+JSON_MIMETYPE = "application/json"
+NDJSON_MIMETYPE = "application/x-ndjson"
+CSV_MIMETYPE = "text/csv"
+STREAM_MIMETYPES = [NDJSON_MIMETYPE, CSV_MIMETYPE]
+
+
+def create_response(
+    item, serializer, status_code=200, etag=None, last_modified=None
+):
+    """
+    Serializes the item (or the items of a dict) into a json response,
+    see serialize_response.
+    """
+    body, status_code, headers = serialize_response(
+        item, serializer, status_code, etag, last_modified
+    )
+
+    if status_code == 304:
+        return "", status_code, headers
+
+    return jsonify(body), status_code, headers
+
+
+def serialize_response(
+    item,
+    serializer,
+    status_code=200,
+    etag=None,
+    last_modified=None,
+    request_=None
+):
+    """
+    Serializes the item (or the items of a dict) into the body of a json
+    response. Validators of single items are derived from their id,
+    created_at and updated_at attributes. When the validators match the
+    conditional headers of a GET request, the status code is 304 and the
+    item is not serialized.
+
+    :param request_: the request, by default the current Flask request
+    :return: a tuple of the body, the status code and the headers
+    """
 
     if item is None or item == {}:
-        return jsonify({}), status_code
+        return {}, status_code, {}
+
+    if not isinstance(item, dict) and etag is None:
+        etag, last_modified = get_item_validators(item)
+
+        if status_code == 200 \
+                and is_not_modified(etag, last_modified, request_):
+            return None, 304, create_validator_headers(etag, last_modified)
+
+    headers = create_validator_headers(etag, last_modified)
 
     if inspect.isclass(serializer):
-        serializer = serializer()
+        serializer = compile_schema(serializer)
 
     if isinstance(item, dict):
         item_selection = item["items"]
         item["items"] = serializer.dump(item_selection, many=True)
-        return item, status_code
+        return item, status_code, headers
+    else:
+        return serializer.dump(item), status_code, headers
+
+
+def create_etag(*values):
+    return hashlib.sha1(
+        repr([_normalize_datetime(value) for value in values]).encode()
+    ).hexdigest()
+
+
+def get_item_validators(item):
+    """
+    :return: a tuple of the etag and last modified date of the item, or
+    (None, None) if the item has no id
+    """
+    object_id = getattr(item, "id", None)
+
+    if object_id is None:
+        return None, None
+
+    created_at = getattr(item, "created_at", None)
+    updated_at = getattr(item, "updated_at", None)
+    etag = create_etag(object_id, created_at, updated_at)
+    return etag, _normalize_datetime(updated_at or created_at)
+
+
+def create_list_validators(query_spec, result):
+    """
+    Creates the validators of a list response from the query spec and
+    the fetched page: the etags of its items and its pagination, e.g. the
+    total and the cursors. No query beyond the page itself is needed.
+    """
+    item_validators = [get_item_validators(item) for item in result["items"]]
+    pagination = sorted(
+        (key, value) for key, value in result.items() if key != "items"
+    )
+    etag = create_etag(
+        query_spec.key, pagination, [etag for etag, _ in item_validators]
+    )
+    last_modified = max(
+        (
+            last_modified for _, last_modified in item_validators
+            if last_modified is not None
+        ),
+        default=None
+    )
+    return etag, last_modified
+
+
+def is_not_modified(etag, last_modified=None, request_=None):
+    """
+    Evaluates the If-None-Match and If-Modified-Since headers of a GET
+    request. If-Modified-Since is only used when If-None-Match is absent.
+    """
+    request = request_ if request_ is not None else flask_request
+
+    if request.method not in ["GET", "HEAD"] or etag is None:
+        return False
+
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+
+    if request.if_modified_since is not None and last_modified is not None:
+        return last_modified.replace(microsecond=0) \
+            <= _normalize_datetime(request.if_modified_since)
+
+    return False
+
+
+def create_precondition(request_=None):
+    """
+    Creates the precondition of the If-Match header of an update (see
+    Repository.update), which holds when the etag of the current version
+    of the item matches. Returns None when the request has no If-Match
+    header.
+    """
+    request = request_ if request_ is not None else flask_request
+    if_match = request.if_match
+
+    if not if_match:
+        return None
+
+    def precondition(version):
+
+        if if_match.star_tag:
+            return True
+
+        etag, _ = get_item_validators(version)
+        return if_match.contains_weak(etag)
+
+    return precondition
+
+
+def create_not_modified_response(etag, last_modified=None):
+    return "", 304, create_validator_headers(etag, last_modified)
+
+
+def create_validator_headers(etag, last_modified=None):
+    headers = {}
+
+    if etag is not None:
+        headers["ETag"] = f'W/"{etag}"'
+
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    return headers
+
+
+def _normalize_datetime(value):
+    """
+    Converts aware datetimes to naive utc datetimes, the way they are
+    stored in the database.
+    """
+
+    if getattr(value, "tzinfo", None) is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return value
+
+
+def create_stream_response(chunks, serializer, mimetype, status_code=200):
+    """
+    Creates a streaming response that serializes the given chunks of items
+    one chunk at a time, as newline delimited json or csv.
+
+    :param chunks: an iterable of lists of items
+    :param serializer: the marshmallow schema (class) or compiled schema
+    of the items
+    :param mimetype: NDJSON_MIMETYPE or CSV_MIMETYPE
+    """
+
+    if inspect.isclass(serializer):
+        serializer = compile_schema(serializer)
+
+    if mimetype == CSV_MIMETYPE:
+        generator = _generate_csv(chunks, serializer)
     else:
-        return jsonify(serializer.dump(item)), status_code
+        generator = _generate_ndjson(chunks, serializer)
+
+    return Response(
+        stream_with_context(generator),
+        status=status_code,
+        mimetype=mimetype
+    )
+
+
+def _generate_ndjson(chunks, serializer):
+    json_provider = current_app.json
+
+    for chunk in chunks:
+        yield serialize_ndjson_chunk(chunk, serializer, json_provider)
+
+
+def _generate_csv(chunks, serializer):
+    csv_serializer = CSVChunkSerializer(serializer)
+
+    for chunk in chunks:
+        yield csv_serializer.serialize(chunk)
+
+    # Only the header was written when there were no chunks
+    remaining = csv_serializer.flush()
+
+    if remaining:
+        yield remaining
+
+
+def serialize_ndjson_chunk(chunk, serializer, json_provider):
+    rows = serializer.dump(chunk, many=True)
+    return b"".join(json_provider.dumps_bytes(row) + b"\n" for row in rows)
+
+
+class CSVChunkSerializer:
+    """
+    Serializes chunks of items into csv text, the text of the first chunk
+    starts with the header.
+    """
+
+    def __init__(self, serializer):
+        self.serializer = serializer
+        field_names = [
+            field.data_key or name
+            for name, field in serializer.dump_fields.items()
+        ]
+        self.buffer = io.StringIO()
+        self.writer = csv.DictWriter(self.buffer, fieldnames=field_names)
+        self.writer.writeheader()
+
+    def serialize(self, chunk):
+        self.writer.writerows(self.serializer.dump(chunk, many=True))
+        return self.flush()
+
+    def flush(self):
+        text = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return text
@@ -1,3 +1,4 @@
+from .compiler import compile_schema, CompiledSchema
 from .todo import TodoSchema
 
-__all__ = ['TodoSchema']
+__all__ = ['TodoSchema', 'compile_schema', 'CompiledSchema']
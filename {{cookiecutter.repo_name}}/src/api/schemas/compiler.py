@@ -0,0 +1,363 @@
+from datetime import datetime
+from functools import lru_cache
+
+from marshmallow import fields, missing, RAISE, Schema, ValidationError
+from marshmallow.decorators import PRE_DUMP, POST_DUMP, PRE_LOAD, \
+    POST_LOAD, VALIDATES, VALIDATES_SCHEMA
+
+ATTRIBUTE_ACCESS = "attribute"
+MAPPING_ACCESS = "mapping"
+GENERIC_ACCESS = "generic"
+ISO_FORMATS = [None, "iso", "iso8601"]
+
+
+class _Fallback(Exception):
+    pass
+
+
+def compile_schema(schema_class, only=None):
+    """
+    Returns the compiled serializer of the schema class (and subset of
+    fields). Compiled serializers are cached, so every schema and field
+    subset is only compiled once.
+    """
+
+    if only is not None:
+        only = frozenset(only)
+
+    return _compile_schema(schema_class, only)
+
+
+@lru_cache(maxsize=256)
+def _compile_schema(schema_class, only):
+    return CompiledSchema(schema_class(only=only))
+
+
+def _dump_boolean(field, value):
+    """
+    Coerces the value of a boolean field to a bool, marshmallow dumps
+    it unchanged. Databases without a boolean type (e.g. sqlite) return
+    0 and 1.
+    """
+
+    if value is None or value is missing:
+        return value
+
+    try:
+
+        if value in field.truthy:
+            return True
+        elif value in field.falsy:
+            return False
+    except TypeError:
+        pass
+
+    return bool(value)
+
+
+def _has_hooks(schema, *tags):
+    """
+    Returns whether the schema has hooks of any of the tags. Marshmallow 4
+    keys the hooks by their tag, marshmallow 3 by a (tag, pass_many) tuple.
+    """
+    return any(
+        (key[0] if isinstance(key, tuple) else key) in tags
+        for key, hooks in schema._hooks.items() if hooks
+    )
+
+
+def _get_dump_default(field):
+
+    # Named default before marshmallow 3.13
+    if hasattr(field, "dump_default"):
+        return field.dump_default
+
+    return field.default
+
+
+def _get_load_default(field):
+
+    # Named missing before marshmallow 3.13
+    if hasattr(field, "load_default"):
+        return field.load_default
+
+    return field.missing
+
+
+def _get_accessor_kind(object_class):
+
+    if object_class is dict:
+        return MAPPING_ACCESS
+
+    # Indexing a tuple with a string always fails, after which marshmallow
+    # falls back to the attribute
+    if not hasattr(object_class, "__getitem__") \
+            or issubclass(object_class, tuple):
+        return ATTRIBUTE_ACCESS
+
+    return GENERIC_ACCESS
+
+
+class CompiledSchema:
+    """
+    Serializer that generates specialized python code for the dump and
+    load of the fields of a marshmallow schema. The output and the
+    validation errors are the same as those of the schema: values that
+    the generated code does not handle are passed to the marshmallow
+    fields, and invalid input is loaded again by the schema itself to
+    report its errors. Only booleans differ, they are always dumped as
+    bool.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.dump_fields = schema.dump_fields
+        self.load_fields = schema.load_fields
+        self._dump_compiled = schema.dict_class is dict \
+            and type(schema).get_attribute is Schema.get_attribute \
+            and not _has_hooks(schema, PRE_DUMP, POST_DUMP)
+        self._load_compiled = schema.dict_class is dict \
+            and schema.unknown == RAISE \
+            and not schema.partial \
+            and not _has_hooks(
+                schema, PRE_LOAD, POST_LOAD, VALIDATES, VALIDATES_SCHEMA
+            ) \
+            and all(
+                "." not in (field.attribute or name)
+                for name, field in self.load_fields.items()
+            )
+        self._dumpers = {}
+
+        if self._load_compiled:
+            self._load_row, self._load_many = self._compile_load()
+
+    def dump(self, obj, many=False):
+
+        if not self._dump_compiled or obj is None:
+            return self.schema.dump(obj, many=many)
+
+        if not many:
+            return self._get_dumpers(obj.__class__)[0](obj)
+
+        if not isinstance(obj, list):
+            obj = list(obj)
+
+        if len(obj) == 0:
+            return []
+
+        object_class = obj[0].__class__
+
+        for item in obj:
+
+            if item.__class__ is not object_class:
+                return [
+                    self._get_dumpers(item.__class__)[0](item)
+                    for item in obj
+                ]
+
+        return self._get_dumpers(object_class)[1](obj)
+
+    def load(self, data, many=False):
+
+        if self._load_compiled:
+
+            try:
+
+                if many:
+                    return self._load_many(data)
+
+                return self._load_row(data)
+            except (_Fallback, ValidationError):
+                # Let the schema report the errors of the invalid data
+                pass
+
+        return self.schema.load(data, many=many)
+
+    def _get_dumpers(self, object_class):
+        dumpers = self._dumpers.get(object_class)
+
+        if dumpers is None:
+            dumpers = self._compile_dump(_get_accessor_kind(object_class))
+            self._dumpers[object_class] = dumpers
+
+        return dumpers
+
+    def _compile_dump(self, accessor_kind):
+        namespace = {
+            "missing": missing,
+            "get_attribute": self.schema.get_attribute,
+            "datetime": datetime,
+            "dump_boolean": _dump_boolean,
+        }
+        lines = []
+
+        for index, (name, field) in enumerate(self.dump_fields.items()):
+            field_name = f"field_{index}"
+            namespace[field_name] = field
+            key = field.data_key if field.data_key is not None else name
+            attribute = field.attribute or name
+            lines.extend(
+                self._compile_dump_field(
+                    field, field_name, name, key, attribute, accessor_kind
+                )
+            )
+
+        body = "\n".join(f"    {line}" for line in lines)
+        many_body = "\n".join(f"        {line}" for line in lines)
+        source = (
+            f"def dump_row(obj):\n"
+            "    row = {}\n"
+            f"{body}\n"
+            f"    return row\n"
+            f"\n"
+            f"def dump_many(objs):\n"
+            f"    rows = []\n"
+            f"    append = rows.append\n"
+            f"    for obj in objs:\n"
+            "        row = {}\n"
+            f"{many_body}\n"
+            f"        append(row)\n"
+            f"    return rows\n"
+        )
+        exec(
+            compile(source, f"<dump {type(self.schema).__name__}>", "exec"),
+            namespace
+        )
+        return namespace["dump_row"], namespace["dump_many"]
+
+    @staticmethod
+    def _compile_dump_field(
+        field, field_name, name, key, attribute, accessor_kind
+    ):
+        field_class = type(field)
+        inlined = field._CHECK_ATTRIBUTE \
+            and _get_dump_default(field) is missing \
+            and "." not in attribute \
+            and accessor_kind != GENERIC_ACCESS \
+            and not (
+                accessor_kind == MAPPING_ACCESS and hasattr(dict, attribute)
+            )
+
+        if inlined and field_class is fields.Boolean:
+            value = f"value if value is True or value is False " \
+                f"else dump_boolean({field_name}, value)"
+        elif inlined and field_class is fields.String:
+            value = f"value if value.__class__ is str " \
+                f"else {field_name}._serialize(value, {name!r}, obj)"
+        elif inlined and field_class is fields.Integer \
+                and not field.as_string:
+            value = f"value if value.__class__ is int " \
+                f"else {field_name}._serialize(value, {name!r}, obj)"
+        elif inlined and field_class is fields.DateTime \
+                and field.format in ISO_FORMATS:
+            value = f"value.isoformat() if value.__class__ is datetime " \
+                f"else {field_name}._serialize(value, {name!r}, obj)"
+        elif field_class is fields.Boolean:
+            return [
+                f"value = dump_boolean({field_name}, {field_name}.serialize("
+                f"{name!r}, obj, accessor=get_attribute))",
+                "if value is not missing:",
+                f"    row[{key!r}] = value",
+            ]
+        else:
+            return [
+                f"value = {field_name}.serialize("
+                f"{name!r}, obj, accessor=get_attribute)",
+                "if value is not missing:",
+                f"    row[{key!r}] = value",
+            ]
+
+        if accessor_kind == MAPPING_ACCESS:
+            getter = f"obj.get({attribute!r}, missing)"
+        else:
+            getter = f"getattr(obj, {attribute!r}, missing)"
+
+        return [
+            f"value = {getter}",
+            "if value is not missing:",
+            f"    row[{key!r}] = {value}",
+        ]
+
+    def _compile_load(self):
+        namespace = {
+            "missing": missing,
+            "Fallback": _Fallback,
+        }
+        keys = []
+        lines = []
+
+        for index, (name, field) in enumerate(self.load_fields.items()):
+            field_name = f"field_{index}"
+            namespace[field_name] = field
+            key = field.data_key if field.data_key is not None else name
+            attribute = field.attribute or name
+            keys.append(key)
+            lines.extend(
+                self._compile_load_field(field, field_name, key, attribute)
+            )
+
+        namespace["KEYS"] = frozenset(keys)
+        body = "\n".join(f"    {line}" for line in lines)
+        source = (
+            f"def load_row(data):\n"
+            f"    if data.__class__ is not dict:\n"
+            f"        raise Fallback()\n"
+            f"    for key in data:\n"
+            f"        if key not in KEYS:\n"
+            f"            raise Fallback()\n"
+            "    result = {}\n"
+            f"{body}\n"
+            f"    return result\n"
+            f"\n"
+            f"def load_many(data):\n"
+            f"    if data.__class__ is not list:\n"
+            f"        raise Fallback()\n"
+            f"    return [load_row(item) for item in data]\n"
+        )
+        exec(
+            compile(source, f"<load {type(self.schema).__name__}>", "exec"),
+            namespace
+        )
+        return namespace["load_row"], namespace["load_many"]
+
+    @staticmethod
+    def _compile_load_field(field, field_name, key, attribute):
+        field_class = type(field)
+        generic = f"{field_name}.deserialize(value, {key!r}, data)"
+        inlined = not field.validators \
+            and not getattr(field, "pre_load", None) \
+            and not getattr(field, "post_load", None)
+        lines = [f"value = data.get({key!r}, missing)"]
+
+        if field.required or _get_load_default(field) is not missing:
+            lines.extend([
+                f"value = {generic}",
+                "if value is not missing:",
+                f"    result[{attribute!r}] = value",
+            ])
+            return lines
+
+        if inlined and field_class is fields.String:
+            check = "value.__class__ is str"
+        elif inlined and field_class is fields.Integer:
+            check = "value.__class__ is int"
+        elif inlined and field_class is fields.Boolean \
+                and field.truthy is fields.Boolean.truthy \
+                and field.falsy is fields.Boolean.falsy:
+            check = "value is True or value is False"
+        else:
+            check = None
+
+        lines.append("if value is not missing:")
+
+        if check is None:
+            lines.append(f"    result[{attribute!r}] = {generic}")
+        else:
+            lines.extend([
+                f"    if {check}:",
+                f"        result[{attribute!r}] = value",
+                "    else:",
+                f"        result[{attribute!r}] = {generic}",
+            ])
+
+        return lines
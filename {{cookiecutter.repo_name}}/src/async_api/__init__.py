@@ -0,0 +1,11 @@
+from .middleware import post_data_required, bulk_data_required
+from .responses import create_response, create_stream_response
+from .controllers import setup_async_blueprints
+
+__all__ = [
+    'post_data_required',
+    'bulk_data_required',
+    'create_response',
+    'create_stream_response',
+    'setup_async_blueprints'
+]
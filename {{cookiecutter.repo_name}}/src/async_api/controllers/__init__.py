@@ -0,0 +1,13 @@
+from src.domain import SERVICE_PREFIX
+from .todo import blueprint as todo_blueprint
+
+
+def setup_async_blueprints(app):
+    # The prefix of the service is part of the routes, there is no prefix
+    # middleware for ASGI apps
+    prefix = "" if app.config["TESTING"] else app.config[SERVICE_PREFIX]
+    app.register_blueprint(todo_blueprint, url_prefix=f"{prefix}/v1")
+    return app
+
+
+__all__ = ['setup_async_blueprints']
@@ -0,0 +1,184 @@
+import logging
+
+from dependency_injector.wiring import inject, Provide
+from marshmallow import ValidationError
+from quart import Blueprint, request, jsonify, current_app
+
+from src.api.requests import get_query_param, get_query_spec, get_fields
+from src.api.responses import JSON_MIMETYPE, STREAM_MIMETYPES, \
+    create_list_validators, is_not_modified, create_not_modified_response, \
+    create_precondition
+from src.api.schemas import TodoSchema, compile_schema
+from src.async_api.middleware import post_data_required, bulk_data_required
+from src.async_api.responses import create_response, create_stream_response
+from src.dependency_container import DependencyContainer
+from src.domain import MAX_PER_PAGE
+from src.error_handler import format_marshmallow_validation_error
+
+logger = logging.getLogger(__name__)
+blueprint = Blueprint('todo', __name__)
+
+
+@blueprint.route('/todo', methods=['POST'])
+@post_data_required
+@inject
+async def create_todo(
+    json_data,
+    todo_service=Provide[DependencyContainer.async_todo_service]
+):
+    validated_data = compile_schema(TodoSchema).load(json_data)
+    todo = await todo_service.create(validated_data)
+    return create_response(todo, TodoSchema, status_code=201)
+
+
+@blueprint.route('/todo/bulk', methods=['POST'])
+@bulk_data_required
+@inject
+async def bulk_create_todo(
+    json_data,
+    todo_service=Provide[DependencyContainer.async_todo_service]
+):
+    # Invalid items are reported per index and skipped, unless the request
+    # is atomic in which case nothing is created
+    atomic = get_query_param("atomic", request.args, False)
+
+    try:
+        validated_data = compile_schema(TodoSchema).load(json_data, many=True)
+        errors = {}
+    except ValidationError as e:
+
+        if atomic is True:
+            raise e
+
+        errors = e.messages
+        validated_data = [
+            item for index, item in enumerate(e.valid_data)
+            if index not in errors
+        ]
+
+    todos = await todo_service.create_many(validated_data) \
+        if len(validated_data) > 0 else []
+    response = {
+        "items": todos,
+        "errors": [
+            {
+                "index": index,
+                "error_message": format_marshmallow_validation_error(error)
+            }
+            for index, error in sorted(errors.items())
+        ]
+    }
+    status_code = 201 if len(todos) > 0 else 400
+    return create_response(response, TodoSchema, status_code=status_code)
+
+
+@blueprint.route('/todo/<int:id>', methods=['PATCH'])
+@post_data_required
+@inject
+async def update_todo(
+    json_data,
+    id,
+    todo_service=Provide[DependencyContainer.async_todo_service]
+):
+    validated_data = compile_schema(TodoSchema).load(json_data)
+
+    # The If-Match header is checked by the update itself, against the
+    # current version in the database
+    todo = await todo_service.update(
+        id, validated_data, create_precondition(request)
+    )
+    return create_response(todo, TodoSchema)
+
+
+@blueprint.route('/todo', methods=['PATCH'])
+@post_data_required
+@inject
+async def bulk_update_todo(
+    json_data,
+    todo_service=Provide[DependencyContainer.async_todo_service]
+):
+    query_spec = get_query_spec(request.args)
+    validated_data = compile_schema(TodoSchema).load(json_data)
+    result = await todo_service.update_all(query_spec, validated_data)
+    return jsonify(result), 200
+
+
+@blueprint.route('/todo', methods=['DELETE'])
+@inject
+async def bulk_delete_todo(
+    todo_service=Provide[DependencyContainer.async_todo_service]
+):
+    result = await todo_service.delete_all(get_query_spec(request.args))
+    return jsonify(result), 200
+
+
+@blueprint.route('/todo', methods=['GET'])
+@inject
+async def get_todo(
+    todo_service=Provide[DependencyContainer.async_todo_service]
+):
+    query_spec = get_query_spec(
+        request.args, current_app.config.get(MAX_PER_PAGE)
+    )
+    fields = get_fields(query_spec, compile_schema(TodoSchema))
+    serializer = compile_schema(TodoSchema, only=fields)
+
+    # Batched lookup of the todos of the ids in the order of the ids
+    if query_spec.ids is not None:
+        todos = await todo_service.get_many(query_spec.ids)
+        return create_response(todos, serializer)
+
+    mimetype = request.accept_mimetypes.best_match(
+        [JSON_MIMETYPE, *STREAM_MIMETYPES], JSON_MIMETYPE
+    )
+
+    if mimetype in STREAM_MIMETYPES:
+        todos = todo_service.stream_all(query_spec)
+        return create_stream_response(todos, serializer, mimetype)
+
+    # The validators are created from the page, a conditional request
+    # saves its serialization and transfer
+    todos = await todo_service.get_all(query_spec)
+    etag, last_modified = create_list_validators(query_spec, todos)
+
+    # Deletions do not change the last modified date of a list, therefore
+    # only the etag is used to evaluate the request
+    if is_not_modified(etag, request_=request):
+        return create_not_modified_response(etag, last_modified)
+
+    return create_response(
+        todos, serializer, etag=etag, last_modified=last_modified
+    )
+
+
+@blueprint.route('/todo/search', methods=['GET'])
+@inject
+async def search_todo(
+    todo_service=Provide[DependencyContainer.async_todo_service]
+):
+    query_spec = get_query_spec(
+        request.args, current_app.config.get(MAX_PER_PAGE)
+    )
+    fields = get_fields(query_spec, compile_schema(TodoSchema))
+    todos = await todo_service.search(query_spec)
+    return create_response(todos, compile_schema(TodoSchema, only=fields))
+
+
+@blueprint.route('/todo/<int:id>', methods=['DELETE'])
+@inject
+async def delete_todo(
+    id,
+    todo_service=Provide[DependencyContainer.async_todo_service]
+):
+    await todo_service.delete(id)
+    return create_response({}, TodoSchema, status_code=204)
+
+
+@blueprint.route('/todo/<int:id>', methods=['GET'])
+@inject
+async def retrieve_todo(
+    id,
+    todo_service=Provide[DependencyContainer.async_todo_service]
+):
+    todo = await todo_service.get(id)
+    return create_response(todo, TodoSchema)
@@ -0,0 +1,35 @@
+from functools import wraps
+
+from quart import request
+
+from src.api.middleware import parse_ndjson, validate_bulk_data
+from src.api.responses import NDJSON_MIMETYPE
+from src.domain import NoDataProvidedApiException
+
+
+def post_data_required(f):
+    @wraps(f)
+    async def wrapped(*args, **kwargs):
+        json_data = await request.get_json()
+        if json_data is None or json_data == {}:
+            raise NoDataProvidedApiException()
+        else:
+            return await f(json_data, *args, **kwargs)
+    return wrapped
+
+
+def bulk_data_required(f):
+    """
+    Decorator that provides the request body as a list of items. The body
+    can either be a json array or newline delimited json.
+    """
+    @wraps(f)
+    async def wrapped(*args, **kwargs):
+
+        if request.mimetype == NDJSON_MIMETYPE:
+            json_data = parse_ndjson(await request.get_data(as_text=True))
+        else:
+            json_data = await request.get_json()
+
+        return await f(validate_bulk_data(json_data), *args, **kwargs)
+    return wrapped
@@ -0,0 +1,63 @@
+import inspect
+
+from quart import current_app, jsonify, request
+
+from src.api.responses import CSV_MIMETYPE, CSVChunkSerializer, \
+    serialize_ndjson_chunk, serialize_response
+from src.api.schemas import compile_schema
+
+
+def create_response(
+    item, serializer, status_code=200, etag=None, last_modified=None
+):
+    """
+    Serializes the item (or the items of a dict) into a json response,
+    see src.api.responses.serialize_response.
+    """
+    body, status_code, headers = serialize_response(
+        item, serializer, status_code, etag, last_modified, request
+    )
+
+    if status_code == 304:
+        return "", status_code, headers
+
+    return jsonify(body), status_code, headers
+
+
+def create_stream_response(chunks, serializer, mimetype, status_code=200):
+    """
+    Creates a streaming response that serializes the chunks of items of
+    an async iterable one chunk at a time, as newline delimited json or
+    csv.
+    """
+
+    if inspect.isclass(serializer):
+        serializer = compile_schema(serializer)
+
+    if mimetype == CSV_MIMETYPE:
+        generator = _generate_csv(chunks, serializer)
+    else:
+        generator = _generate_ndjson(chunks, serializer, current_app.json)
+
+    return current_app.response_class(
+        generator, status=status_code, mimetype=mimetype
+    )
+
+
+async def _generate_ndjson(chunks, serializer, json_provider):
+
+    async for chunk in chunks:
+        yield serialize_ndjson_chunk(chunk, serializer, json_provider)
+
+
+async def _generate_csv(chunks, serializer):
+    csv_serializer = CSVChunkSerializer(serializer)
+
+    async for chunk in chunks:
+        yield csv_serializer.serialize(chunk).encode()
+
+    # Only the header was written when there were no chunks
+    remaining = csv_serializer.flush()
+
+    if remaining:
+        yield remaining.encode()
@@ -0,0 +1,7 @@
+import logging
+
+from src.config import Config
+from src.create_async_app import create_async_app
+
+logger = logging.getLogger(__name__)
+app = create_async_app(Config)
@@ -1,11 +1,26 @@
 import os
 from pathlib import Path
 
-from .domain import SQLALCHEMY_DATABASE_URI, LOG_LEVEL, SERVICE_PREFIX
+from .domain import SQLALCHEMY_DATABASE_URI, LOG_LEVEL, SERVICE_PREFIX, \
+    MAX_PER_PAGE, \
+    QUERY_CACHE_BACKEND, QUERY_CACHE_TTL, QUERY_CACHE_DIRECTORY, \
+    QUERY_CACHE_REDIS_URL, QUERY_CACHE_MAX_SIZE, SQLALCHEMY_POOL_SIZE, \
+    SQLALCHEMY_MAX_OVERFLOW, \
+    SQLALCHEMY_POOL_RECYCLE, SQLALCHEMY_POOL_PRE_PING, \
+    SQLALCHEMY_POOL_TIMEOUT, POOL_STATS_ENABLED, SQLALCHEMY_REPLICA_URIS, \
+    REPLICA_ROUTING_STRATEGY, REPLICA_STICKY_WINDOW, REPLICA_RETRY_INTERVAL, \
+    SQLALCHEMY_ASYNC_DATABASE_URI, DEPENDENCY_SCOPES, STARTUP_TIMING, \
+    LOAD_DOTENV
 from dotenv import load_dotenv
 
 PROJECT_ROOT = str(Path(__file__).parent.parent)
-load_dotenv()
+DOTENV_PATH = os.path.join(PROJECT_ROOT, '.env')
+
+# The settings are read from the environment when this module is imported,
+# so the .env file of the project root is loaded first. Deployments that
+# set the environment themselves skip it with LOAD_DOTENV=false.
+if os.environ.get(LOAD_DOTENV, 'true').lower() == 'true':
+    load_dotenv(DOTENV_PATH)
 
 
 class Config(object):
@@ -27,7 +42,90 @@ class Config(object):
     ]
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.environ.get(SQLALCHEMY_DATABASE_URI)
+    # Database of the async stack (asgi.py), by default the
+    # SQLALCHEMY_DATABASE_URI with its async driver (asyncpg or aiosqlite)
+    SQLALCHEMY_ASYNC_DATABASE_URI = os.environ.get(
+        SQLALCHEMY_ASYNC_DATABASE_URI
+    )
     SERVICE_PREFIX = os.environ.get(SERVICE_PREFIX, '')
+    # Upper bound of the page size of list requests, larger per_page and
+    # limit query parameters are lowered to it
+    MAX_PER_PAGE = int(os.environ.get(MAX_PER_PAGE, 100))
+    # Connection pool of every worker process. A deployment opens up to
+    # workers * (SQLALCHEMY_POOL_SIZE + SQLALCHEMY_MAX_OVERFLOW)
+    # connections, which must stay below max_connections of postgres.
+    # Connections are recycled after SQLALCHEMY_POOL_RECYCLE seconds and
+    # checkouts fail after waiting SQLALCHEMY_POOL_TIMEOUT seconds.
+    SQLALCHEMY_POOL_SIZE = int(os.environ.get(SQLALCHEMY_POOL_SIZE, 5))
+    SQLALCHEMY_MAX_OVERFLOW = int(
+        os.environ.get(SQLALCHEMY_MAX_OVERFLOW, 10)
+    )
+    SQLALCHEMY_POOL_RECYCLE = int(
+        os.environ.get(SQLALCHEMY_POOL_RECYCLE, 1800)
+    )
+    SQLALCHEMY_POOL_PRE_PING = os.environ.get(
+        SQLALCHEMY_POOL_PRE_PING, 'true'
+    ).lower() == 'true'
+    SQLALCHEMY_POOL_TIMEOUT = int(os.environ.get(SQLALCHEMY_POOL_TIMEOUT, 30))
+    # Comma separated urls of read replicas of SQLALCHEMY_DATABASE_URI.
+    # Repository reads of GET requests are routed to a replica, round_robin
+    # or least_connections, writes go to the primary. A client reads from
+    # the primary for REPLICA_STICKY_WINDOW seconds after it wrote, a
+    # replica that is down is skipped for REPLICA_RETRY_INTERVAL seconds.
+    SQLALCHEMY_REPLICA_URIS = [
+        uri.strip()
+        for uri in os.environ.get(SQLALCHEMY_REPLICA_URIS, '').split(',')
+        if uri.strip() != ''
+    ]
+    REPLICA_ROUTING_STRATEGY = os.environ.get(
+        REPLICA_ROUTING_STRATEGY, 'round_robin'
+    )
+    REPLICA_STICKY_WINDOW = int(os.environ.get(REPLICA_STICKY_WINDOW, 5))
+    REPLICA_RETRY_INTERVAL = int(os.environ.get(REPLICA_RETRY_INTERVAL, 30))
+    # Serves the pool statistics of the worker at /v1/pool-stats
+    POOL_STATS_ENABLED = os.environ.get(
+        POOL_STATS_ENABLED, 'false'
+    ).lower() == 'true'
+    # Logs the duration of every phase of create_app at info level
+    STARTUP_TIMING = os.environ.get(STARTUP_TIMING, 'false').lower() == 'true'
+    # Entity cache settings per repository class name, e.g.
+    # {'SQLTodoRepository': {'max_size': 1024, 'ttl': 30}}. Disabled by
+    # default: entries are only invalidated on writes within the same
+    # process, so with several workers reads can be stale until the ttl
+    # (seconds) expires.
+    ENTITY_CACHES = {}
+    # Lifetime of the providers of the dependency container by provider
+    # name, overrides the scope they are declared with. One of "singleton"
+    # (one instance per app), "request" (one instance per request, kept
+    # in flask.g) or "transient" (a new instance per injection).
+    DEPENDENCY_SCOPES = {
+        name.strip(): scope.strip()
+        for name, _, scope in (
+            item.partition('=')
+            for item in os.environ.get(DEPENDENCY_SCOPES, '').split(',')
+        )
+        if name.strip() != ''
+    }
+    # Query result cache of list queries, one of "memory", "file" (shared
+    # by all processes on the host) or "redis". Disabled when not set.
+    QUERY_CACHE_BACKEND = os.environ.get(QUERY_CACHE_BACKEND)
+    QUERY_CACHE_TTL = int(os.environ.get(QUERY_CACHE_TTL, 60))
+    QUERY_CACHE_DIRECTORY = os.environ.get(QUERY_CACHE_DIRECTORY)
+    QUERY_CACHE_REDIS_URL = os.environ.get(
+        QUERY_CACHE_REDIS_URL, 'redis://localhost:6379/0'
+    )
+    # Maximum amount of results of the memory backend per process
+    QUERY_CACHE_MAX_SIZE = int(os.environ.get(QUERY_CACHE_MAX_SIZE, 1024))
+    # Response compression, brotli (br) and zstd are only negotiated when
+    # the brotli and zstandard packages are installed.
+    COMPRESSION_ENABLED = True
+    COMPRESSION_LEVELS = {'zstd': 3, 'br': 4, 'gzip': 6, 'deflate': 6}
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_MIMETYPES = [
+        'application/json',
+        'application/x-ndjson',
+        'text/csv',
+    ]
 
     def __setitem__(self, key, item):
         self.__dict__[key] = item
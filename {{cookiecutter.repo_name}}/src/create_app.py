@@ -1,42 +1,64 @@
 from flask import Flask
 
-from src import api
-from src.api import setup_prefix_middleware, setup_blueprints
+from src import api, infrastructure
+from src.api import setup_prefix_middleware, setup_blueprints, \
+    setup_compression_middleware
 from src.cors import setup_cors
 from src.dependency_container import setup_dependency_container
 from src.error_handler import setup_error_handler
-from src.infrastructure import setup_sqlalchemy
+from src.json_provider import setup_json_provider
 from src.logging import setup_logging
 from src.domain import SERVICE_PREFIX
-from src.management import setup_management
+from src.startup import StartupTimer, report_startup
 
 
 def create_app(
     config,
     dependency_container_packages=None,
     dependency_container_modules=None,
-    setup_sqlalchemy=True
+    setup_sqlalchemy=True,
+    setup_management=True
 ):
+    timer = StartupTimer()
     app = Flask(__name__.split('.')[0])
-    app = setup_logging(app)
-    app.config.from_object(config)
-    app = setup_dependency_container(app)
-    app.container.wire(packages=[api])
-    app = setup_cors(app)
+
+    with timer.phase("config"):
+        app.config.from_object(config)
+
+    # The log level is part of the config
+    app = timer.run(setup_logging, app)
+    app = timer.run(setup_json_provider, app)
+    app = timer.run(setup_cors, app)
     app.url_map.strict_slashes = False
-    app = setup_prefix_middleware(app, prefix=app.config[SERVICE_PREFIX])
-    app = setup_blueprints(app)
+    app = timer.run(
+        setup_prefix_middleware, app, prefix=app.config[SERVICE_PREFIX]
+    )
+    app = timer.run(setup_compression_middleware, app)
+    app = timer.run(setup_blueprints, app)
 
     if setup_sqlalchemy:
-        app = setup_sqlalchemy(app)
+        app = timer.run(infrastructure.setup_sqlalchemy, app)
+
+    app = timer.run(setup_error_handler, app)
+
+    # The management commands and Flask-Migrate (alembic) are only used by
+    # the flask cli, serving apps skip importing them
+    if setup_management:
+
+        with timer.phase("import_management"):
+            from src import management
 
-    app = setup_error_handler(app)
-    app = setup_management(app)
+        app = timer.run(management.setup_management, app)
 
-    # Dependency injection container initialization should be done last
-    app = setup_dependency_container(
+    # Dependency injection container initialization should be done last,
+    # the api is always wired
+    app = timer.run(
+        setup_dependency_container,
         app,
-        packages=dependency_container_packages,
+        packages=[api] + [
+            package for package in dependency_container_packages or []
+            if package is not api
+        ],
         modules=dependency_container_modules
     )
-    return app
+    return report_startup(app, timer)
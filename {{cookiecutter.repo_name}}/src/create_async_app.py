@@ -0,0 +1,46 @@
+from dependency_injector import providers
+from quart import Quart
+
+from src import async_api
+from src.async_api import setup_async_blueprints
+from src.create_app import create_app
+from src.error_handler import setup_async_error_handler
+from src.infrastructure import setup_async_sqlalchemy
+from src.json_provider import setup_json_provider
+from src.startup import StartupTimer, report_startup
+
+
+def create_async_app(config=None, flask_app=None):
+    """
+    Creates the ASGI app of the service. It shares the config, the
+    dependency container and the database models of the Flask app, which
+    is created from the config unless given.
+    """
+
+    timer = StartupTimer()
+
+    if flask_app is None:
+
+        with timer.phase("create_app"):
+            flask_app = create_app(config, setup_management=False)
+
+    app = Quart(__name__.split('.')[0])
+    app.config.update(flask_app.config)
+    app.url_map.strict_slashes = False
+    app = timer.run(setup_json_provider, app)
+    app.flask_app = flask_app
+    app.container = flask_app.container
+    app = timer.run(setup_async_sqlalchemy, app, flask_app)
+    app.container.async_database.override(
+        providers.Object(app.extensions["async_sqlalchemy"])
+    )
+    # Singletons created with a database of an earlier async app are
+    # bound to its event loop
+    app.container.reset_singletons()
+    app = timer.run(setup_async_blueprints, app)
+    app = timer.run(setup_async_error_handler, app)
+
+    with timer.phase("wire_async_api"):
+        app.container.wire(packages=[async_api])
+
+    return report_startup(app, timer)
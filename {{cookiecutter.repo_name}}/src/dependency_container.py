@@ -1,11 +1,125 @@
 from dependency_injector import containers, providers
+from flask import g, has_app_context
 
-from src.infrastructure import SQLTodoRepository
-from src.services import TodoService
+from src.domain import OperationalException, DEPENDENCY_SCOPES, SINGLETON, \
+    REQUEST, TRANSIENT, SCOPES
+from src.infrastructure import SQLTodoRepository, AsyncSQLTodoRepository, \
+    AsyncSQLAlchemy
+from src.services import TodoService, AsyncTodoService
+
+# Key of the instances of the request scoped providers in flask.g
+REQUEST_SCOPE = "dependency_request_scope"
+
+
+class RequestScoped(providers.Provider):
+    """
+    Provides one instance per request, kept in flask.g of the app context
+    that Flask pushes for every request. Outside of an app context every
+    call creates a new instance, like a Factory.
+    """
+    __slots__ = ("_factory",)
+
+    def __init__(self, provides=None, *args, **kwargs):
+        self._factory = providers.Factory(provides, *args, **kwargs)
+        super().__init__()
+
+    def __deepcopy__(self, memo):
+        copied = memo.get(id(self))
+
+        if copied is not None:
+            return copied
+
+        copied = self.__class__(
+            self._factory.cls,
+            *providers.deepcopy(self._factory.args, memo),
+            **providers.deepcopy(self._factory.kwargs, memo)
+        )
+        self._copy_overridings(copied, memo)
+        return copied
+
+    @property
+    def cls(self):
+        return self._factory.cls
+
+    @property
+    def args(self):
+        return self._factory.args
+
+    @property
+    def kwargs(self):
+        return self._factory.kwargs
+
+    @property
+    def related(self):
+        yield self._factory
+        yield from super().related
+
+    def _provide(self, args, kwargs):
+
+        if not has_app_context():
+            return self._factory(*args, **kwargs)
+
+        instances = g.setdefault(REQUEST_SCOPE, {})
+
+        if id(self) not in instances:
+            instances[id(self)] = self._factory(*args, **kwargs)
+
+        return instances[id(self)]
+
+
+SCOPE_PROVIDERS = {
+    SINGLETON: providers.ThreadSafeSingleton,
+    REQUEST: RequestScoped,
+    TRANSIENT: providers.Factory,
+}
+
+
+def create_provider(scope, provides, *args, **kwargs):
+    """
+    Creates a provider of the class with the lifetime of the scope, one of
+    singleton, request or transient.
+    """
+
+    if scope not in SCOPE_PROVIDERS:
+        raise OperationalException(
+            f"Unknown dependency scope {scope}, use one of "
+            f"{', '.join(SCOPES)}"
+        )
+
+    return SCOPE_PROVIDERS[scope](provides, *args, **kwargs)
+
+
+def setup_dependency_scopes(container, scopes):
+    """
+    Overrides the providers of the container named in scopes with
+    providers of the same class and arguments in the given scope.
+    """
+
+    for name, scope in scopes.items():
+        provider = container.providers.get(name)
+
+        if provider is None or not hasattr(provider, "cls"):
+            raise OperationalException(
+                f"{DEPENDENCY_SCOPES} refers to unknown provider {name}"
+            )
+
+        provider.override(
+            create_provider(
+                scope, provider.cls, *provider.args, **provider.kwargs
+            )
+        )
+
+    return container
 
 
 def setup_dependency_container(app, modules=None, packages=None):
+    """
+    Creates the dependency container of the app with the scopes of the
+    config and wires the given packages and modules. Wiring imports and
+    patches every module, so it is done once per app.
+    """
     container = DependencyContainer()
+    setup_dependency_scopes(container, app.config.get(DEPENDENCY_SCOPES, {}))
     app.container = container
     app.container.wire(modules=modules, packages=packages)
     return app
@@ -14,7 +128,17 @@ def setup_dependency_container(app, modules=None, packages=None):
 class DependencyContainer(containers.DeclarativeContainer):
     config = providers.Configuration()
     wiring_config = containers.WiringConfiguration()
-    todo_repository = providers.Factory(SQLTodoRepository)
-    todo_service = providers.Factory(
-        TodoService, repository=todo_repository,
+    # Repositories and services keep no state between calls, their caches
+    # belong to the app, so one instance serves every request
+    todo_repository = create_provider(SINGLETON, SQLTodoRepository)
+    todo_service = create_provider(
+        SINGLETON, TodoService, repository=todo_repository,
+    )
+    # Provided by create_async_app, only the async stack uses it
+    async_database = providers.Dependency(instance_of=AsyncSQLAlchemy)
+    async_todo_repository = create_provider(
+        SINGLETON, AsyncSQLTodoRepository, database=async_database
+    )
+    async_todo_service = create_provider(
+        SINGLETON, AsyncTodoService, repository=async_todo_repository,
     )
@@ -1,9 +1,24 @@
 from .constants import SQLALCHEMY_DATABASE_URI, LOG_LEVEL, \
-    DEFAULT_PER_PAGE_VALUE, DEFAULT_PAGE_VALUE, ITEMIZE, ITEMIZED, PAGE, \
-    PER_PAGE, SERVICE_PREFIX
+    DEFAULT_PER_PAGE_VALUE, DEFAULT_MAX_PER_PAGE_VALUE, DEFAULT_PAGE_VALUE, \
+    ITEMIZE, ITEMIZED, PAGE, PER_PAGE, SERVICE_PREFIX, CURSOR, LIMIT, \
+    MAX_PER_PAGE, COUNT, EXACT_COUNT, \
+    ESTIMATED_COUNT, CACHED_COUNT, NO_COUNT, COUNT_STRATEGIES, IDS, \
+    FIELDS, SORT, SEARCH, ENTITY_CACHES, QUERY_CACHE_BACKEND, \
+    QUERY_CACHE_TTL, QUERY_CACHE_DIRECTORY, QUERY_CACHE_REDIS_URL, \
+    QUERY_CACHE_MAX_SIZE, \
+    COMPRESSION_ENABLED, COMPRESSION_LEVELS, COMPRESSION_MIN_SIZE, \
+    COMPRESSION_MIMETYPES, SQLALCHEMY_POOL_SIZE, SQLALCHEMY_MAX_OVERFLOW, \
+    SQLALCHEMY_POOL_RECYCLE, SQLALCHEMY_POOL_PRE_PING, \
+    SQLALCHEMY_POOL_TIMEOUT, POOL_STATS_ENABLED, SQLALCHEMY_REPLICA_URIS, \
+    REPLICA_ROUTING_STRATEGY, REPLICA_STICKY_WINDOW, REPLICA_RETRY_INTERVAL, \
+    ROUND_ROBIN, LEAST_CONNECTIONS, REPLICA_ROUTING_STRATEGIES, \
+    SQLALCHEMY_ASYNC_DATABASE_URI, DEPENDENCY_SCOPES, SINGLETON, REQUEST, \
+    TRANSIENT, SCOPES, STARTUP_TIMING, LOAD_DOTENV
 from .exceptions import OperationalException, ApiException, \
     NoDataProvidedApiException, ClientException
 from .models import Todo
+from .query_spec import QuerySpec, normalize_query, normalize_query_param, \
+    OPERATOR_SEPARATOR, VALUE_SEPARATOR, NON_FILTER_QUERY_PARAMS
 
 
 __all__ = [
@@ -14,11 +29,62 @@ __all__ = [
     'NoDataProvidedApiException',
     'ClientException',
     'DEFAULT_PER_PAGE_VALUE',
+    'DEFAULT_MAX_PER_PAGE_VALUE',
     'DEFAULT_PAGE_VALUE',
     'ITEMIZE',
     'ITEMIZED',
     'PAGE',
     'PER_PAGE',
     'SERVICE_PREFIX',
-    'Todo'
+    'CURSOR',
+    'LIMIT',
+    'MAX_PER_PAGE',
+    'COUNT',
+    'EXACT_COUNT',
+    'ESTIMATED_COUNT',
+    'CACHED_COUNT',
+    'NO_COUNT',
+    'COUNT_STRATEGIES',
+    'IDS',
+    'FIELDS',
+    'SORT',
+    'SEARCH',
+    'ENTITY_CACHES',
+    'QUERY_CACHE_BACKEND',
+    'QUERY_CACHE_TTL',
+    'QUERY_CACHE_DIRECTORY',
+    'QUERY_CACHE_REDIS_URL',
+    'QUERY_CACHE_MAX_SIZE',
+    'COMPRESSION_ENABLED',
+    'COMPRESSION_LEVELS',
+    'COMPRESSION_MIN_SIZE',
+    'COMPRESSION_MIMETYPES',
+    'SQLALCHEMY_POOL_SIZE',
+    'SQLALCHEMY_MAX_OVERFLOW',
+    'SQLALCHEMY_POOL_RECYCLE',
+    'SQLALCHEMY_POOL_PRE_PING',
+    'SQLALCHEMY_POOL_TIMEOUT',
+    'POOL_STATS_ENABLED',
+    'SQLALCHEMY_REPLICA_URIS',
+    'REPLICA_ROUTING_STRATEGY',
+    'REPLICA_STICKY_WINDOW',
+    'REPLICA_RETRY_INTERVAL',
+    'ROUND_ROBIN',
+    'LEAST_CONNECTIONS',
+    'REPLICA_ROUTING_STRATEGIES',
+    'SQLALCHEMY_ASYNC_DATABASE_URI',
+    'DEPENDENCY_SCOPES',
+    'SINGLETON',
+    'REQUEST',
+    'TRANSIENT',
+    'SCOPES',
+    'STARTUP_TIMING',
+    'LOAD_DOTENV',
+    'Todo',
+    'QuerySpec',
+    'normalize_query',
+    'normalize_query_param',
+    'OPERATOR_SEPARATOR',
+    'VALUE_SEPARATOR',
+    'NON_FILTER_QUERY_PARAMS'
 ]
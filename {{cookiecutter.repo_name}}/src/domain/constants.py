@@ -1,9 +1,54 @@
 SQLALCHEMY_DATABASE_URI = 'SQLALCHEMY_DATABASE_URI'
 LOG_LEVEL = 'LOG_LEVEL'
 DEFAULT_PER_PAGE_VALUE = 10
+DEFAULT_MAX_PER_PAGE_VALUE = 100
 DEFAULT_PAGE_VALUE = 1
 ITEMIZE = 'itemize'
 ITEMIZED = 'itemized'
 PAGE = 'page'
 PER_PAGE = 'per_page'
 SERVICE_PREFIX = "SERVICE_PREFIX"
+CURSOR = 'cursor'
+LIMIT = 'limit'
+MAX_PER_PAGE = 'MAX_PER_PAGE'
+COUNT = 'count'
+EXACT_COUNT = 'exact'
+ESTIMATED_COUNT = 'estimated'
+CACHED_COUNT = 'cached'
+NO_COUNT = 'none'
+COUNT_STRATEGIES = [EXACT_COUNT, ESTIMATED_COUNT, CACHED_COUNT, NO_COUNT]
+IDS = 'ids'
+FIELDS = 'fields'
+SORT = 'sort'
+SEARCH = 'q'
+ENTITY_CACHES = 'ENTITY_CACHES'
+QUERY_CACHE_BACKEND = 'QUERY_CACHE_BACKEND'
+QUERY_CACHE_TTL = 'QUERY_CACHE_TTL'
+QUERY_CACHE_DIRECTORY = 'QUERY_CACHE_DIRECTORY'
+QUERY_CACHE_REDIS_URL = 'QUERY_CACHE_REDIS_URL'
+QUERY_CACHE_MAX_SIZE = 'QUERY_CACHE_MAX_SIZE'
+COMPRESSION_ENABLED = 'COMPRESSION_ENABLED'
+COMPRESSION_LEVELS = 'COMPRESSION_LEVELS'
+COMPRESSION_MIN_SIZE = 'COMPRESSION_MIN_SIZE'
+COMPRESSION_MIMETYPES = 'COMPRESSION_MIMETYPES'
+SQLALCHEMY_POOL_SIZE = 'SQLALCHEMY_POOL_SIZE'
+SQLALCHEMY_MAX_OVERFLOW = 'SQLALCHEMY_MAX_OVERFLOW'
+SQLALCHEMY_POOL_RECYCLE = 'SQLALCHEMY_POOL_RECYCLE'
+SQLALCHEMY_POOL_PRE_PING = 'SQLALCHEMY_POOL_PRE_PING'
+SQLALCHEMY_POOL_TIMEOUT = 'SQLALCHEMY_POOL_TIMEOUT'
+POOL_STATS_ENABLED = 'POOL_STATS_ENABLED'
+SQLALCHEMY_REPLICA_URIS = 'SQLALCHEMY_REPLICA_URIS'
+REPLICA_ROUTING_STRATEGY = 'REPLICA_ROUTING_STRATEGY'
+REPLICA_STICKY_WINDOW = 'REPLICA_STICKY_WINDOW'
+REPLICA_RETRY_INTERVAL = 'REPLICA_RETRY_INTERVAL'
+ROUND_ROBIN = 'round_robin'
+LEAST_CONNECTIONS = 'least_connections'
+REPLICA_ROUTING_STRATEGIES = [ROUND_ROBIN, LEAST_CONNECTIONS]
+SQLALCHEMY_ASYNC_DATABASE_URI = 'SQLALCHEMY_ASYNC_DATABASE_URI'
+DEPENDENCY_SCOPES = 'DEPENDENCY_SCOPES'
+SINGLETON = 'singleton'
+REQUEST = 'request'
+TRANSIENT = 'transient'
+SCOPES = [SINGLETON, REQUEST, TRANSIENT]
+STARTUP_TIMING = 'STARTUP_TIMING'
+LOAD_DOTENV = 'LOAD_DOTENV'
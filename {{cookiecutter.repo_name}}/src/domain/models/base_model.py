@@ -1,4 +1,49 @@
+def _create_from_values(field_names):
+    """
+    Generates a function that creates an instance of a slotted model from
+    a sequence of values in the order of its fields, without calling
+    __init__.
+    """
+    targets = ", ".join(f"instance.{field}" for field in field_names)
+    source = (
+        f"def from_values(cls, values):\n"
+        f"    instance = cls.__new__(cls)\n"
+        f"    ({targets},) = values\n"
+        f"    return instance\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return staticmethod(namespace["from_values"])
+
+
 class BaseModel:
+    """
+    Base class of the domain models. Models declare their fields with
+    __slots__, so instances have no __dict__ and stay small when many of
+    them are held in memory. Subclasses that do not declare __slots__
+    (e.g. the SQLAlchemy models that mix in a domain model) keep the
+    fields of their domain model.
+    """
+    __slots__ = ()
+    _field_names = ()
+    _slotted = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._slotted = not any(
+            "__dict__" in base.__dict__ for base in cls.__mro__
+        )
+
+        if "__slots__" in cls.__dict__:
+            slots = cls.__dict__["__slots__"]
+
+            if isinstance(slots, str):
+                slots = (slots,)
+
+            cls._field_names = cls._field_names + tuple(slots)
+
+        if cls._slotted and len(cls._field_names) > 0:
+            cls._from_values = _create_from_values(cls._field_names)
 
     def repr(self, **fields) -> str:
         """
@@ -17,8 +62,36 @@ class BaseModel:
 
         return f"<{self.__class__.__name__} {id(self)}>"
 
-    @staticmethod
-    def from_dict(data):
-        instance = BaseModel()
-        instance.update(data)
-        return instance
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates an instance from the items of the dict that are fields of
+        the model, other items are ignored.
+        """
+        return cls(**{
+            field: data[field] for field in cls._field_names if field in data
+        })
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Creates an instance from a named tuple (e.g. a snapshot or a
+        SQLAlchemy Row), a plain tuple with the values in the order of the
+        fields of the model, or an object with the fields as attributes
+        (e.g. an ORM instance).
+        """
+
+        if isinstance(row, tuple) and not hasattr(row, "_fields"):
+            values = row
+        else:
+            values = [getattr(row, field, None) for field in cls._field_names]
+
+        if not cls._slotted:
+            return cls.from_dict(dict(zip(cls._field_names, values)))
+
+        return cls._from_values(cls, values)
+
+    def to_dict(self):
+        return {
+            field: getattr(self, field, None) for field in self._field_names
+        }
@@ -1,15 +1,21 @@
 from .base_model import BaseModel
 
 class Todo(BaseModel):
+    # Same order as the columns of the todo table, see BaseModel.from_row
+    __slots__ = (
+        "id", "title", "description", "completed", "created_at", "updated_at"
+    )
 
     def __init__(
         self,
         title,
-        description,
+        description=None,
         created_at=None,
         updated_at=None,
-        completed=False
+        completed=False,
+        id=None
     ):
+        self.id = id
         self.title = title
         self.description = description
         self.completed = completed
@@ -0,0 +1,284 @@
+from .constants import PAGE, PER_PAGE, ITEMIZE, ITEMIZED, CURSOR, LIMIT, \
+    COUNT, IDS, FIELDS, SORT, SEARCH
+from .exceptions import ApiException
+
+OPERATOR_SEPARATOR = "__"
+VALUE_SEPARATOR = ","
+DEFAULT_OPERATOR = "eq"
+NON_FILTER_QUERY_PARAMS = (
+    PAGE, PER_PAGE, ITEMIZE, ITEMIZED, CURSOR, LIMIT, COUNT, IDS, FIELDS,
+    SORT, SEARCH
+)
+
+
+def normalize_query_param(value):
+    """
+    Given a non-flattened query parameter value,
+    and if the value is a list only containing 1 item,
+    then the value is flattened.
+
+    :param value: a value from a query parameter
+    :return: a normalized query parameter value
+    """
+
+    if len(value) == 1 and isinstance(value[0], str) \
+            and value[0].lower() in ["true", "false"]:
+
+        if value[0].lower() == "true":
+            return True
+        return False
+
+    return value if len(value) > 1 else value[0]
+
+
+def normalize_query(params):
+    """
+    Converts query parameters from only containing one value for
+    each parameter, to include parameters with multiple values as lists.
+
+    :param params: a flask query parameters data structure or a dict
+    :return: a dict of normalized query parameters
+    """
+
+    if hasattr(params, "to_dict"):
+        params = params.to_dict(flat=False)
+
+    return {
+        key: normalize_query_param(
+            value if isinstance(value, list) else [value]
+        )
+        for key, value in params.items()
+    }
+
+
+def _get_values(params, key):
+    value = params.get(key)
+
+    if value is None:
+        return []
+
+    return value if isinstance(value, list) else [value]
+
+
+def _split_values(values):
+    return [
+        part.strip()
+        for value in values
+        for part in str(value).split(VALUE_SEPARATOR)
+        if part.strip() != ""
+    ]
+
+
+def _to_int(value):
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _clamp(value, maximum):
+
+    if value is None or maximum is None:
+        return value
+
+    return min(value, maximum)
+
+
+def _to_bool(value):
+
+    if isinstance(value, str):
+        return value.lower() == "true"
+
+    return bool(value)
+
+
+class QuerySpec:
+    """
+    Typed representation of the query parameters of a list request,
+    parsed once at the API boundary and passed down to the repository.
+
+    The shape of a spec (which filters, operators, sort, fields and
+    pagination mode it uses, but not the values) identifies the SQL
+    statements it produces, so statements can be cached by shape.
+    """
+    __slots__ = (
+        "filters", "sort", "fields", "page", "per_page", "itemize",
+        "cursor", "limit", "count", "ids", "search", "params", "_key"
+    )
+
+    def __init__(
+        self,
+        filters=(),
+        sort=(),
+        fields=None,
+        page=None,
+        per_page=None,
+        itemize=False,
+        cursor=None,
+        limit=None,
+        count=None,
+        ids=None,
+        search=None,
+        params=None
+    ):
+        # Tuple of (field, operator, values) tuples, sorted by field
+        self.filters = tuple(filters)
+        # Tuple of (field, descending) tuples
+        self.sort = tuple(sort)
+        self.fields = tuple(fields) if fields is not None else None
+        self.page = page
+        self.per_page = per_page
+        self.itemize = itemize
+        # An empty cursor selects the first page of cursor pagination
+        self.cursor = cursor
+        self.limit = limit
+        self.count = count
+        self.ids = tuple(ids) if ids is not None else None
+        # Full text search query of the q query parameter
+        self.search = search
+        self.params = params if params is not None else {}
+        self._key = None
+
+    def __repr__(self):
+        return f"<QuerySpec {self.key!r}>"
+
+    def __eq__(self, other):
+        return isinstance(other, QuerySpec) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    @classmethod
+    def from_params(
+        cls,
+        params,
+        non_filter_params=NON_FILTER_QUERY_PARAMS,
+        max_per_page=None
+    ):
+        """
+        Parses request query parameters (a MultiDict or a dict, with
+        single values or lists of values) into a QuerySpec.
+
+        :param params: the query parameters
+        :param non_filter_params: the parameters that are not filters
+        :param max_per_page: upper bound of the per_page and the limit,
+        larger values are lowered to it
+        """
+
+        if params is None:
+            return cls()
+
+        if isinstance(params, QuerySpec):
+            return params
+
+        if hasattr(params, "to_dict"):
+            params = params.to_dict(flat=False)
+
+        filters = []
+
+        for key in sorted(params):
+
+            if key in non_filter_params:
+                continue
+
+            if OPERATOR_SEPARATOR in key:
+                field, operator = key.rsplit(OPERATOR_SEPARATOR, 1)
+            else:
+                field, operator = key, DEFAULT_OPERATOR
+
+            filters.append((field, operator, tuple(_get_values(params, key))))
+
+        sort = []
+
+        for field in _split_values(_get_values(params, SORT)[:1]):
+            descending = field.startswith("-")
+            sort.append((field.lstrip("-"), descending))
+
+        fields = _split_values(_get_values(params, FIELDS))
+        ids = None
+
+        if len(_get_values(params, IDS)) > 0:
+
+            try:
+                ids = [
+                    int(object_id)
+                    for object_id in _split_values(_get_values(params, IDS))
+                ]
+            except ValueError:
+                raise ApiException(
+                    "Ids must be a comma separated list of integers"
+                )
+
+        cursor = _get_values(params, CURSOR)
+        count = _get_values(params, COUNT)
+        search = _get_values(params, SEARCH)
+        itemize = any(
+            _to_bool(value)
+            for value in _get_values(params, ITEMIZE)[:1]
+            + _get_values(params, ITEMIZED)[:1]
+        )
+        return cls(
+            filters=filters,
+            sort=sort,
+            fields=fields if len(fields) > 0 else None,
+            page=_to_int(next(iter(_get_values(params, PAGE)), None)),
+            per_page=_clamp(
+                _to_int(next(iter(_get_values(params, PER_PAGE)), None)),
+                max_per_page
+            ),
+            itemize=itemize,
+            cursor=str(cursor[0]) if len(cursor) > 0 else None,
+            limit=_clamp(
+                _to_int(next(iter(_get_values(params, LIMIT)), None)),
+                max_per_page
+            ),
+            count=str(count[0]) if len(count) > 0 else None,
+            ids=ids,
+            search=str(search[0]) if len(search) > 0 else None,
+            params=normalize_query(params)
+        )
+
+    @property
+    def is_cursor_paginated(self):
+        return self.cursor is not None
+
+    @property
+    def key(self):
+        """
+        Hashable key of all parsed values of the spec.
+        """
+
+        if self._key is None:
+            self._key = (
+                self.filters, self.sort, self.fields, self.page,
+                self.per_page, self.itemize, self.cursor, self.limit,
+                self.count, self.ids, self.search
+            )
+
+        return self._key
+
+    @property
+    def filter_key(self):
+        """
+        Hashable key of the filters of the spec, which determine the set
+        of matching rows.
+        """
+        return self.filters, self.ids, self.search
+
+    def get_filter_shape(self):
+        """
+        Returns a hashable key of the filters and operators of the spec
+        without their values.
+        """
+        return tuple(
+            (field, operator, len(values))
+            for field, operator, values in self.filters
+        )
+
+    def get_shape(self):
+        """
+        Returns a hashable key of the structure of the spec without its
+        values. Specs with the same shape produce the same statements.
+        """
+        return self.get_filter_shape(), self.sort, self.fields
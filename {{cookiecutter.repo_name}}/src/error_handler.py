@@ -2,7 +2,6 @@ import logging
 from typing import Dict, List
 
 import marshmallow.exceptions as marshmallow_exceptions
-from flask import jsonify
 from werkzeug.exceptions import HTTPException
 
 from src.domain import ClientException, ApiException
@@ -10,10 +9,47 @@ from src.domain import ClientException, ApiException
 logger = logging.getLogger(__name__)
 
 
+def format_marshmallow_validation_error(errors: Dict):
+    errors_message = {}
+
+    for key in errors:
+
+        if isinstance(errors[key], Dict):
+            errors_message[key] = \
+                format_marshmallow_validation_error(errors[key])
+
+        if isinstance(errors[key], List):
+            errors_message[key] = errors[key][0].lower()
+    return errors_message
+
+
 def setup_error_handler(app) -> None:
     """
     Function that will register all the specified error handlers for the app
     """
+    app.errorhandler(Exception)(create_error_handler(app))
+    return app
+
+
+def setup_async_error_handler(app):
+    """
+    Registers the error handler on a Quart app as a coroutine, Quart runs
+    sync handlers in a thread.
+    """
+    error_handler = create_error_handler(app)
+
+    async def async_error_handler(error):
+        return error_handler(error)
+
+    app.errorhandler(Exception)(async_error_handler)
+    return app
+
+
+def create_error_handler(app):
+    """
+    Creates the handler of all errors of the app, which responds with the
+    json provider of the app, so it serves Flask and Quart apps.
+    """
 
     def create_error_response(error_message, status_code: int = 400):
 
@@ -21,23 +57,10 @@ def setup_error_handler(app) -> None:
         if not isinstance(error_message, Dict):
             error_message = error_message.replace("404 Not Found: ", '')
 
-        response = jsonify({"error_message": error_message})
+        response = app.json.response({"error_message": error_message})
         response.status_code = status_code
         return response
 
-    def format_marshmallow_validation_error(errors: Dict):
-        errors_message = {}
-
-        for key in errors:
-
-            if isinstance(errors[key], Dict):
-                errors_message[key] = \
-                    format_marshmallow_validation_error(errors[key])
-
-            if isinstance(errors[key], List):
-                errors_message[key] = errors[key][0].lower()
-        return errors_message
-
     def error_handler(error):
         logger.error("exception of type {} occurred".format(type(error)))
         logger.exception(error)
@@ -60,5 +83,4 @@ def setup_error_handler(app) -> None:
             # Internal error happened that was unknown
             return "Internal server error", 500
 
-    app.errorhandler(Exception)(error_handler)
-    return app
+    return error_handler
@@ -1,9 +1,20 @@
-from .databases import sqlalchemy_db, setup_sqlalchemy
-from .repositories import Repository, SQLTodoRepository
+from .databases import sqlalchemy_db, setup_sqlalchemy, explain, \
+    get_pool_statistics, get_engines_pool_statistics, AsyncSQLAlchemy, \
+    setup_async_sqlalchemy
+from .repositories import Repository, SQLTodoRepository, AsyncRepository, \
+    AsyncSQLTodoRepository, SEARCH_OBJECTS
 
 __all__ = [
     "setup_sqlalchemy",
     "sqlalchemy_db",
+    "explain",
+    "get_pool_statistics",
+    "get_engines_pool_statistics",
+    "AsyncSQLAlchemy",
+    "setup_async_sqlalchemy",
     "Repository",
     "SQLTodoRepository",
+    "AsyncRepository",
+    "AsyncSQLTodoRepository",
+    "SEARCH_OBJECTS",
 ]
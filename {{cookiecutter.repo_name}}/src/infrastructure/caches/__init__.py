@@ -0,0 +1,16 @@
+from .lru_cache import LRUCache
+from .query_cache import QueryCache, CacheBackend, MemoryCacheBackend, \
+    FileCacheBackend, RedisCacheBackend, create_query_cache
+from .snapshots import create_snapshot, get_snapshot_type
+
+__all__ = [
+    "LRUCache",
+    "QueryCache",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "FileCacheBackend",
+    "RedisCacheBackend",
+    "create_query_cache",
+    "create_snapshot",
+    "get_snapshot_type",
+]
@@ -0,0 +1,387 @@
+import hashlib
+import logging
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from urllib.parse import urlparse
+
+from src.domain import OperationalException, QUERY_CACHE_BACKEND, \
+    QUERY_CACHE_TTL, QUERY_CACHE_DIRECTORY, QUERY_CACHE_REDIS_URL, \
+    QUERY_CACHE_MAX_SIZE
+from . import serialization
+from .lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+MEMORY_BACKEND = "memory"
+FILE_BACKEND = "file"
+REDIS_BACKEND = "redis"
+
+
+class CacheBackend(ABC):
+
+    @abstractmethod
+    def get(self, key):
+        pass
+
+    @abstractmethod
+    def set(self, key, value, ttl=None):
+        pass
+
+    def get_counter(self, key):
+        return self.get(key) or 0
+
+    @abstractmethod
+    def incr(self, key):
+        """
+        Atomically increments the integer stored at key and returns the
+        new value. Missing keys start at 0.
+        """
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Backend that keeps the entries in the memory of the current process, in
+    an LRUCache of at most max_size entries. Results of old generations are
+    never read again, so they are evicted instead of waiting for their
+    ttl. Counters (the generations of the tables) are kept apart and never
+    evicted, an evicted generation would start over and serve old results.
+    """
+
+    def __init__(self, max_size=1024):
+        self._entries = LRUCache(max_size)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._entries.set(key, value, ttl)
+
+    def get_counter(self, key):
+        return self._counters.get(key, 0)
+
+    def incr(self, key):
+
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    Backend that stores every entry in a file of a directory, so all
+    processes (e.g. gunicorn workers) on a host share the entries. Use a
+    directory on /dev/shm (shared memory) when available. Other users
+    could plant entries in a shared directory, so the directory must be
+    private: it is created with mode 0o700 and must be owned by the
+    current user and not be writable by others.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.check_directory(directory)
+        self.directory = directory
+        self._lock_path = os.path.join(directory, ".lock")
+        self._pruned_at = time.time()
+
+    @staticmethod
+    def check_directory(directory):
+        status = os.stat(directory)
+
+        if status.st_uid != os.getuid():
+            raise OperationalException(
+                f"Query cache directory {directory} is not owned by the "
+                f"current user"
+            )
+
+        if status.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise OperationalException(
+                f"Query cache directory {directory} is writable by other "
+                f"users"
+            )
+
+    def _path(self, key):
+        return os.path.join(
+            self.directory, hashlib.sha1(key.encode()).hexdigest()
+        )
+
+    def _read(self, path):
+
+        try:
+            with open(path, "rb") as file:
+                expires_at, value = serialization.loads(file.read())
+        except (OSError, ValueError, TypeError):
+            return None
+
+        if expires_at is not None and expires_at <= time.time():
+            return None
+
+        return value
+
+    def get(self, key):
+        return self._read(self._path(key))
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl is not None else None
+        file_descriptor, temporary_path = \
+            tempfile.mkstemp(dir=self.directory)
+
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(serialization.dumps([expires_at, value]))
+
+        # Atomic, readers never see a partially written entry
+        os.replace(temporary_path, self._path(key))
+
+        if ttl is not None and self._pruned_at + ttl < time.time():
+            self.prune()
+
+    def incr(self, key):
+        # Imported here since fcntl is only available on posix systems
+        import fcntl
+
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            try:
+                value = (self.get(key) or 0) + 1
+                self.set(key, value)
+                return value
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def prune(self):
+        """
+        Removes the files of expired entries.
+        """
+        self._pruned_at = time.time()
+
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+
+            if not name.startswith(".") and self._read(path) is None:
+
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend for any server that speaks the redis protocol (redis, valkey,
+    keydb or a local stand-in). Only GET, SET and INCR are used, so no
+    client library is required.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", timeout=1.0):
+        parsed_url = urlparse(url)
+        self.host = parsed_url.hostname or "localhost"
+        self.port = parsed_url.port or 6379
+        self.password = parsed_url.password
+        self.database = int(parsed_url.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            sock = socket.create_connection(
+                (self.host, self.port), timeout=self.timeout
+            )
+            connection = (sock, sock.makefile("rb"))
+            self._local.connection = connection
+
+            if self.password is not None:
+                self._command("AUTH", self.password)
+
+            if self.database != 0:
+                self._command("SELECT", self.database)
+
+        return connection
+
+    def _disconnect(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+
+        if connection is not None:
+            connection[1].close()
+            connection[0].close()
+
+    def _command(self, *args):
+        sock, reader = self._connection()
+        parts = [f"*{len(args)}\r\n".encode()]
+
+        for arg in args:
+
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+
+            parts.append(f"${len(arg)}\r\n".encode() + arg + b"\r\n")
+
+        try:
+            sock.sendall(b"".join(parts))
+            return self._read_reply(reader)
+        except OSError:
+            self._disconnect()
+            raise
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+
+        if not line:
+            raise ConnectionError("Connection closed by the cache server")
+
+        prefix, payload = line[:1], line[1:-2]
+
+        if prefix == b"+":
+            return payload
+        elif prefix == b"-":
+            raise OperationalException(payload.decode())
+        elif prefix == b":":
+            return int(payload)
+        elif prefix == b"$":
+            length = int(payload)
+
+            if length == -1:
+                return None
+
+            return reader.read(length + 2)[:-2]
+        elif prefix == b"*":
+            return [self._read_reply(reader) for _ in range(int(payload))]
+
+        raise OperationalException("Invalid reply of the cache server")
+
+    def get(self, key):
+        value = self._command("GET", key)
+
+        if value is None:
+            return None
+
+        # A value that can not be read is a miss, not an error
+        try:
+            return serialization.loads(value)
+        except ValueError as e:
+            logger.warning(f"Invalid query cache entry {key}: {e}")
+            return None
+
+    def set(self, key, value, ttl=None):
+
+        if ttl is None:
+            self._command("SET", key, serialization.dumps(value))
+        else:
+            self._command(
+                "SET", key, serialization.dumps(value), "PX", int(ttl * 1000)
+            )
+
+    def get_counter(self, key):
+        # Counters are stored by INCR as plain integers, not serialized
+        return int(self._command("GET", key) or 0)
+
+    def incr(self, key):
+        return self._command("INCR", key)
+
+
+class QueryCache:
+    """
+    Cache of query results. Every table has a generation counter that is
+    part of the key of its cached results. Bumping the generation of a
+    table invalidates all its cached results at once.
+
+    Read the generation before running the query and store the result
+    under that generation, so a result that raced with a write is never
+    stored under the new generation.
+    """
+
+    def __init__(self, backend, ttl=60, namespace="query-cache"):
+        self.backend = backend
+        self.ttl = ttl
+        self.namespace = namespace
+
+    def _generation_key(self, table_name):
+        return f"{self.namespace}:{table_name}:generation"
+
+    def _key(self, table_name, generation, query_key):
+        return f"{self.namespace}:{table_name}:{generation}:{query_key}"
+
+    def get_generation(self, table_name):
+        """
+        :return: the current generation of the table or None when the
+        backend is not available
+        """
+
+        try:
+            return self.backend.get_counter(self._generation_key(table_name))
+        except (OSError, OperationalException) as e:
+            logger.warning(f"Query cache is not available: {e}")
+            return None
+
+    def get(self, table_name, generation, query_key):
+        """
+        :return: the cached result or None on a miss
+        """
+
+        try:
+            return self.backend.get(
+                self._key(table_name, generation, query_key)
+            )
+        except (OSError, OperationalException) as e:
+            logger.warning(f"Query cache is not available: {e}")
+            return None
+
+    def set(self, table_name, generation, query_key, value):
+
+        try:
+            self.backend.set(
+                self._key(table_name, generation, query_key),
+                value,
+                self.ttl
+            )
+        except (OSError, OperationalException) as e:
+            logger.warning(f"Query cache is not available: {e}")
+
+    def invalidate(self, table_name):
+
+        try:
+            self.backend.incr(self._generation_key(table_name))
+        except (OSError, OperationalException) as e:
+            logger.warning(f"Query cache is not available: {e}")
+
+
+def create_query_cache(config):
+    """
+    Creates the query cache from the QUERY_CACHE_* config settings, returns
+    None when no backend is configured.
+    """
+    backend_name = config.get(QUERY_CACHE_BACKEND)
+
+    if backend_name is None:
+        return None
+
+    if backend_name == MEMORY_BACKEND:
+        backend = MemoryCacheBackend(config.get(QUERY_CACHE_MAX_SIZE, 1024))
+    elif backend_name == FILE_BACKEND:
+
+        if config.get(QUERY_CACHE_DIRECTORY) is None:
+            raise OperationalException(
+                f"{QUERY_CACHE_DIRECTORY} is required by the file query "
+                f"cache backend"
+            )
+
+        backend = FileCacheBackend(config.get(QUERY_CACHE_DIRECTORY))
+    elif backend_name == REDIS_BACKEND:
+        backend = RedisCacheBackend(config.get(QUERY_CACHE_REDIS_URL))
+    else:
+        raise OperationalException(
+            f"Unknown query cache backend {backend_name}"
+        )
+
+    return QueryCache(backend, ttl=config.get(QUERY_CACHE_TTL, 60))
@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from src.domain import OperationalException
+
+# Key of the objects that encode values json has no type for
+TYPE_KEY = "__cache_type__"
+
+DECODERS = {
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "decimal": Decimal,
+    "uuid": UUID,
+    "bytes": base64.b64decode,
+}
+
+
+def _encode(value):
+
+    # datetime is a subclass of date, so it is checked first
+    if isinstance(value, datetime):
+        return {TYPE_KEY: "datetime", "value": value.isoformat()}
+    elif isinstance(value, date):
+        return {TYPE_KEY: "date", "value": value.isoformat()}
+    elif isinstance(value, time):
+        return {TYPE_KEY: "time", "value": value.isoformat()}
+    elif isinstance(value, Decimal):
+        return {TYPE_KEY: "decimal", "value": str(value)}
+    elif isinstance(value, UUID):
+        return {TYPE_KEY: "uuid", "value": str(value)}
+    elif isinstance(value, bytes):
+        return {
+            TYPE_KEY: "bytes", "value": base64.b64encode(value).decode()
+        }
+
+    raise OperationalException(
+        f"Values of type {type(value).__name__} can not be cached"
+    )
+
+
+def _decode(value):
+    type_name = value.get(TYPE_KEY)
+
+    if type_name is None:
+        return value
+
+    if type_name not in DECODERS:
+        raise ValueError(f"Unknown cached type {type_name}")
+
+    return DECODERS[type_name](value["value"])
+
+
+def dumps(value):
+    """
+    Serializes the value of a cache entry as json. Unlike pickle, loading
+    an entry can never run code, so entries written by others are safe to
+    read.
+    """
+    return json.dumps(value, default=_encode, separators=(",", ":")).encode()
+
+
+def loads(data):
+    """
+    Deserializes a cache entry of dumps, raises a ValueError when the
+    data is not a valid entry.
+    """
+    return json.loads(data, object_hook=_decode)
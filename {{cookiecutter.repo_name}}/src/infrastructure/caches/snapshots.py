@@ -0,0 +1,35 @@
+from collections import namedtuple
+
+from sqlalchemy import inspect
+
+_snapshot_types = {}
+
+
+def get_snapshot_type(model_class):
+    """
+    Returns an immutable named tuple type with a field for every column
+    attribute of the given model class.
+    """
+    snapshot_type = _snapshot_types.get(model_class)
+
+    if snapshot_type is None:
+        fields = [
+            attribute.key
+            for attribute in inspect(model_class).column_attrs
+        ]
+        snapshot_type = namedtuple(f"{model_class.__name__}Snapshot", fields)
+        _snapshot_types[model_class] = snapshot_type
+
+    return snapshot_type
+
+
+def create_snapshot(model):
+    """
+    Creates a detached and immutable snapshot of the loaded column
+    attributes of an ORM instance.
+    """
+    snapshot_type = get_snapshot_type(type(model))
+    loaded = inspect(model).dict
+    return snapshot_type(
+        *[loaded.get(field) for field in snapshot_type._fields]
+    )
@@ -1,3 +1,21 @@
+from .async_sql_alchemy import AsyncSQLAlchemy, setup_async_sqlalchemy
+from .explain import explain, PlanIssue
+from .pool import get_pool_statistics, get_engines_pool_statistics, \
+    InstrumentedQueuePool
+from .routing import replica_read, ReplicaRouter, RoutingSession
 from .sql_alchemy import sqlalchemy_db, setup_sqlalchemy
 
-__all__ = ["setup_sqlalchemy", "sqlalchemy_db"]
+__all__ = [
+    "setup_sqlalchemy",
+    "sqlalchemy_db",
+    "explain",
+    "PlanIssue",
+    "get_pool_statistics",
+    "get_engines_pool_statistics",
+    "InstrumentedQueuePool",
+    "replica_read",
+    "ReplicaRouter",
+    "RoutingSession",
+    "AsyncSQLAlchemy",
+    "setup_async_sqlalchemy",
+]
@@ -0,0 +1,94 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.domain import SQLALCHEMY_DATABASE_URI, \
+    SQLALCHEMY_ASYNC_DATABASE_URI, OperationalException
+from .pool import create_engine_options
+from .sql_alchemy import sqlalchemy_db
+
+ASYNC_SQLALCHEMY_EXTENSION = "async_sqlalchemy"
+# Async drivers of the backends of the SQLALCHEMY_DATABASE_URI
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def create_async_database_uri(config):
+    """
+    Returns the SQLALCHEMY_ASYNC_DATABASE_URI of the config, or the
+    SQLALCHEMY_DATABASE_URI with the async driver of its backend.
+    """
+
+    if config.get(SQLALCHEMY_ASYNC_DATABASE_URI):
+        return make_url(config[SQLALCHEMY_ASYNC_DATABASE_URI])
+
+    url = make_url(config[SQLALCHEMY_DATABASE_URI])
+    backend = url.get_backend_name()
+
+    if backend not in ASYNC_DRIVERS:
+        raise OperationalException(
+            f"There is no async driver for {backend}, please set "
+            f"{SQLALCHEMY_ASYNC_DATABASE_URI}"
+        )
+
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+class AsyncSQLAlchemy:
+    """
+    Async engine and sessions of the database of a Flask app. The sync
+    repository code runs on the sync facade of an AsyncSession with
+    run_sync, in an app context of the Flask app in which db.session is
+    that facade, so the statements, caches and config of the Flask app are
+    shared while waiting on the database does not block the event loop.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        url = create_async_database_uri(app.config)
+        options = create_engine_options(app.config, url)
+        # Async engines check connections out of an async adapted pool
+        options.pop("poolclass", None)
+        self.engine = create_async_engine(url, **options)
+        # Objects are serialized after their session is closed
+        self.session_factory = async_sessionmaker(
+            self.engine, expire_on_commit=False
+        )
+
+    async def run_sync(self, function, *args, **kwargs):
+        """
+        Calls the function with db.session bound to a new AsyncSession,
+        which is closed afterwards.
+        """
+
+        async with self.session_factory() as session:
+            return await session.run_sync(
+                self._call_in_app_context, function, args, kwargs
+            )
+
+    def _call_in_app_context(self, session, function, args, kwargs):
+
+        with self.app.app_context():
+            sqlalchemy_db.session.registry.set(session)
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                # Cleared instead of removed, the AsyncSession closes it
+                sqlalchemy_db.session.registry.clear()
+
+    async def dispose(self):
+        await self.engine.dispose()
+
+
+def setup_async_sqlalchemy(app, flask_app):
+    """
+    Creates the AsyncSQLAlchemy of the database of the Flask app for the
+    Quart app and disposes its engine when the Quart app stops serving.
+    """
+    database = AsyncSQLAlchemy(flask_app)
+    app.extensions[ASYNC_SQLALCHEMY_EXTENSION] = database
+
+    @app.after_serving
+    async def dispose_engine():
+        await database.dispose()
+
+    return app
@@ -0,0 +1,151 @@
+import json
+from collections import namedtuple
+
+from sqlalchemy import text
+
+from src.domain import OperationalException
+
+SEQUENTIAL_SCAN = "sequential scan"
+SORT = "sort"
+
+PlanIssue = namedtuple("PlanIssue", ["kind", "relation", "rows"])
+
+
+def explain(connection, statement, analyze=False):
+    """
+    Runs the statement under EXPLAIN and returns the sequential scans and
+    sorts of its plan as PlanIssue tuples with the amount of rows they
+    process. ANALYZE executes the statement and is only supported on
+    postgres, on sqlite the rows are the amount of rows of the table.
+    Sequential scans of statements without a WHERE clause are not
+    reported, their LIMIT stops the scan early. Their sorts are.
+
+    :param connection: the connection to run the EXPLAIN on
+    :param statement: a statement of which all parameters have a value
+    :param analyze: whether to run EXPLAIN ANALYZE
+    """
+    dialect = connection.dialect
+    sql = str(statement.compile(
+        dialect=dialect, compile_kwargs={"literal_binds": True}
+    ))
+
+    if dialect.name == "postgresql":
+        issues = _explain_postgres(connection, sql, analyze)
+    elif dialect.name == "sqlite":
+        issues = _explain_sqlite(connection, sql)
+    else:
+        raise OperationalException(
+            f"EXPLAIN is not supported for {dialect.name}"
+        )
+
+    if getattr(statement, "whereclause", None) is None:
+        issues = [issue for issue in issues if issue.kind != SEQUENTIAL_SCAN]
+
+    return issues
+
+
+def _explain_postgres(connection, sql, analyze):
+    options = "FORMAT JSON, ANALYZE" if analyze else "FORMAT JSON"
+    plan = connection.exec_driver_sql(f"EXPLAIN ({options}) {sql}").scalar()
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    table_rows = {}
+
+    def get_rows(node):
+
+        if analyze:
+            return node["Actual Rows"] * node.get("Actual Loops", 1)
+
+        return node["Plan Rows"]
+
+    def get_table_rows(relation):
+
+        if relation not in table_rows:
+            # Tables that have never been analyzed report -1 tuples
+            table_rows[relation] = connection.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:relation)"
+                ),
+                {"relation": relation}
+            ).scalar() or 0
+
+        return table_rows[relation]
+
+    issues = []
+    # Tuples of a node and the amount of rows of the limit that stops it
+    nodes = [(plan[0]["Plan"], None)]
+
+    while len(nodes) > 0:
+        node, limit = nodes.pop()
+        node_type = node["Node Type"]
+        children = node.get("Plans", [])
+
+        if node_type == "Seq Scan":
+            relation = node["Relation Name"]
+
+            if analyze:
+                rows = get_rows(node) \
+                    + node.get("Rows Removed by Filter", 0) \
+                    * node.get("Actual Loops", 1)
+            else:
+                rows = max(get_rows(node), get_table_rows(relation))
+
+                # Like the planner, assume the matching rows are spread
+                # evenly, so a limited scan stops after a part of the table
+                if limit is not None and node["Plan Rows"] > 0:
+                    rows = rows * min(1, limit / node["Plan Rows"])
+
+            issues.append(PlanIssue(SEQUENTIAL_SCAN, relation, int(rows)))
+        elif node_type in ["Sort", "Incremental Sort"]:
+            # The output of a top-N sort is limited, its input is not
+            rows = get_rows(children[0]) if len(children) > 0 \
+                else get_rows(node)
+            issues.append(PlanIssue(SORT, None, int(rows)))
+
+        if node_type == "Limit":
+            limit = node["Plan Rows"]
+        elif node_type not in ["Gather", "Gather Merge"]:
+            limit = None
+
+        nodes.extend((child, limit) for child in children)
+
+    return issues
+
+
+def _explain_sqlite(connection, sql):
+    table_rows = {}
+
+    def get_table_rows(relation):
+
+        if relation not in table_rows:
+            table_rows[relation] = connection.exec_driver_sql(
+                f'SELECT count(*) FROM "{relation}"'
+            ).scalar()
+
+        return table_rows[relation]
+
+    issues = []
+    sorts = 0
+    relations = []
+
+    for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"):
+        detail = row[-1]
+        words = detail.replace(" TABLE ", " ", 1).split()
+
+        if words[0] in ["SCAN", "SEARCH"] and "VIRTUAL" not in words:
+            relations.append(words[1])
+
+            if words[0] == "SCAN" and "USING" not in words:
+                issues.append(PlanIssue(
+                    SEQUENTIAL_SCAN, words[1], get_table_rows(words[1])
+                ))
+        elif detail.startswith("USE TEMP B-TREE"):
+            sorts += 1
+
+    # Sorts process at most all rows of the tables of the query
+    rows = max([get_table_rows(relation) for relation in relations] or [0])
+    issues.extend(PlanIssue(SORT, None, rows) for _ in range(sorts))
+    return issues
@@ -0,0 +1,174 @@
+import bisect
+import os
+import threading
+import time
+import weakref
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+from src.domain import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_POOL_SIZE, \
+    SQLALCHEMY_MAX_OVERFLOW, SQLALCHEMY_POOL_RECYCLE, \
+    SQLALCHEMY_POOL_PRE_PING, SQLALCHEMY_POOL_TIMEOUT
+
+# Upper bounds in milliseconds of the buckets of the checkout histogram
+CHECKOUT_BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class CheckoutStatistics:
+    """
+    Thread safe histogram of the time it takes to check out a connection
+    from the pool, including waiting for a connection to be returned,
+    opening new connections and pre-pings.
+    """
+
+    def __init__(self, buckets=CHECKOUT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.maximum = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, milliseconds):
+        index = bisect.bisect_left(self.buckets, milliseconds)
+
+        with self._lock:
+            self.counts[index] += 1
+            self.total += milliseconds
+            self.maximum = max(self.maximum, milliseconds)
+
+    def record_timeout(self):
+
+        with self._lock:
+            self.timeouts += 1
+
+    def to_dict(self):
+
+        with self._lock:
+            checkouts = sum(self.counts)
+            histogram = {
+                f"le_{bucket}ms": count
+                for bucket, count in zip(self.buckets, self.counts)
+            }
+            histogram["inf"] = self.counts[-1]
+            return {
+                "count": checkouts,
+                "timeouts": self.timeouts,
+                "mean_ms": self.total / checkouts if checkouts else 0.0,
+                "max_ms": self.maximum,
+                "histogram": histogram,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records the checkout time of its connections. Disposed
+    and recreated pools start with empty statistics.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_statistics = CheckoutStatistics()
+
+    def connect(self):
+        start = time.perf_counter()
+
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.checkout_statistics.record_timeout()
+            raise
+
+        self.checkout_statistics.record(
+            (time.perf_counter() - start) * 1000
+        )
+        return connection
+
+
+def create_engine_options(config, url=None):
+    """
+    Creates the engine options of the pool settings of the config for the
+    url, by default the SQLALCHEMY_DATABASE_URI. In memory sqlite
+    databases keep the default pool of SQLAlchemy, which shares a single
+    connection.
+    """
+    url = make_url(url if url is not None
+                   else config[SQLALCHEMY_DATABASE_URI])
+
+    if url.get_backend_name() == "sqlite" \
+            and url.database in [None, "", ":memory:"]:
+        return {}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config.get(SQLALCHEMY_POOL_SIZE, 5),
+        "max_overflow": config.get(SQLALCHEMY_MAX_OVERFLOW, 10),
+        "pool_recycle": config.get(SQLALCHEMY_POOL_RECYCLE, 1800),
+        "pool_pre_ping": config.get(SQLALCHEMY_POOL_PRE_PING, True),
+        "pool_timeout": config.get(SQLALCHEMY_POOL_TIMEOUT, 30),
+    }
+
+
+def get_pool_statistics(engine):
+    """
+    Returns the statistics of the connection pool of the engine in the
+    current process.
+    """
+    pool = engine.pool
+    statistics = {"pool": type(pool).__name__, "pid": os.getpid()}
+
+    if isinstance(pool, QueuePool):
+        statistics.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            # The overflow counts down from -size while the pool fills
+            "overflow": max(pool.overflow(), 0),
+            "capacity": pool.size() + max(pool._max_overflow, 0),
+        })
+
+    if isinstance(pool, InstrumentedQueuePool):
+        statistics["checkout"] = pool.checkout_statistics.to_dict()
+
+    return statistics
+
+
+def get_engines_pool_statistics(db):
+    """
+    Returns the pool statistics of every engine of the Flask-SQLAlchemy
+    extension by bind key, the engine without bind key is the default.
+    """
+    return {
+        key if key is not None else "default": get_pool_statistics(engine)
+        for key, engine in db.engines.items()
+    }
+
+
+def setup_fork_safety(app, db):
+    """
+    Disposes the connection pools of the app in child processes after a
+    fork, e.g. of the workers of gunicorn with --preload, so connections
+    opened before the fork are never shared between processes. The
+    connections are left open for the parent process.
+    """
+    app_reference = weakref.ref(app)
+
+    def dispose_engines():
+        forked_app = app_reference()
+
+        if forked_app is None:
+            return
+
+        with forked_app.app_context():
+
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=dispose_engines)
+
+    return app
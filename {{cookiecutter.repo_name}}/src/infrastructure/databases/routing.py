@@ -0,0 +1,229 @@
+import itertools
+import logging
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import exc
+from sqlalchemy.sql.dml import UpdateBase
+
+from src.domain import OperationalException, SQLALCHEMY_REPLICA_URIS, \
+    REPLICA_ROUTING_STRATEGY, REPLICA_STICKY_WINDOW, \
+    REPLICA_RETRY_INTERVAL, ROUND_ROBIN, LEAST_CONNECTIONS, \
+    REPLICA_ROUTING_STRATEGIES
+from .pool import create_engine_options
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND_PREFIX = "replica_"
+REPLICA_ROUTER_EXTENSION = "replica_router"
+# Cookie with the time until which the reads of a client go to the primary
+REPLICA_STICKY_COOKIE = "primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Keys of the info of a session
+READ_REPLICA = "read_replica"
+USE_PRIMARY = "use_primary"
+WRITTEN = "written"
+REPLICA = "replica"
+
+
+class ReplicaRouter:
+    """
+    Chooses the replica bind of a session, round robin or the replica with
+    the least checked out connections. A replica that can not be connected
+    to is skipped for retry_interval seconds.
+    """
+
+    def __init__(self, bind_keys, strategy=ROUND_ROBIN, retry_interval=30):
+
+        if strategy not in REPLICA_ROUTING_STRATEGIES:
+            raise OperationalException(
+                f"Unknown replica routing strategy {strategy}, use one of "
+                f"{', '.join(REPLICA_ROUTING_STRATEGIES)}"
+            )
+
+        self.bind_keys = tuple(bind_keys)
+        self.strategy = strategy
+        self.retry_interval = retry_interval
+        self._counter = itertools.count()
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def is_available(self, key):
+        return self._down_until.get(key, 0) <= time.monotonic()
+
+    def mark_down(self, key):
+
+        with self._lock:
+            self._down_until[key] = time.monotonic() + self.retry_interval
+
+    def get_candidates(self, engines):
+        start = next(self._counter) % len(self.bind_keys)
+        keys = [
+            key for key in
+            self.bind_keys[start:] + self.bind_keys[:start]
+            if self.is_available(key)
+        ]
+
+        if self.strategy == LEAST_CONNECTIONS:
+            # Stable, so replicas with as many connections take turns
+            keys.sort(key=lambda key: get_checked_out(engines[key]))
+
+        return keys
+
+    def choose(self, engines):
+        """
+        Returns the key of an available replica, or None when all replicas
+        are down.
+        """
+
+        for key in self.get_candidates(engines):
+
+            try:
+
+                with engines[key].connect():
+                    pass
+
+                return key
+            except exc.DBAPIError as e:
+                logger.warning(f"Replica {key} is unavailable: {e}")
+                self.mark_down(key)
+
+        return None
+
+
+def get_checked_out(engine):
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout is not None else 0
+
+
+class RoutingSession(Session):
+    """
+    Session that sends the reads of repository methods decorated with
+    replica_read to a replica of the default bind. Writes, reads of
+    sessions that have written and reads of sessions marked to use the
+    primary go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(
+            mapper=mapper, clause=clause, bind=bind, **kwargs
+        )
+
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[WRITTEN] = True
+            return engine
+
+        if not self.info.get(READ_REPLICA) \
+                or self.info.get(USE_PRIMARY) \
+                or self.info.get(WRITTEN) \
+                or engine is not self._db.engines.get(None):
+            return engine
+
+        if REPLICA not in self.info:
+            router = current_app.extensions.get(REPLICA_ROUTER_EXTENSION)
+            self.info[REPLICA] = router.choose(self._db.engines) \
+                if router is not None else None
+
+        if self.info[REPLICA] is None:
+            return engine
+
+        return self._db.engines[self.info[REPLICA]]
+
+
+def replica_read(method):
+    """
+    Marks a repository method as a read that can be served by a replica.
+    """
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+
+        if not has_app_context() \
+                or REPLICA_ROUTER_EXTENSION not in current_app.extensions:
+            return method(*args, **kwargs)
+
+        session = current_app.extensions["sqlalchemy"].session()
+        read_replica = session.info.get(READ_REPLICA, False)
+        session.info[READ_REPLICA] = True
+
+        try:
+            return method(*args, **kwargs)
+        finally:
+            session.info[READ_REPLICA] = read_replica
+
+    return wrapper
+
+
+def create_replica_binds(config):
+    """
+    Creates the SQLALCHEMY_BINDS of the SQLALCHEMY_REPLICA_URIS of the
+    config, with the pool settings of the config.
+    """
+    return {
+        f"{REPLICA_BIND_PREFIX}{index}": {
+            "url": url, **create_engine_options(config, url)
+        }
+        for index, url in enumerate(config.get(SQLALCHEMY_REPLICA_URIS, []))
+    }
+
+
+def setup_replica_routing(app, db):
+    """
+    Routes the replica reads of the app to the replica binds and makes
+    reads stick to the primary for REPLICA_STICKY_WINDOW seconds after a
+    request of a client wrote, so clients read their own writes. Requests
+    with unsafe methods read from the primary, so preconditions of writes
+    are never checked against stale rows.
+    """
+    bind_keys = [
+        key for key in app.config.get("SQLALCHEMY_BINDS", {})
+        if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)
+    ]
+
+    if len(bind_keys) == 0:
+        return app
+
+    app.extensions[REPLICA_ROUTER_EXTENSION] = ReplicaRouter(
+        bind_keys,
+        strategy=app.config.get(REPLICA_ROUTING_STRATEGY, ROUND_ROBIN),
+        retry_interval=app.config.get(REPLICA_RETRY_INTERVAL, 30)
+    )
+
+    @app.before_request
+    def route_reads():
+        session = db.session()
+
+        try:
+            primary_until = float(
+                request.cookies.get(REPLICA_STICKY_COOKIE, 0)
+            )
+        except ValueError:
+            primary_until = 0
+
+        # The session is shared by the requests of an app context
+        session.info.pop(REPLICA, None)
+        session.info[WRITTEN] = False
+        session.info[USE_PRIMARY] = request.method not in SAFE_METHODS \
+            or primary_until > time.time()
+
+    @app.after_request
+    def stick_to_primary(response):
+        window = app.config.get(REPLICA_STICKY_WINDOW, 5)
+
+        if window > 0 and db.session.registry.has() \
+                and db.session.info.get(WRITTEN):
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE,
+                str(time.time() + window),
+                max_age=window,
+                httponly=True,
+                samesite="Lax"
+            )
+
+        return response
+
+    return app
@@ -1,8 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 
 from src.domain import SQLALCHEMY_DATABASE_URI, OperationalException
+from .pool import create_engine_options, setup_fork_safety
+from .routing import RoutingSession, create_replica_binds, \
+    setup_replica_routing
 
-sqlalchemy_db = SQLAlchemy()
+sqlalchemy_db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 class SQLAlchemyAdapter:
@@ -10,7 +13,18 @@ class SQLAlchemyAdapter:
     def __init__(self, app):
 
         if app.config[SQLALCHEMY_DATABASE_URI] is not None:
+            # Options set in SQLALCHEMY_ENGINE_OPTIONS take precedence
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+                **create_engine_options(app.config),
+                **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+            }
+            app.config["SQLALCHEMY_BINDS"] = {
+                **create_replica_binds(app.config),
+                **app.config.get("SQLALCHEMY_BINDS", {}),
+            }
             sqlalchemy_db.init_app(app)
+            setup_fork_safety(app, sqlalchemy_db)
+            setup_replica_routing(app, sqlalchemy_db)
         elif not app.config["TESTING"]:
             raise OperationalException(
                 "SQLALCHEMY_DATABASE_URI not set in config, please make sure" +
@@ -1,4 +1,5 @@
 from .model_extension import SQLModelExtension
 from .sql_todo import SQLTodo
+from .utc_datetime import UTCDateTime
 
-__all__ = ['SQLModelExtension', 'SQLTodo']
+__all__ = ['SQLModelExtension', 'SQLTodo', 'UTCDateTime']
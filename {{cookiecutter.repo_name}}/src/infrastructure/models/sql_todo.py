@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Integer
+from sqlalchemy import Column, String, Boolean, Integer, Index
 
 from .model_extension import SQLModelExtension
+from .utc_datetime import UTCDateTime
 from src.domain import Todo
 from src.infrastructure.databases import sqlalchemy_db as db
 
@@ -11,5 +12,30 @@ class SQLTodo(db.Model, Todo, SQLModelExtension):
     title = Column(String(255), nullable=False)
     description = Column(String(255), nullable=True)
     completed = Column(Boolean, default=False)
-    created_at = Column(DateTime, nullable=False)
-    updated_at = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, nullable=False)
+    updated_at = Column(UTCDateTime, nullable=True)
+
+    # Indexes of the filters and sort fields of the SQLTodoRepository,
+    # sorts are ordered by the field and the id as a tiebreaker
+    __table_args__ = (
+        # Covers the keyset pagination sort key of the SQLTodoRepository
+        Index("ix_sql_todo_created_at_id", "created_at", "id"),
+        # Serves equality and prefix (LIKE 'prefix%') filters on the title
+        Index(
+            "ix_sql_todo_title",
+            "title",
+            postgresql_ops={"title": "text_pattern_ops"}
+        ),
+        # Serves sorts on the title, text_pattern_ops does not follow the
+        # collation of the database
+        Index("ix_sql_todo_title_id", "title", "id"),
+        Index("ix_sql_todo_completed_id", "completed", "id"),
+        Index("ix_sql_todo_updated_at_id", "updated_at", "id"),
+    )
+
+
+# LIKE is case insensitive on sqlite, so its prefix filters on the title are
+# only served by an index with the NOCASE collation
+Index(
+    "ix_sql_todo_title_nocase", SQLTodo.title.collate("NOCASE")
+).ddl_if(dialect="sqlite")
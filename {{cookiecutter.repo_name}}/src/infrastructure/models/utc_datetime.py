@@ -0,0 +1,24 @@
+from datetime import timezone
+
+from sqlalchemy import DateTime, TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    DateTime column that stores datetimes as naive utc datetimes. Aware
+    datetimes are converted on bind, because asyncpg does not accept them
+    for columns without a time zone.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return self.impl_instance.python_type
+
+    def process_bind_param(self, value, dialect):
+
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+
+        return value
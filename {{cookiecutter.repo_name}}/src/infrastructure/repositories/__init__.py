@@ -1,4 +1,18 @@
+from .async_repository import AsyncRepository
+from .filters import Filter
 from .repository import Repository
-from .todo_repository import SQLTodoRepository
+from .search import SearchBackend, PostgresSearchBackend, \
+    SQLiteSearchBackend, SEARCH_OBJECTS
+from .todo_repository import SQLTodoRepository, AsyncSQLTodoRepository
 
-__all__ = ["Repository", "SQLTodoRepository"]
+__all__ = [
+    "AsyncRepository",
+    "AsyncSQLTodoRepository",
+    "Filter",
+    "Repository",
+    "SearchBackend",
+    "PostgresSearchBackend",
+    "SQLiteSearchBackend",
+    "SEARCH_OBJECTS",
+    "SQLTodoRepository",
+]
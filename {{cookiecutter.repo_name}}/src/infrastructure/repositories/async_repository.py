@@ -0,0 +1,124 @@
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.domain import ApiException
+from src.infrastructure.caches import get_snapshot_type
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRepository:
+    """
+    Async counterpart of a Repository on SQLAlchemy's asyncio extension.
+    The methods of the repository run on an AsyncSession (see
+    AsyncSQLAlchemy.run_sync), so both share their filters, pagination,
+    search and caches. Streams are read with a server side cursor of the
+    AsyncSession.
+    """
+    repository_class = None
+
+    def __init__(self, database, repository=None):
+        self.database = database
+        self.repository = repository if repository is not None \
+            else self.repository_class()
+
+    async def create(self, data):
+        return await self.database.run_sync(self.repository.create, data)
+
+    async def create_many(self, data, chunk_size=None):
+        return await self.database.run_sync(
+            self.repository.create_many, data, chunk_size
+        )
+
+    async def get(self, object_id):
+        return await self.database.run_sync(self.repository.get, object_id)
+
+    async def get_many(self, object_ids, chunk_size=None):
+        return await self.database.run_sync(
+            self.repository.get_many, object_ids, chunk_size
+        )
+
+    async def get_all(self, query_params=None):
+        return await self.database.run_sync(
+            self.repository.get_all, query_params
+        )
+
+    async def search(self, query_params):
+        return await self.database.run_sync(
+            self.repository.search, query_params
+        )
+
+    async def update(self, object_id, data, precondition=None):
+        return await self.database.run_sync(
+            self.repository.update, object_id, data, precondition
+        )
+
+    async def update_all(self, query_params, data, chunk_size=None):
+        return await self.database.run_sync(
+            self.repository.update_all, query_params, data, chunk_size
+        )
+
+    async def delete(self, object_id):
+        return await self.database.run_sync(
+            self.repository.delete, object_id
+        )
+
+    async def delete_all(self, query_params, chunk_size=None):
+        return await self.database.run_sync(
+            self.repository.delete_all, query_params, chunk_size
+        )
+
+    async def find(self, query_params):
+        return await self.database.run_sync(
+            self.repository.find, query_params
+        )
+
+    async def count(self, query_params=None):
+        return await self.database.run_sync(
+            self.repository.count, query_params
+        )
+
+    async def exists(self, query_params):
+        return await self.database.run_sync(
+            self.repository.exists, query_params
+        )
+
+    async def stream_all(self, query_params=None, chunk_size=None):
+        """
+        Async generator that yields the matching objects in lists of at
+        most chunk_size objects, see Repository.stream_all.
+        """
+        repository = self.repository
+        query_spec = repository.get_query_spec(query_params)
+        chunk_size = chunk_size or repository.STREAM_CHUNK_SIZE
+        statement = repository.create_stream_statement(query_spec)
+        parameters = repository.create_filter_parameters(query_spec)
+        execution_options = {"yield_per": chunk_size}
+
+        async with self.database.session_factory() as session:
+
+            try:
+
+                if repository.READ_ONLY_LISTS:
+                    snapshot_type = get_snapshot_type(repository.base_class)
+                    result = await session.stream(
+                        statement,
+                        parameters,
+                        execution_options=execution_options
+                    )
+
+                    async for partition in result.partitions():
+                        yield list(map(snapshot_type._make, partition))
+                else:
+                    result = await session.stream_scalars(
+                        statement,
+                        parameters,
+                        execution_options=execution_options
+                    )
+
+                    async for partition in result.partitions():
+                        yield partition
+            except SQLAlchemyError as e:
+                logger.error(e)
+                raise ApiException("Error streaming objects")
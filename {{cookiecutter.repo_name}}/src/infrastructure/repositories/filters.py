@@ -0,0 +1,206 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam
+
+from src.domain import ApiException, OPERATOR_SEPARATOR, VALUE_SEPARATOR
+
+EQ = "eq"
+IN = "in"
+LT = "lt"
+LTE = "lte"
+GT = "gt"
+GTE = "gte"
+BETWEEN = "between"
+STARTSWITH = "startswith"
+LIKE_ESCAPE = "/"
+RANGE_OPERATORS = (EQ, IN, LT, LTE, GT, GTE, BETWEEN)
+
+
+class Filter:
+    """
+    Declaration of a filter on a column of the model of a repository.
+    Query parameters select the filter with the name of the field and
+    optionally an operator, e.g. ?created_at__gte=2024-01-01 or
+    ?title__startswith=buy. Set indexed when an index of the table
+    serves the filter.
+    """
+
+    def __init__(self, field, operators=(EQ,), indexed=False):
+        self.field = field
+        self.operators = tuple(operators)
+        self.indexed = indexed
+
+    def __repr__(self):
+        return f"<Filter({self.field!r},operators={self.operators!r}," \
+            f"indexed={self.indexed!r})>"
+
+    def get_parameters(self, column, operator, values, index=0):
+        """
+        Parses the raw query parameter values of the operator into the
+        values of the named parameters of the compiled expression.
+        """
+
+        if operator not in self.operators:
+            raise ApiException(
+                f"Operator {operator} is not supported for {self.field}, "
+                f"use one of {', '.join(self.operators)}"
+            )
+
+        if operator in [IN, BETWEEN]:
+            values = split_values(values)
+        elif len(values) > 1:
+            raise ApiException(f"Filter {self.field} accepts a single value")
+
+        values = [self.parse_value(column, value) for value in values]
+        name = self.get_parameter_name(operator, index)
+
+        if operator == IN:
+            return {name: values}
+
+        if operator == BETWEEN:
+
+            if len(values) != 2:
+                raise ApiException(
+                    f"Filter {self.field}{OPERATOR_SEPARATOR}{BETWEEN} "
+                    f"requires two comma separated values"
+                )
+
+            return {f"{name}_lower": values[0], f"{name}_upper": values[1]}
+
+        if operator == STARTSWITH:
+            # Escaped here instead of with autoescape, which requires a
+            # literal value instead of a parameter
+            return {
+                name: str(values[0])
+                .replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+                .replace("%", LIKE_ESCAPE + "%")
+                .replace("_", LIKE_ESCAPE + "_") + "%"
+            }
+
+        return {name: values[0]}
+
+    def get_parameter_name(self, operator, index=0):
+        """
+        Returns the name of the bound parameter of the operator. The index
+        is the position of the filter in the query spec, so a field
+        filtered twice with the same operator (e.g. ?title=a&title__eq=b)
+        binds two parameters.
+        """
+        return f"filter_{index}_{self.field}_{operator}"
+
+    def compile(self, column, operator, values, index=0):
+        """
+        Compiles the operator and raw query parameter values into an
+        expression on the column with named bound parameters.
+
+        :return: a tuple of the expression and the values of its
+        parameters. Executing the expression with the parameters of other
+        values for the same operator gives the results for those values,
+        so the expression can be cached.
+        """
+        parameters = self.get_parameters(column, operator, values, index)
+        name = self.get_parameter_name(operator, index)
+
+        def parameter(key, **kwargs):
+            return bindparam(key, parameters[key], type_=column.type, **kwargs)
+
+        if operator == IN:
+            return column.in_(parameter(name, expanding=True)), parameters
+        elif operator == BETWEEN:
+            return column.between(
+                parameter(f"{name}_lower"), parameter(f"{name}_upper")
+            ), parameters
+        elif operator == STARTSWITH:
+            return column.like(
+                parameter(name), escape=LIKE_ESCAPE
+            ), parameters
+        elif operator == EQ:
+            return column == parameter(name), parameters
+        elif operator == LT:
+            return column < parameter(name), parameters
+        elif operator == LTE:
+            return column <= parameter(name), parameters
+        elif operator == GT:
+            return column > parameter(name), parameters
+        elif operator == GTE:
+            return column >= parameter(name), parameters
+
+        raise ApiException(f"Unknown operator {operator}")
+
+    def parse_value(self, column, value):
+
+        if not isinstance(value, str):
+            return value
+
+        python_type = column.type.python_type
+
+        try:
+
+            if python_type is bool:
+
+                if value.lower() not in ["true", "false"]:
+                    raise ValueError(value)
+
+                return value.lower() == "true"
+
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+
+                # Datetimes are stored as naive utc datetimes
+                if value.tzinfo is not None:
+                    value = value.astimezone(timezone.utc) \
+                        .replace(tzinfo=None)
+
+                return value
+
+            return python_type(value)
+        except ValueError:
+            raise ApiException(f"Invalid value {value} for {self.field}")
+
+
+def split_values(values):
+    return [
+        part
+        for value in values
+        for part in (
+            value.split(VALUE_SEPARATOR) if isinstance(value, str)
+            else [value]
+        )
+    ]
+
+
+def get_sample_value(column, operator):
+    """
+    Returns a query parameter value of the type of the column for the
+    operator, used to create representative queries of a filter.
+    """
+    python_type = column.type.python_type
+
+    if python_type is bool:
+        value = "true"
+    elif python_type is int:
+        value = "1"
+    elif python_type is datetime:
+        value = "2000-01-01T00:00:00"
+    else:
+        value = "a"
+
+    if operator in [IN, BETWEEN]:
+        return f"{value}{VALUE_SEPARATOR}{value}"
+
+    return value
+
+
+def validate_sort(sort, sort_fields):
+    """
+    Raises an ApiException when a field of the sort of a QuerySpec can not
+    be sorted on.
+    """
+
+    for field, _ in sort:
+
+        if field not in sort_fields:
+            raise ApiException(
+                f"Sorting on {field} is not supported, use one of "
+                f"{', '.join(sort_fields)}"
+            )
@@ -0,0 +1,64 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from src.domain import ApiException
+
+NEXT = "next"
+PREV = "prev"
+DATETIME_MARKER = "$dt"
+
+
+def _encode_value(value):
+
+    if isinstance(value, datetime):
+        return {DATETIME_MARKER: value.isoformat()}
+
+    return value
+
+
+def _decode_value(value):
+
+    if isinstance(value, dict) and DATETIME_MARKER in value:
+        return datetime.fromisoformat(value[DATETIME_MARKER])
+
+    return value
+
+
+def encode_cursor(values, direction=NEXT):
+    """
+    Encodes the sort key values of a boundary row into an opaque cursor.
+
+    :param values: the sort key values of the boundary row
+    :param direction: the direction in which the cursor seeks
+    :return: an url safe cursor string
+    """
+    payload = json.dumps(
+        {"k": [_encode_value(value) for value in values], "d": direction},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, key_length):
+    """
+    Decodes an opaque cursor back into its sort key values and direction.
+
+    :param cursor: a cursor created with encode_cursor
+    :param key_length: the number of sort key values the cursor must contain
+    :return: a tuple of the sort key values and the direction
+    """
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(value) for value in payload["k"]]
+        direction = payload["d"]
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise ApiException("Invalid cursor")
+
+    if len(values) != key_length or direction not in [NEXT, PREV]:
+        raise ApiException("Invalid cursor")
+
+    return values, direction
@@ -1,86 +1,772 @@
+import hashlib
+import json
 import logging
 from abc import ABC
 from typing import Callable
 
+from flask import current_app, abort
+from sqlalchemy import tuple_, text, insert, select, update, delete, func, \
+    inspect, null, bindparam, Integer, and_, or_
+from sqlalchemy.orm import load_only
 from sqlalchemy.exc import SQLAlchemyError
-from werkzeug.datastructures import MultiDict
 
-from src.domain import ApiException, ITEMIZE, ITEMIZED, PAGE, PER_PAGE, \
-    DEFAULT_PAGE_VALUE, DEFAULT_PER_PAGE_VALUE
+from src.domain import ApiException, DEFAULT_PAGE_VALUE, \
+    DEFAULT_PER_PAGE_VALUE, DEFAULT_MAX_PER_PAGE_VALUE, CURSOR, \
+    MAX_PER_PAGE, EXACT_COUNT, ESTIMATED_COUNT, CACHED_COUNT, NO_COUNT, \
+    COUNT_STRATEGIES, SORT, SEARCH, ENTITY_CACHES, QuerySpec, \
+    normalize_query, normalize_query_param, OPERATOR_SEPARATOR, \
+    NON_FILTER_QUERY_PARAMS
 from src.infrastructure import sqlalchemy_db as db
+from src.infrastructure.caches import LRUCache, create_snapshot, \
+    get_snapshot_type, create_query_cache
+from src.infrastructure.databases import replica_read
+from .filters import validate_sort, get_sample_value
+from .pagination import encode_cursor, decode_cursor, NEXT, PREV
+from .search import SEARCH_QUERY_PARAMETER
 
 logger = logging.getLogger(__name__)
 
+# Statements of list queries per repository class, keyed by the shape of
+# the query spec (see Repository.get_statement)
+_statement_caches = {}
+
 
 class Repository(ABC):
     base_class: Callable
     DEFAULT_NOT_FOUND_MESSAGE = "The requested resource was not found"
+    DEFAULT_PRECONDITION_FAILED_MESSAGE = \
+        "The requested resource has been modified"
     DEFAULT_PER_PAGE = DEFAULT_PER_PAGE_VALUE
+    # Upper bound of the page size, the MAX_PER_PAGE config setting
+    # overrides it
+    MAX_PER_PAGE = DEFAULT_MAX_PER_PAGE_VALUE
     DEFAULT_PAGE = DEFAULT_PAGE_VALUE
+    # Stable and unique sort key used for keyset (cursor) pagination,
+    # make sure an index exists that covers these columns in this order.
+    CURSOR_FIELDS = ("id",)
+    # Strategy used to determine the total of paginated results and counts,
+    # can be overridden per request with the 'count' query parameter.
+    COUNT_STRATEGY = EXACT_COUNT
+    COUNT_CACHE_TTL = 60
+    COUNT_CACHE_MAX_SIZE = 1024
+    # Amount of rows fetched from a server side cursor per chunk when
+    # streaming results
+    STREAM_CHUNK_SIZE = 1000
+    # Amount of rows written per multi-row statement in bulk operations
+    BULK_CHUNK_SIZE = 1000
+    # Amount of ids looked up per IN (...) statement of get_many
+    GET_MANY_CHUNK_SIZE = 1000
+    # Read-through cache of get, disabled when the max size is None
+    ENTITY_CACHE_MAX_SIZE = None
+    ENTITY_CACHE_TTL = 60
+    # Columns of which the latest value is the last modified date of an
+    # object, always loaded for the validators of list responses
+    LAST_MODIFIED_FIELDS = ()
+    # Columns that change with every write of an object. Conditional
+    # updates (see update) are only written while they are unchanged.
+    VERSION_FIELDS = ()
+    # Use the query cache for get_all when a QUERY_CACHE_BACKEND is set
+    QUERY_CACHE_ENABLED = True
+    # Return immutable snapshots loaded with Core selects from get_all and
+    # stream_all, instead of ORM instances tracked by the session
+    READ_ONLY_LISTS = False
+    # Whitelist of the filters (see filters.Filter) and the fields that can
+    # be sorted on. Other filter query parameters are rejected when the
+    # repository declares filters.
+    FILTERS = ()
+    SORT_FIELDS = ()
+    # Query parameters that are not filters, see query_spec
+    NON_FILTER_QUERY_PARAMS = NON_FILTER_QUERY_PARAMS
+    # Full text search backends (see search.SearchBackend), search uses
+    # the backend of the dialect of the database
+    SEARCH_BACKENDS = ()
+    # Amount of list statements that are kept per repository class, every
+    # combination of filters, sort, fields and pagination mode is a shape
+    STATEMENT_CACHE_SIZE = 256
 
     def create(self, data):
         try:
-            created_object = self.base_class(**data)
+            created_object = self.base_class(**self.get_column_data(data))
             db.session.add(created_object)
             db.session.commit()
+            self.invalidate([created_object.id])
             return created_object
         except SQLAlchemyError as e:
             logger.error(e)
             db.session.rollback()
             raise ApiException("Error creating object")
 
-    def update(self, object_id, data):
+    def create_many(self, data, chunk_size=None):
+        """
+        Creates all objects in a single transaction with multi-row
+        INSERT ... RETURNING statements of at most chunk_size rows.
+
+        :param data: a list of dicts with the attributes of the objects
+        :return: the created objects, in the order of the given data
+        """
+        chunk_size = chunk_size or self.BULK_CHUNK_SIZE
+        data = self.normalize_bulk_data(data)
+        statement = insert(self.base_class).returning(
+            self.base_class, sort_by_parameter_order=True
+        ).execution_options(render_nulls=True)
+
+        try:
+            created_objects = []
+
+            for start in range(0, len(data), chunk_size):
+                created_objects.extend(
+                    db.session.scalars(
+                        statement, data[start:start + chunk_size]
+                    ).all()
+                )
+
+            # Detach the created objects, so they are not expired and
+            # reloaded one by one after the commit
+            for created_object in created_objects:
+                db.session.expunge(created_object)
+
+            db.session.commit()
+            self.invalidate([created.id for created in created_objects])
+            return created_objects
+        except SQLAlchemyError as e:
+            logger.error(e)
+            db.session.rollback()
+            raise ApiException("Error creating objects")
+
+    def get_column_data(self, data):
+        """
+        Leaves out the keys of the data that are not columns of the base
+        class, e.g. fields of the schema without a column, which setting
+        the attributes of the model used to ignore.
+        """
+        columns = inspect(self.base_class).column_attrs.keys()
+        return {key: value for key, value in data.items() if key in columns}
+
+    def normalize_bulk_data(self, data):
+        """
+        Gives all items the same keys, so they can be written with a single
+        multi-row statement. Missing keys get the scalar column default.
+        """
+        keys = set().union(*data)
+        defaults = {}
+
+        for key in keys:
+            column = self.base_class.__table__.columns.get(key)
+            defaults[key] = None
+
+            if column is not None and column.default is not None \
+                    and column.default.is_scalar:
+                defaults[key] = column.default.arg
+
+        return [{**defaults, **item} for item in data]
+
+    def update(self, object_id, data, precondition=None):
+        """
+        Updates the object with a single UPDATE ... RETURNING statement
+        instead of selecting the object before updating it.
+
+        The precondition, e.g. of an If-Match header, is called with the
+        current version of the object (see get_version), which is read from
+        the database and never from the entity cache. The update only
+        matches the object while its version is unchanged, so a write of
+        another process in between fails the precondition as well.
+        """
+
         try:
-            update_object = self.get(object_id)
-            update_object.update(db=db, data=data)
+            version = self.check_precondition(object_id, precondition)
+
+            data = self.get_column_data(data)
+
+            if len(data) == 0:
+                return self.get(object_id)
+
+            statement = update(self.base_class) \
+                .where(self.base_class.id == object_id)
+
+            if version is not None:
+                statement = statement.where(*[
+                    getattr(self.base_class, field)
+                    .is_not_distinct_from(getattr(version, field))
+                    for field in self.VERSION_FIELDS
+                ])
+
+            statement = statement.values(**data).returning(self.base_class)
+            update_object = self.execute_returning(
+                statement, conditional=version is not None
+            )
+            db.session.commit()
+            self.invalidate([object_id])
             return update_object
         except SQLAlchemyError as e:
             logger.error(e)
             db.session.rollback()
             raise ApiException("Error updating object")
 
+    def check_precondition(self, object_id, precondition):
+        """
+        Raises a 412 ApiException when the precondition does not hold for
+        the current version of the object.
+
+        :return: the version, or None when there is no precondition
+        """
+
+        if precondition is None:
+            return None
+
+        version = self.get_version(object_id)
+
+        if not precondition(version):
+            raise ApiException(self.DEFAULT_PRECONDITION_FAILED_MESSAGE, 412)
+
+        return version
+
+    def get_version(self, object_id):
+        """
+        Returns a row with the id and the VERSION_FIELDS of the object, read
+        from the database. Responds with a 404 when the object does not
+        exist.
+        """
+        statement = select(*[
+            getattr(self.base_class, field)
+            for field in ("id", *self.VERSION_FIELDS)
+        ]).where(self.base_class.id == object_id)
+        version = db.session.execute(statement).one_or_none()
+
+        if version is None:
+            abort(404, self.DEFAULT_NOT_FOUND_MESSAGE)
+
+        return version
+
     def delete(self, object_id):
+        """
+        Deletes the object with a single DELETE ... RETURNING statement
+        instead of selecting the object before deleting it.
+        """
+        statement = delete(self.base_class) \
+            .where(self.base_class.id == object_id) \
+            .returning(self.base_class)
+
         try:
-            delete_object = self.get(object_id)
-            delete_object.delete(db)
+            delete_object = self.execute_returning(statement)
+            db.session.commit()
+            self.invalidate([object_id])
             return delete_object
         except SQLAlchemyError as e:
             logger.error(e)
             db.session.rollback()
             raise ApiException("Error deleting object")
 
-    def delete_all(self, query_params):
+    def execute_returning(self, statement, conditional=False):
+        """
+        Executes an UPDATE or DELETE ... RETURNING statement for a single
+        object and returns the object detached from the session, so it is
+        not expired and reloaded after the commit. Responds with a 404 when
+        no row was affected, or raises a 412 ApiException when the
+        statement is conditional on the version of the object.
+        """
+        returned_object = db.session.scalars(
+            statement,
+            execution_options={"populate_existing": True}
+        ).one_or_none()
+
+        if returned_object is None and conditional:
+            raise ApiException(self.DEFAULT_PRECONDITION_FAILED_MESSAGE, 412)
+
+        if returned_object is None:
+            abort(404, self.DEFAULT_NOT_FOUND_MESSAGE)
+
+        db.session.expunge(returned_object)
+        return returned_object
+
+    def update_all(self, query_params, data, chunk_size=None):
+        """
+        Updates all objects selected by the 'ids' query parameter and/or
+        the filters of the query parameters with set based
+        UPDATE ... RETURNING statements of at most chunk_size ids.
+
+        :return: a dict with the count and ids of the updated objects
+        """
+        query_spec = self.get_query_spec(query_params)
+
+        try:
+            ids = self.select_ids(query_spec)
+            statement = update(self.base_class) \
+                .values(**self.get_column_data(data))
+            updated_ids = self.execute_in_chunks(
+                statement, query_spec, ids, chunk_size
+            )
+            db.session.commit()
+            self.invalidate(updated_ids)
+            return {'count': len(updated_ids), 'ids': updated_ids}
+        except SQLAlchemyError as e:
+            logger.error(e)
+            db.session.rollback()
+            raise ApiException("Error updating objects")
+
+    def delete_all(self, query_params, chunk_size=None):
+        """
+        Deletes all objects selected by the 'ids' query parameter and/or
+        the filters of the query parameters with set based
+        DELETE ... RETURNING statements of at most chunk_size ids.
+
+        :return: a dict with the count and ids of the deleted objects
+        """
 
         if query_params is None:
             raise ApiException("No parameters are required")
 
+        query_spec = self.get_query_spec(query_params)
+
         try:
-            query_set = self.base_class.query
-            query_set = self.apply_query_params(query_set, query_params)
-            query_set.delete()
+            ids = self.select_ids(query_spec)
+            deleted_ids = self.execute_in_chunks(
+                delete(self.base_class), query_spec, ids, chunk_size
+            )
             db.session.commit()
-            return query_set
+            self.invalidate(deleted_ids)
+            return {'count': len(deleted_ids), 'ids': deleted_ids}
         except SQLAlchemyError as e:
             logger.error(e)
             db.session.rollback()
             raise ApiException("Error deleting all objects")
 
+    def select_ids(self, query_params):
+        """
+        Returns the ids of the 'ids' query parameter, or when it is not
+        given, the ids of all objects matching the filters. Raises an
+        ApiException when neither selects any objects, to prevent
+        accidental operations on all objects.
+        """
+        ids = self.get_ids(query_params)
+
+        if ids is not None:
+            return ids
+
+        statement = self.apply_query_params(
+            select(self.base_class.id), query_params
+        )
+
+        if statement.whereclause is None:
+            raise ApiException("Specify the ids or filters of the objects")
+
+        return list(db.session.scalars(statement.order_by(
+            self.base_class.id
+        )))
+
+    def get_ids(self, query_params):
+        ids = self.get_query_spec(query_params).ids
+
+        if ids is None or len(ids) == 0:
+            return None
+
+        return list(ids)
+
+    def execute_in_chunks(
+        self, statement, query_params, ids, chunk_size=None
+    ):
+        """
+        Executes an UPDATE or DELETE statement for the given ids in chunks,
+        with the filters of the query parameters applied.
+
+        :return: the ids of the affected rows
+        """
+        chunk_size = chunk_size or self.BULK_CHUNK_SIZE
+        statement = self.apply_query_params(statement, query_params) \
+            .returning(self.base_class.id) \
+            .execution_options(synchronize_session=False)
+        affected_ids = []
+
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            affected_ids.extend(db.session.scalars(
+                statement.where(self.base_class.id.in_(chunk))
+            ))
+
+        return affected_ids
+
+    @replica_read
     def get_all(self, query_params=None):
+        """
+        Returns the objects matching the query parameters. When a query
+        cache is configured, results are cached per set of query
+        parameters until the next write of the repository.
+        """
+        query_spec = self.get_query_spec(query_params)
+        query_cache = self.get_query_cache()
+
+        if query_cache is None:
+            return self._get_all(query_spec)
+
+        table_name = self.base_class.__tablename__
+        generation = query_cache.get_generation(table_name)
+
+        if generation is None:
+            return self._get_all(query_spec)
+
+        query_key = self.get_query_cache_key(query_spec)
+        cached_result = query_cache.get(table_name, generation, query_key)
+
+        if cached_result is not None:
+            return self.load_cached_result(cached_result)
+
+        result = self._get_all(query_spec)
+        query_cache.set(
+            table_name, generation, query_key, self.dump_cached_result(result)
+        )
+        return result
+
+    def _get_all(self, query_params=None):
+        query_spec = self.get_query_spec(query_params)
+
         try:
-            query_set = self.base_class.query
-            query_set = self.apply_query_params(query_set, query_params)
 
-            if self.is_itemized(query_params):
-                return self.create_itemization(query_set)
+            if query_spec.is_cursor_paginated:
+                return self.create_cursor_pagination(query_spec)
 
-            return self.create_pagination(query_params, query_set)
+            if query_spec.itemize:
+                return self.create_itemization(query_spec)
+
+            return self.create_pagination(query_spec)
         except SQLAlchemyError as e:
             logger.error(e)
             raise ApiException("Error getting all objects")
 
+    def stream_all(self, query_params=None, chunk_size=None):
+        """
+        Generator that yields the matching objects in lists of at most
+        chunk_size objects. Rows are fetched with a server side cursor, so
+        memory usage does not grow with the amount of matching rows.
+        """
+        query_spec = self.get_query_spec(query_params)
+        chunk_size = chunk_size or self.STREAM_CHUNK_SIZE
+        statement = self.create_stream_statement(query_spec)
+        parameters = self.create_filter_parameters(query_spec)
+        execution_options = {"stream_results": True, "yield_per": chunk_size}
+
+        try:
+
+            if self.READ_ONLY_LISTS:
+                snapshot_type = get_snapshot_type(self.base_class)
+                result = db.session.execute(
+                    statement, parameters, execution_options=execution_options
+                )
+
+                for partition in result.partitions():
+                    yield list(map(snapshot_type._make, partition))
+            else:
+                result = db.session.scalars(
+                    statement, parameters, execution_options=execution_options
+                )
+
+                for partition in result.partitions():
+                    yield partition
+        except SQLAlchemyError as e:
+            logger.error(e)
+            raise ApiException("Error streaming objects")
+
+    def create_stream_statement(self, query_spec):
+        """
+        Creates the select of stream_all, the list statement in the order
+        of the CURSOR_FIELDS.
+        """
+        return self.get_statement(
+            ("stream", query_spec.get_shape()),
+            lambda: self.create_list_statement(query_spec).order_by(*[
+                getattr(self.base_class, field)
+                for field in self.CURSOR_FIELDS
+            ])
+        )
+
+    @replica_read
+    def search(self, query_params):
+        """
+        Returns the objects matching the full text search query of the q
+        query parameter and the filters, best matches first. Pages are
+        cursor paginated on the rank and id of the last object.
+        """
+        query_spec = self.get_query_spec(query_params)
+
+        if query_spec.search is None or query_spec.search.strip() == "":
+            raise ApiException(f"The {SEARCH} query parameter is required")
+
+        if len(self.get_sort(query_spec)) > 0:
+            raise ApiException("Sorting is not supported with search")
+
+        backend = self.get_search_backend()
+        limit = query_spec.limit
+
+        if limit is None or limit < 1:
+            limit = self.DEFAULT_PER_PAGE
+
+        limit = min(limit, self.get_max_per_page())
+
+        values = []
+
+        if query_spec.cursor:
+            values, direction = decode_cursor(query_spec.cursor, 2)
+
+            if direction != NEXT:
+                raise ApiException("Invalid cursor")
+
+        seek = len(values) > 0
+        statement = self.get_statement(
+            ("search", backend.dialect, seek, query_spec.get_shape()),
+            lambda: self.create_search_statement(backend, query_spec, seek)
+        )
+        parameters = self.create_filter_parameters(query_spec)
+        parameters[SEARCH_QUERY_PARAMETER] = \
+            backend.prepare_query(query_spec.search)
+        parameters["search_limit"] = limit + 1
+
+        if seek:
+            parameters["search_rank"], parameters["search_id"] = values
+
+        try:
+            rows = db.session.execute(statement, parameters).all()
+        except SQLAlchemyError as e:
+            logger.error(e)
+            raise ApiException("Error searching objects")
+
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+        if self.READ_ONLY_LISTS:
+            snapshot_type = get_snapshot_type(self.base_class)
+            items = [snapshot_type._make(row[:-1]) for row in rows]
+        else:
+            items = [row[0] for row in rows]
+
+        next_cursor = None
+
+        if has_next:
+            next_cursor = encode_cursor([rows[-1][-1], items[-1].id], NEXT)
+
+        return {
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'items': items,
+        }
+
+    def get_search_backend(self):
+        dialect = db.session.get_bind(mapper=self.base_class).dialect.name
+
+        for backend in self.SEARCH_BACKENDS:
+
+            if backend.dialect == dialect:
+                return backend
+
+        raise ApiException("Search is not supported")
+
+    def create_search_statement(self, backend, query_spec, seek):
+        """
+        Creates the select of a page of search results in the order of
+        their rank, which seeks past the search_rank and search_id
+        parameters when seek is set.
+        """
+        matches = backend.create_matches()
+        statement = self.create_list_statement(query_spec) \
+            .join(matches, self.base_class.id == matches.c.id) \
+            .add_columns(matches.c.rank)
+
+        if seek:
+            rank = bindparam("search_rank", type_=matches.c.rank.type)
+            statement = statement.where(or_(
+                matches.c.rank < rank,
+                and_(
+                    matches.c.rank == rank,
+                    self.base_class.id > bindparam("search_id", type_=Integer)
+                )
+            ))
+
+        return statement \
+            .order_by(matches.c.rank.desc(), self.base_class.id.asc()) \
+            .limit(bindparam("search_limit", type_=Integer))
+
+    @replica_read
     def get(self, object_id):
-        return self.base_class.query.filter_by(id=object_id) \
-            .first_or_404(self.DEFAULT_NOT_FOUND_MESSAGE)
+        """
+        Returns the object with the given id. When the entity cache of the
+        repository is enabled, an immutable snapshot of the object is
+        returned instead of the ORM instance.
+        """
+        entity_cache = self.get_entity_cache()
+
+        if entity_cache is None:
+            return self.base_class.query.filter_by(id=object_id) \
+                .first_or_404(self.DEFAULT_NOT_FOUND_MESSAGE)
+
+        snapshot = entity_cache.get(object_id)
+
+        if snapshot is None:
+            snapshot = create_snapshot(
+                self.base_class.query.filter_by(id=object_id)
+                .first_or_404(self.DEFAULT_NOT_FOUND_MESSAGE)
+            )
+            entity_cache.set(object_id, snapshot)
+
+        return snapshot
+
+    @replica_read
+    def get_many(self, object_ids, chunk_size=None):
+        """
+        Returns the objects with the given ids with one
+        SELECT ... WHERE id IN (...) statement per chunk of at most
+        chunk_size ids that are not in the entity cache. Objects are
+        returned as immutable snapshots when the entity cache is enabled
+        or the repository has READ_ONLY_LISTS enabled.
+
+        :return: a dict with the found objects in the order of the given
+        ids and the ids that were not found
+        """
+        chunk_size = chunk_size or self.GET_MANY_CHUNK_SIZE
+        object_ids = list(dict.fromkeys(object_ids))
+        entity_cache = self.get_entity_cache()
+        found = {}
+
+        if entity_cache is not None:
+
+            for object_id in object_ids:
+                snapshot = entity_cache.get(object_id)
+
+                if snapshot is not None:
+                    found[object_id] = snapshot
+
+        remaining_ids = [
+            object_id for object_id in object_ids if object_id not in found
+        ]
+        read_only = entity_cache is not None or self.READ_ONLY_LISTS
+        statement = self.get_statement(
+            ("get_many", read_only),
+            lambda: self.create_get_many_statement(read_only)
+        )
+        snapshot_type = get_snapshot_type(self.base_class)
+
+        try:
+
+            for start in range(0, len(remaining_ids), chunk_size):
+                parameters = {
+                    "object_ids": remaining_ids[start:start + chunk_size]
+                }
+
+                if read_only:
+                    objects = map(
+                        snapshot_type._make,
+                        db.session.execute(statement, parameters)
+                    )
+                else:
+                    objects = db.session.scalars(statement, parameters)
+
+                for found_object in objects:
+                    found[found_object.id] = found_object
+
+                    if entity_cache is not None:
+                        entity_cache.set(found_object.id, found_object)
+        except SQLAlchemyError as e:
+            logger.error(e)
+            raise ApiException("Error getting objects")
+
+        return {
+            'items': [
+                found[object_id] for object_id in object_ids
+                if object_id in found
+            ],
+            'missing_ids': [
+                object_id for object_id in object_ids
+                if object_id not in found
+            ],
+        }
+
+    def create_get_many_statement(self, read_only):
+
+        if read_only:
+            statement = select(*self.get_read_only_columns())
+        else:
+            statement = select(self.base_class)
+
+        return statement.where(self.base_class.id.in_(
+            bindparam("object_ids", expanding=True)
+        ))
+
+    def get_entity_cache(self):
+        """
+        Returns the entity cache of this repository class for the current
+        app, or None if the entity cache is disabled. The ENTITY_CACHES
+        config setting overrides the max_size and ttl of the cache per
+        repository class name.
+        """
+        entity_caches = current_app.extensions.setdefault("entity_caches", {})
+        repository_class = type(self)
+
+        if repository_class not in entity_caches:
+            settings = current_app.config.get(ENTITY_CACHES, {}) \
+                .get(repository_class.__name__, {})
+            max_size = settings.get("max_size", self.ENTITY_CACHE_MAX_SIZE)
+            ttl = settings.get("ttl", self.ENTITY_CACHE_TTL)
+            entity_caches[repository_class] = \
+                LRUCache(max_size, ttl) if max_size else None
+
+        return entity_caches[repository_class]
+
+    def invalidate(self, object_ids):
+        """
+        Invalidates the cached entries of the given object ids and all
+        cached query results of the table, called after every write of
+        the repository.
+        """
+        entity_cache = self.get_entity_cache()
+
+        if entity_cache is not None:
+
+            for object_id in object_ids:
+                entity_cache.delete(object_id)
+
+        query_cache = self.get_query_cache()
+
+        if query_cache is not None and self.QUERY_CACHE_ENABLED:
+            query_cache.invalidate(self.base_class.__tablename__)
+
+    def get_query_cache(self):
+        """
+        Returns the query cache of the current app, or None if no query
+        cache backend is configured or the repository disables it.
+        """
+
+        if not self.QUERY_CACHE_ENABLED:
+            return None
+
+        if "query_cache" not in current_app.extensions:
+            current_app.extensions["query_cache"] = \
+                create_query_cache(current_app.config)
+
+        return current_app.extensions["query_cache"]
+
+    def get_query_cache_key(self, query_params):
+        query_spec = self.get_query_spec(query_params)
+        return hashlib.sha1(repr(query_spec.key).encode()).hexdigest()
+
+    def dump_cached_result(self, result):
+        """
+        Converts a result of _get_all into plain data that every query
+        cache backend can store.
+        """
+        cached_result = {
+            key: value for key, value in result.items() if key != 'items'
+        }
+        snapshot_type = get_snapshot_type(self.base_class)
+        cached_result['items'] = [
+            item._asdict() if isinstance(item, snapshot_type)
+            else create_snapshot(item)._asdict()
+            for item in result['items']
+        ]
+        return cached_result
+
+    def load_cached_result(self, cached_result):
+        snapshot_type = get_snapshot_type(self.base_class)
+        result = dict(cached_result)
+        result['items'] = [
+            snapshot_type(**item) for item in cached_result['items']
+        ]
+        return result
 
     def _apply_query_params(self, query, query_params):
         return query
@@ -88,10 +774,162 @@ class Repository(ABC):
     def apply_query_params(self, query, query_params):
 
         if query_params is not None:
-            query = self._apply_query_params(query, query_params)
+            query_spec = self.get_query_spec(query_params)
+            query = self.apply_filters(query, query_spec)
+            query = self._apply_query_params(query, query_spec)
 
         return query
 
+    def get_query_spec(self, query_params):
+        """
+        Returns the QuerySpec of the query parameters. The parameters are
+        only parsed when they are not a QuerySpec already, e.g. when the
+        repository is used without the API.
+        """
+        return QuerySpec.from_params(
+            query_params,
+            self.NON_FILTER_QUERY_PARAMS,
+            max_per_page=self.get_max_per_page()
+        )
+
+    def get_max_per_page(self):
+        return current_app.config.get(MAX_PER_PAGE, self.MAX_PER_PAGE)
+
+    def get_statement(self, shape, create_statement):
+        """
+        Returns the statement of the shape of a query spec from the
+        statement cache of the repository class, or creates it with
+        create_statement. Statements of the same shape only differ in the
+        values of their bound parameters, which are passed on execution,
+        so hot list queries are not rebuilt and SQLAlchemy finds their
+        compiled form without generating a new cache key.
+
+        Statements are not cached when a subclass overrides
+        apply_query_params or _apply_query_params, because those can
+        embed values that are not part of the shape.
+        """
+
+        if not self.is_statement_cacheable():
+            return create_statement()
+
+        repository_class = type(self)
+        statement_cache = _statement_caches.get(repository_class)
+
+        if statement_cache is None:
+            statement_cache = LRUCache(self.STATEMENT_CACHE_SIZE)
+            _statement_caches[repository_class] = statement_cache
+
+        key = (self.READ_ONLY_LISTS, shape)
+        statement = statement_cache.get(key)
+
+        if statement is None:
+            statement = create_statement()
+            statement_cache.set(key, statement)
+
+        return statement
+
+    def is_statement_cacheable(self):
+        repository_class = type(self)
+        return repository_class.apply_query_params \
+            is Repository.apply_query_params \
+            and repository_class._apply_query_params \
+            is Repository._apply_query_params
+
+    def apply_filters(self, query, query_params):
+        """
+        Applies the filter query parameters with the declared FILTERS of
+        the repository, e.g. ?completed=true&created_at__gte=2024-01-01.
+        Values are bound as named parameters of the statement.
+        """
+        clauses, _ = self.create_filter_clauses(query_params)
+
+        if len(clauses) == 0:
+            return query
+
+        return query.filter(*clauses)
+
+    def create_filter_clauses(self, query_params):
+        """
+        :return: a tuple of the filter expressions of the query spec and
+        the values of their bound parameters
+        """
+
+        if len(self.FILTERS) == 0:
+            return [], {}
+
+        clauses = []
+        parameters = {}
+
+        for index, (field, operator, values, declared) \
+                in enumerate(self.get_declared_filters(query_params)):
+            clause, clause_parameters = declared.compile(
+                getattr(self.base_class, field), operator, list(values),
+                index
+            )
+            clauses.append(clause)
+            parameters.update(clause_parameters)
+
+        return clauses, parameters
+
+    def create_filter_parameters(self, query_params):
+        """
+        Returns the values of the bound parameters of the filters of the
+        query spec, without building the filter expressions.
+        """
+
+        if len(self.FILTERS) == 0:
+            return {}
+
+        parameters = {}
+
+        for index, (field, operator, values, declared) \
+                in enumerate(self.get_declared_filters(query_params)):
+            parameters.update(declared.get_parameters(
+                getattr(self.base_class, field), operator, list(values),
+                index
+            ))
+
+        return parameters
+
+    def get_declared_filters(self, query_params):
+        filters = {declared.field: declared for declared in self.FILTERS}
+
+        for field, operator, values in self.get_filter_params(query_params):
+            declared = filters.get(field)
+
+            if declared is None:
+                raise ApiException(f"Filtering on {field} is not supported")
+
+            yield field, operator, values, declared
+
+    def get_sort(self, query_params):
+        """
+        :return: a list of tuples of the field and whether it is sorted
+        descending, from the sort query parameter (e.g. ?sort=-created_at)
+        """
+        sort = self.get_query_spec(query_params).sort
+        validate_sort(sort, self.SORT_FIELDS)
+        return list(sort)
+
+    def apply_sort(self, query, query_params):
+        sort = self.get_sort(query_params)
+
+        if len(sort) == 0:
+            return query
+
+        order_by = [
+            getattr(self.base_class, field).desc() if descending
+            else getattr(self.base_class, field).asc()
+            for field, descending in sort
+        ]
+
+        # Ties are ordered by the primary key, so pages do not overlap
+        if "id" not in [field for field, _ in sort]:
+            order_by.append(self.base_class.id.asc())
+
+        return query.order_by(*order_by)
+
+    @replica_read
     def exists(self, query_params):
         try:
             query = self.base_class.query
@@ -101,6 +939,7 @@ class Repository(ABC):
             logger.error(e)
             raise ApiException("Error checking if object exists")
 
+    @replica_read
     def find(self, query_params):
         try:
             query = self.base_class.query
@@ -110,11 +949,11 @@ class Repository(ABC):
             logger.error(e)
             raise ApiException("Error finding object")
 
+    @replica_read
     def count(self, query_params=None):
         try:
-            query = self.base_class.query
-            query = self.apply_query_params(query, query_params)
-            return query.count()
+            total, _ = self.create_total(self.get_query_spec(query_params))
+            return total
         except SQLAlchemyError as e:
             logger.error(e)
             raise ApiException("Error counting objects")
@@ -128,16 +967,13 @@ class Repository(ABC):
         :param value: a value from a query parameter
         :return: a normalized query parameter value
         """
+        return normalize_query_param(value)
 
-        if len(value) == 1 and value[0].lower() in ["true", "false"]:
-
-            if value[0].lower() == "true":
-                return True
-            return False
+    def is_query_param_present(self, key, params, throw_exception=False):
 
-        return value if len(value) > 1 else value[0]
+        if isinstance(params, QuerySpec):
+            params = params.params
 
-    def is_query_param_present(self, key, params, throw_exception=False):
         query_params = self.normalize_query(params)
 
         if key not in query_params:
@@ -157,10 +993,7 @@ class Repository(ABC):
         :param params: a flask query parameters data structure
         :return: a dict of normalized query parameters
         """
-        if isinstance(params, MultiDict):
-            params = params.to_dict(flat=False)
-
-        return {k: self.normalize_query_param(v) for k, v in params.items()}
+        return normalize_query(params)
 
     def get_query_param(self, key: str, params, default=None, many=False):
         boolean_array = ["true", "false"]
@@ -168,6 +1001,9 @@ class Repository(ABC):
         if params is None:
             return default
 
+        if isinstance(params, QuerySpec):
+            params = params.params
+
         if not isinstance(params, dict):
             params = self.normalize_query(params)
 
@@ -199,39 +1035,419 @@ class Repository(ABC):
         return new_selection
 
     def is_itemized(self, query_params):
+        return self.get_query_spec(query_params).itemize
 
-        if query_params is None:
-            return False
+    def is_cursor_paginated(self, query_params):
+        return self.get_query_spec(query_params).is_cursor_paginated
+
+    def create_pagination(self, query_params):
+        query_spec = self.get_query_spec(query_params)
+        page = query_spec.page if query_spec.page is not None \
+            else self.DEFAULT_PAGE
+        per_page = query_spec.per_page if query_spec.per_page is not None \
+            else self.DEFAULT_PER_PAGE
 
-        itemized = self.get_query_param(ITEMIZED, query_params, False)
-        itemize = self.get_query_param(ITEMIZE, query_params, False)
-        return itemized or itemize
+        # Same semantics as the paginate method of Flask-SQLAlchemy
+        if page < 1 or per_page < 1:
+            abort(404)
 
-    def create_pagination(self, query_params, query_set):
-        page = self.get_query_param(PAGE, query_params, self.DEFAULT_PAGE)
-        per_page = self.get_query_param(
-            PER_PAGE, query_params, self.DEFAULT_PER_PAGE
+        per_page = min(per_page, self.get_max_per_page())
+
+        statement = self.get_statement(
+            ("page", query_spec.get_shape()),
+            lambda: self.create_list_statement(query_spec)
+            .limit(bindparam("page_limit", type_=Integer))
+            .offset(bindparam("page_offset", type_=Integer))
         )
+        parameters = self.create_filter_parameters(query_spec)
+        parameters["page_limit"] = per_page
+        parameters["page_offset"] = (page - 1) * per_page
+        items = self.fetch_all(statement, parameters)
 
-        try:
-            page = int(page)
-        except ValueError:
-            page = self.DEFAULT_PAGE
+        if len(items) == 0 and page != 1:
+            abort(404)
 
-        try:
-            per_page = int(per_page)
-        except ValueError:
-            per_page = self.DEFAULT_PER_PAGE
+        total, total_type = self.create_total(query_spec)
+        return {
+            'total': total,
+            'total_type': total_type,
+            'page': page,
+            'per_page': per_page,
+            'items': items,
+        }
+
+    def get_count_strategy(self, query_params):
+        strategy = self.get_query_spec(query_params).count
+
+        if strategy is None:
+            return self.COUNT_STRATEGY
+
+        if strategy not in COUNT_STRATEGIES:
+            raise ApiException(
+                f"Count strategy must be one of {', '.join(COUNT_STRATEGIES)}"
+            )
+
+        return strategy
+
+    def get_filter_params(self, query_params):
+        """
+        Returns the filters of the query spec as a sorted and hashable
+        tuple of (field, operator, values) tuples, leaving out pagination
+        and formatting parameters.
+        """
+        return self.get_query_spec(query_params).filters
+
+    def get_fields(self, query_params):
+        """
+        Returns the column attributes selected with the comma separated
+        fields query parameter, or None when all columns are selected.
+        Fields that are not columns of the model are ignored.
+        """
+        query_spec = self.get_query_spec(query_params)
+
+        if query_spec.fields is None:
+            return None
+
+        requested = set(query_spec.fields)
 
-        paginated = query_set.paginate(page=int(page), per_page=int(per_page))
+        # The cursors of the pages are created from the cursor fields
+        if query_spec.is_cursor_paginated:
+            requested.update(self.CURSOR_FIELDS)
+
+        # The cursors of search results are created from the rank and id
+        if query_spec.search is not None:
+            requested.add("id")
+
+        # The validators of a list are created from the ids and the last
+        # modified dates of its items
+        requested.update(["id", *self.LAST_MODIFIED_FIELDS])
+
+        columns = inspect(self.base_class).column_attrs.keys()
+        fields = [column for column in columns if column in requested]
+        return fields if len(fields) < len(columns) else None
+
+    def create_list_statement(self, query_spec):
+        """
+        Creates the select of the objects matching the filters of the
+        query spec in its sort order, without pagination. Only the
+        selected fields are loaded, the columns of the primary key are
+        always loaded. With READ_ONLY_LISTS the columns of the snapshot
+        type are selected instead of ORM instances.
+        """
+        fields = self.get_fields(query_spec)
+
+        if self.READ_ONLY_LISTS:
+            statement = select(*self.get_read_only_columns(fields))
+        else:
+            statement = select(self.base_class)
+
+            if fields is not None:
+                statement = statement.options(load_only(*[
+                    getattr(self.base_class, field) for field in fields
+                ]))
+
+        statement = self.apply_query_params(statement, query_spec)
+        return self.apply_sort(statement, query_spec)
+
+    def get_explain_queries(self):
+        """
+        Returns representative list queries of the repository for the
+        explain-queries command, as tuples of a description, the select
+        statement with its parameter values and whether an index is
+        expected to serve the query. Covers every declared filter operator
+        and sort field and the first page of cursor pagination.
+        """
+        queries = []
+        indexed_fields = {"id"}
+
+        for declared in self.FILTERS:
+            column = getattr(self.base_class, declared.field)
+
+            if declared.indexed:
+                indexed_fields.add(declared.field)
+
+            for operator in declared.operators:
+                key = f"{declared.field}{OPERATOR_SEPARATOR}{operator}"
+                queries.append((
+                    {key: get_sample_value(column, operator)},
+                    declared.indexed
+                ))
+
+        for field in self.SORT_FIELDS:
+            queries.append(({SORT: field}, field in indexed_fields))
+
+        queries.append(({CURSOR: ""}, True))
+        explain_queries = []
+
+        for query_params, indexed in queries:
+            query_spec = self.get_query_spec(query_params)
+            parameters = self.create_filter_parameters(query_spec)
+
+            if query_spec.is_cursor_paginated:
+                statement = self.create_cursor_statement(
+                    query_spec, NEXT, False
+                )
+                parameters["cursor_limit"] = self.DEFAULT_PER_PAGE + 1
+            else:
+                statement = self.create_list_statement(query_spec) \
+                    .limit(self.DEFAULT_PER_PAGE)
+
+            description = "&".join(
+                f"{key}={value}" for key, value in query_params.items()
+            )
+            explain_queries.append(
+                (description, statement.params(**parameters), indexed)
+            )
+
+        return explain_queries
+
+    def create_total(self, query_params):
+        """
+        Determines the total amount of rows matching the filters
+        according to the count strategy.
+
+        :return: a tuple of the total and the strategy that produced it
+        """
+        query_spec = self.get_query_spec(query_params)
+        strategy = self.get_count_strategy(query_spec)
+
+        if strategy == NO_COUNT:
+            return None, NO_COUNT
+
+        if strategy == ESTIMATED_COUNT:
+            estimate = self.estimate_count(query_spec)
+
+            if estimate is not None:
+                return estimate, ESTIMATED_COUNT
+
+        if strategy == CACHED_COUNT:
+            return self.cached_count(query_spec), CACHED_COUNT
+
+        return self.exact_count(query_spec), EXACT_COUNT
+
+    def exact_count(self, query_params):
+        query_spec = self.get_query_spec(query_params)
+        statement = self.get_statement(
+            ("count", query_spec.get_filter_shape()),
+            lambda: self.apply_query_params(
+                select(func.count()).select_from(self.base_class), query_spec
+            )
+        )
+        return db.session.execute(
+            statement, self.create_filter_parameters(query_spec)
+        ).scalar()
+
+    def cached_count(self, query_params):
+        query_spec = self.get_query_spec(query_params)
+        count_cache = self.get_count_cache()
+        total = count_cache.get(query_spec.filter_key)
+
+        if total is not None:
+            return total
+
+        total = self.exact_count(query_spec)
+        count_cache.set(query_spec.filter_key, total)
+        return total
+
+    def get_count_cache(self):
+        """
+        Returns the cache of the totals of the cached count strategy of
+        this repository class for the current app, keyed by the filters.
+        """
+        count_caches = current_app.extensions.setdefault("count_caches", {})
+        repository_class = type(self)
+
+        if repository_class not in count_caches:
+            count_caches[repository_class] = LRUCache(
+                self.COUNT_CACHE_MAX_SIZE, self.COUNT_CACHE_TTL
+            )
+
+        return count_caches[repository_class]
+
+    def estimate_count(self, query_params):
+        """
+        Uses the query planner statistics to estimate the total. Only
+        postgres is supported, for other backends None is returned so
+        that an exact count is used instead.
+        """
+        bind = db.session.get_bind(mapper=self.base_class)
+
+        if bind.dialect.name != "postgresql":
+            return None
+
+        query_spec = self.get_query_spec(query_params)
+
+        if len(query_spec.filters) == 0:
+            estimate = db.session.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:table_name)"
+                ),
+                {"table_name": self.base_class.__tablename__}
+            ).scalar()
+        else:
+            # The filter values are passed as parameters instead of being
+            # inlined, expanding parameters are rendered per value
+            statement = self.apply_query_params(
+                select(self.base_class.id), query_spec
+            ).compile(
+                dialect=bind.dialect,
+                compile_kwargs={"render_postcompile": True}
+            )
+            plan = db.session.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", statement.params
+            ).scalar()
+
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+
+            estimate = plan[0]["Plan"]["Plan Rows"]
+
+        # Tables that have never been analyzed report -1 or 0 tuples
+        if estimate is None or estimate <= 0:
+            return None
+
+        return int(estimate)
+
+    def create_itemization(self, query_params=None):
+        query_spec = self.get_query_spec(query_params)
+        statement = self.get_statement(
+            ("itemize", query_spec.get_shape()),
+            lambda: self.create_list_statement(query_spec)
+        )
         return {
-            'total': paginated.total,
-            'page': paginated.page,
-            'per_page': paginated.per_page,
-            'items': paginated.items,
+            'items': self.fetch_all(
+                statement, self.create_filter_parameters(query_spec)
+            )
         }
 
-    def create_itemization(self, query_set):
+    def fetch_all(self, statement, parameters=None):
+        """
+        Executes the list statement with the values of its bound
+        parameters and returns all objects, as immutable snapshots when
+        the repository has READ_ONLY_LISTS enabled.
+        """
+
+        if not self.READ_ONLY_LISTS:
+            return db.session.scalars(statement, parameters).all()
+
+        snapshot_type = get_snapshot_type(self.base_class)
+        result = db.session.execute(statement, parameters)
+        return list(map(snapshot_type._make, result))
+
+    def get_read_only_columns(self, fields=None):
+        """
+        Returns the columns of the model in the order of the fields of its
+        snapshot type. Columns that are not selected with the fields query
+        parameter are selected as NULL.
+        """
+        return [
+            getattr(self.base_class, key)
+            if fields is None or key in fields else null().label(key)
+            for key in get_snapshot_type(self.base_class)._fields
+        ]
+
+    def create_cursor_pagination(self, query_params):
+        """
+        Keyset pagination that seeks on the CURSOR_FIELDS instead of using
+        OFFSET, and never counts the total amount of rows. An empty cursor
+        returns the first page.
+        """
+        query_spec = self.get_query_spec(query_params)
+
+        if len(self.get_sort(query_spec)) > 0:
+            raise ApiException(
+                "Sorting is not supported with cursor pagination"
+            )
+
+        limit = query_spec.limit
+
+        if limit is None or limit < 1:
+            limit = self.DEFAULT_PER_PAGE
+
+        limit = min(limit, self.get_max_per_page())
+
+        cursor = query_spec.cursor
+        values = []
+        direction = NEXT
+
+        if cursor:
+            values, direction = decode_cursor(
+                cursor, len(self.CURSOR_FIELDS)
+            )
+
+        statement = self.get_statement(
+            ("cursor", direction, bool(cursor), query_spec.get_shape()),
+            lambda: self.create_cursor_statement(
+                query_spec, direction, bool(cursor)
+            )
+        )
+        parameters = self.create_filter_parameters(query_spec)
+        parameters["cursor_limit"] = limit + 1
+
+        for index, value in enumerate(values):
+            parameters[f"cursor_{index}"] = value
+
+        items = self.fetch_all(statement, parameters)
+        has_more = len(items) > limit
+        items = items[:limit]
+
+        if direction == NEXT:
+            has_next, has_prev = has_more, bool(cursor)
+        else:
+            items.reverse()
+            has_next, has_prev = True, has_more
+
+        next_cursor = None
+        prev_cursor = None
+
+        if len(items) > 0:
+
+            if has_next:
+                next_cursor = encode_cursor(
+                    self.get_cursor_values(items[-1]), NEXT
+                )
+
+            if has_prev:
+                prev_cursor = encode_cursor(
+                    self.get_cursor_values(items[0]), PREV
+                )
+
         return {
-            'items': query_set.all()
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor,
+            'items': items,
         }
+
+    def create_cursor_statement(self, query_spec, direction, seek):
+        """
+        Creates the select of a page of cursor pagination, which seeks past
+        the cursor_0 ... cursor_n parameters when seek is set and limits
+        the page with the cursor_limit parameter.
+        """
+        columns = [getattr(self.base_class, field)
+                   for field in self.CURSOR_FIELDS]
+        statement = self.create_list_statement(query_spec)
+
+        if seek:
+            sort_key = tuple_(*columns)
+            cursor_key = tuple_(*[
+                bindparam(f"cursor_{index}", type_=column.type)
+                for index, column in enumerate(columns)
+            ])
+
+            if direction == NEXT:
+                statement = statement.where(sort_key > cursor_key)
+            else:
+                statement = statement.where(sort_key < cursor_key)
+
+        if direction == NEXT:
+            statement = statement.order_by(*[c.asc() for c in columns])
+        else:
+            statement = statement.order_by(*[c.desc() for c in columns])
+
+        return statement.limit(bindparam("cursor_limit", type_=Integer))
+
+    def get_cursor_values(self, item):
+        return [getattr(item, field) for field in self.CURSOR_FIELDS]
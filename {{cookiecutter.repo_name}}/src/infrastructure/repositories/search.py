@@ -0,0 +1,191 @@
+from abc import ABC, abstractmethod
+
+from sqlalchemy import DDL, Float, String, bindparam, cast, column, event, \
+    func, literal_column, select, table
+
+POSTGRES_DIALECT = "postgresql"
+SQLITE_DIALECT = "sqlite"
+SEARCH_QUERY_PARAMETER = "search_query"
+# Weights of the fields of a postgres search vector, in order of the fields
+WEIGHTS = ("A", "B", "C", "D")
+# Key of the schema objects of the search backends in the info of a table
+SEARCH_OBJECTS = "search_objects"
+# Tables that FTS5 creates for the data of an external content table
+FTS5_SHADOW_TABLES = ("data", "idx", "docsize", "config")
+
+
+class SearchBackend(ABC):
+    """
+    Full text search on the text fields of a table for a single database
+    dialect. The backend registers the DDL of its search index on the
+    table, so it is created and dropped together with the table by
+    create_all and drop_all. Deployed databases get the index with a
+    migration.
+    """
+    dialect: str
+
+    def __init__(self, table_, fields):
+        self.table = table_
+        self.fields = tuple(fields)
+        self.table.info.setdefault(SEARCH_OBJECTS, set()).update(
+            self.get_schema_objects()
+        )
+
+        for ddl_event, statements in [
+            ("after_create", self.get_create_statements()),
+            ("before_drop", self.get_drop_statements()),
+        ]:
+
+            for statement in statements:
+                event.listen(
+                    self.table,
+                    ddl_event,
+                    DDL(statement).execute_if(dialect=self.dialect)
+                )
+
+    @abstractmethod
+    def get_create_statements(self):
+        pass
+
+    def get_drop_statements(self):
+        return []
+
+    @abstractmethod
+    def get_schema_objects(self):
+        """
+        Returns the (type, name) pairs of the objects that the create
+        statements add to the database, with the names of columns
+        qualified by their table. Autogenerated migrations leave them out.
+        """
+        pass
+
+    @abstractmethod
+    def create_matches(self):
+        """
+        Creates a subquery of the id and rank of the rows that match the
+        search_query parameter. Higher ranks are better matches.
+        """
+        pass
+
+    def prepare_query(self, query):
+        """
+        Converts the q query parameter into the value of the search_query
+        parameter.
+        """
+        return query
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Searches a generated tsvector column with a GIN index, the fields are
+    weighted in their order. The query is parsed with
+    websearch_to_tsquery, so any user input is a valid query.
+    """
+    dialect = POSTGRES_DIALECT
+
+    def __init__(self, table_, fields, language="english"):
+        self.language = language
+        self.column_name = "search_vector"
+        super().__init__(table_, fields)
+
+    def get_create_statements(self):
+        vector = " || ".join(
+            f"setweight(to_tsvector('{self.language}', "
+            f"coalesce({field}, '')), '{WEIGHTS[min(index, 3)]}')"
+            for index, field in enumerate(self.fields)
+        )
+        return [
+            f"ALTER TABLE {self.table.name} ADD COLUMN {self.column_name} "
+            f"tsvector GENERATED ALWAYS AS ({vector}) STORED",
+            f"CREATE INDEX ix_{self.table.name}_{self.column_name} "
+            f"ON {self.table.name} USING GIN ({self.column_name})",
+        ]
+
+    def get_schema_objects(self):
+        return {
+            ("column", f"{self.table.name}.{self.column_name}"),
+            ("index", f"ix_{self.table.name}_{self.column_name}"),
+        }
+
+    def create_matches(self):
+        vector = literal_column(f"{self.table.name}.{self.column_name}")
+        query = func.websearch_to_tsquery(
+            literal_column(f"'{self.language}'"),
+            bindparam(SEARCH_QUERY_PARAMETER, type_=String)
+        )
+        # Ranks are compared with the values of cursors, which are exact
+        # for double precision values only
+        rank = cast(func.ts_rank_cd(vector, query), Float(precision=53))
+        return select(
+            self.table.c.id.label("id"), rank.label("rank")
+        ).where(vector.op("@@")(query)).subquery("matches")
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Searches an external content FTS5 table that triggers keep in sync
+    with the table, ranked by bm25. Every word of the query must match.
+    """
+    dialect = SQLITE_DIALECT
+
+    def __init__(self, table_, fields, weights=None):
+        self.search_table_name = f"{table_.name}_search"
+        self.weights = weights or [
+            10.0 if index == 0 else 1.0 for index in range(len(fields))
+        ]
+        super().__init__(table_, fields)
+
+    def get_create_statements(self):
+        name = self.search_table_name
+        fields = ", ".join(self.fields)
+        new_values = ", ".join(f"new.{field}" for field in self.fields)
+        old_values = ", ".join(f"old.{field}" for field in self.fields)
+        insert_new = f"INSERT INTO {name}(rowid, {fields}) " \
+            f"VALUES (new.id, {new_values});"
+        delete_old = f"INSERT INTO {name}({name}, rowid, {fields}) " \
+            f"VALUES ('delete', old.id, {old_values});"
+        return [
+            f"CREATE VIRTUAL TABLE {name} USING fts5({fields}, "
+            f"content='{self.table.name}', content_rowid='id')",
+            f"CREATE TRIGGER {name}_insert AFTER INSERT ON {self.table.name} "
+            f"BEGIN {insert_new} END",
+            f"CREATE TRIGGER {name}_delete AFTER DELETE ON {self.table.name} "
+            f"BEGIN {delete_old} END",
+            f"CREATE TRIGGER {name}_update AFTER UPDATE ON {self.table.name} "
+            f"BEGIN {delete_old} {insert_new} END",
+        ]
+
+    def get_drop_statements(self):
+        return [f"DROP TABLE IF EXISTS {self.search_table_name}"]
+
+    def get_schema_objects(self):
+        name = self.search_table_name
+        return {
+            ("table", name),
+            *[("table", f"{name}_{suffix}") for suffix in FTS5_SHADOW_TABLES],
+            *[
+                ("trigger", f"{name}_{operation}")
+                for operation in ("insert", "delete", "update")
+            ],
+        }
+
+    def create_matches(self):
+        name = self.search_table_name
+        search_table = table(name, column("rowid"), column(name))
+        rank = -func.bm25(
+            literal_column(name),
+            *[literal_column(repr(float(weight))) for weight in self.weights]
+        )
+        return select(
+            search_table.c.rowid.label("id"), rank.label("rank")
+        ).where(
+            search_table.c[name].op("MATCH")(
+                bindparam(SEARCH_QUERY_PARAMETER, type_=String)
+            )
+        ).subquery("matches")
+
+    def prepare_query(self, query):
+        # Quote every word, so the query syntax of FTS5 is not interpreted
+        return " ".join(
+            '"' + word.replace('"', '""') + '"' for word in query.split()
+        )
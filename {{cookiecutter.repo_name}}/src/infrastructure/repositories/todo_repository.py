@@ -1,15 +1,31 @@
+from .async_repository import AsyncRepository
+from .filters import Filter, EQ, IN, STARTSWITH, RANGE_OPERATORS
 from .repository import Repository
+from .search import PostgresSearchBackend, SQLiteSearchBackend
 from ..models import SQLTodo
 
 
 class SQLTodoRepository(Repository):
     DEFAULT_NOT_FOUND_MESSAGE = "The requested todo was not found"
+    DEFAULT_PRECONDITION_FAILED_MESSAGE = "The todo has been modified"
     base_class = SQLTodo
+    CURSOR_FIELDS = ("created_at", "id")
+    LAST_MODIFIED_FIELDS = ("updated_at", "created_at")
+    VERSION_FIELDS = ("created_at", "updated_at")
+    READ_ONLY_LISTS = True
+    FILTERS = (
+        Filter("id", [EQ, IN], indexed=True),
+        Filter("title", [EQ, STARTSWITH], indexed=True),
+        Filter("completed", [EQ], indexed=True),
+        Filter("created_at", RANGE_OPERATORS, indexed=True),
+        Filter("updated_at", RANGE_OPERATORS, indexed=True),
+    )
+    SORT_FIELDS = ("id", "title", "completed", "created_at", "updated_at")
+    SEARCH_BACKENDS = (
+        PostgresSearchBackend(SQLTodo.__table__, ("title", "description")),
+        SQLiteSearchBackend(SQLTodo.__table__, ("title", "description")),
+    )
 
-    def apply_query_params(self, query, query_params):
-        title_query_param = self.get_query_param("title", query_params)
 
-        if title_query_param is not None:
-            query = query.filter(SQLTodo.title == title_query_param)
-
-        return query
+class AsyncSQLTodoRepository(AsyncRepository):
+    repository_class = SQLTodoRepository
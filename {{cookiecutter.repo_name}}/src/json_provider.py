@@ -0,0 +1,132 @@
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+ORJSON_ENCODER = "orjson"
+MSGSPEC_ENCODER = "msgspec"
+STDLIB_ENCODER = "json"
+
+
+def _default(value):
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    return DefaultJSONProvider.default(value)
+
+
+def _isoformat_aware(value):
+    """
+    Replaces the aware datetimes and times in nested dicts, lists and
+    tuples with their isoformat, msgspec writes a utc offset as Z instead
+    of +00:00.
+    """
+
+    if isinstance(value, dict):
+        return {key: _isoformat_aware(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [_isoformat_aware(item) for item in value]
+
+    if isinstance(value, (datetime, time)) and value.tzinfo is not None:
+        return value.isoformat()
+
+    return value
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson or msgspec when one of them is
+    installed and falls back to the standard library json module. Dates
+    and datetimes are encoded as ISO 8601 strings by all encoders, and
+    the fast encoders write non-ascii characters as utf-8.
+    """
+    default = staticmethod(_default)
+
+    def __init__(self, app, encoder=None):
+        super().__init__(app)
+
+        if encoder is None:
+
+            if orjson is not None:
+                encoder = ORJSON_ENCODER
+            elif msgspec is not None:
+                encoder = MSGSPEC_ENCODER
+            else:
+                encoder = STDLIB_ENCODER
+
+        self.encoder = encoder
+
+        if encoder == MSGSPEC_ENCODER:
+            self._msgspec_encoder = msgspec.json.Encoder(
+                enc_hook=self.default,
+                order="sorted" if self.sort_keys else None
+            )
+
+    def dumps_bytes(self, obj, indent=False):
+        """
+        Encodes the object directly to compact (or indented) utf-8 bytes.
+        """
+
+        if self.encoder == ORJSON_ENCODER:
+            option = orjson.OPT_NON_STR_KEYS
+
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+
+            if indent:
+                option |= orjson.OPT_INDENT_2
+
+            return orjson.dumps(obj, default=self.default, option=option)
+
+        if self.encoder == MSGSPEC_ENCODER and not indent:
+            return self._msgspec_encoder.encode(_isoformat_aware(obj))
+
+        if indent:
+            return super().dumps(obj, indent=2).encode()
+
+        return super().dumps(obj, separators=(",", ":")).encode()
+
+    def dumps(self, obj, **kwargs):
+        fast_kwargs = {"indent", "separators"}
+
+        if self.encoder == STDLIB_ENCODER or not set(kwargs) <= fast_kwargs:
+            return super().dumps(obj, **kwargs)
+
+        return self.dumps_bytes(
+            obj, indent=kwargs.get("indent") is not None
+        ).decode()
+
+    def loads(self, s, **kwargs):
+
+        if self.encoder == ORJSON_ENCODER and not kwargs:
+            return orjson.loads(s)
+
+        if self.encoder == MSGSPEC_ENCODER and not kwargs:
+            return msgspec.json.decode(s)
+
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) \
+            or self.compact is False
+        return self._app.response_class(
+            self.dumps_bytes(obj, indent=indent) + b"\n",
+            mimetype=self.mimetype
+        )
+
+
+def setup_json_provider(app, encoder=None):
+    app.json = FastJSONProvider(app, encoder=encoder)
+    return app
@@ -1,14 +1,60 @@
 import logging
 
+import click
 from flask_migrate import Migrate
-from src.infrastructure import sqlalchemy_db as db
+from src.infrastructure import sqlalchemy_db as db, explain, Repository, \
+    get_engines_pool_statistics, SEARCH_OBJECTS
 
 migrate = Migrate()
 logger = logging.getLogger(__name__)
 
 
+def get_search_objects():
+    """
+    Returns the (type, name) pairs of the schema objects of the search
+    backends of all tables, see SearchBackend.get_schema_objects.
+    """
+    return {
+        search_object
+        for table in db.metadata.tables.values()
+        for search_object in table.info.get(SEARCH_OBJECTS, ())
+    }
+
+
+def include_object(object_, name, type_, reflected, compare_to):
+    """
+    Leaves the full text search objects, which are created by the search
+    backends of the repositories and not by the models, out of
+    autogenerated migrations.
+    """
+
+    if not reflected or compare_to is not None:
+        return True
+
+    if type_ == "column":
+        name = f"{object_.table.name}.{name}"
+
+    return (type_, name) not in get_search_objects()
+
+
+def get_repositories(app):
+    """
+    Returns an instance of every repository of the dependency container.
+    """
+    repositories = []
+
+    for provider in app.container.providers.values():
+        provided_class = getattr(provider, "cls", None)
+
+        if isinstance(provided_class, type) \
+                and issubclass(provided_class, Repository):
+            repositories.append(provider())
+
+    return repositories
+
+
 def setup_management(app):
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, include_object=include_object)
 
     @app.cli.command("show_db_tables")
     def show_db_tables():
@@ -18,4 +64,126 @@ def setup_management(app):
     def print_config():
         print(app.config)
 
+    @app.cli.command("explain-queries")
+    @click.option(
+        "--analyze",
+        is_flag=True,
+        help="Run the queries with EXPLAIN ANALYZE (postgres only)."
+    )
+    @click.option(
+        "--rows-threshold",
+        default=1000,
+        show_default=True,
+        help="Flag sequential scans and sorts of at least this many rows."
+    )
+    def explain_queries(analyze, rows_threshold):
+        """
+        Runs the representative list queries of every repository under
+        EXPLAIN and flags sequential scans and sorts of at least
+        rows-threshold rows. Exits with status 1 when a query that an
+        index should serve is flagged, so CI can catch plan regressions.
+        """
+        failed = False
+
+        try:
+
+            for repository in get_repositories(app):
+                print(type(repository).__name__)
+
+                for description, statement, indexed \
+                        in repository.get_explain_queries():
+                    issues = [
+                        issue for issue in explain(
+                            db.session.connection(), statement, analyze
+                        )
+                        if issue.rows >= rows_threshold
+                    ]
+
+                    if len(issues) == 0:
+                        status = "ok"
+                    elif indexed:
+                        status = "FLAGGED"
+                        failed = True
+                    else:
+                        status = "unindexed"
+
+                    print(f"  {status:<10} {description}")
+
+                    for issue in issues:
+                        relation = f" on {issue.relation}" \
+                            if issue.relation else ""
+                        print(
+                            f"  {'':<10}   {issue.kind}{relation} "
+                            f"({issue.rows} rows)"
+                        )
+        finally:
+            db.session.rollback()
+
+        if failed:
+            raise SystemExit(1)
+
+    @app.cli.command("pool-stats")
+    @click.option(
+        "--workers",
+        default=1,
+        show_default=True,
+        help="Amount of worker processes of the deployment."
+    )
+    def pool_stats(workers):
+        """
+        Prints the connection pool settings and statistics of every engine
+        and, on postgres, compares the connections that the workers can
+        open with max_connections of the server. The statistics are those
+        of this process, the /v1/pool-stats endpoint serves those of a
+        running worker.
+        """
+
+        with app.app_context():
+            statistics = get_engines_pool_statistics(db)
+
+            for key, engine in db.engines.items():
+                engine_statistics = statistics[
+                    key if key is not None else "default"
+                ]
+                print(f"{key or 'default'} ({engine.url.get_backend_name()})")
+
+                for name, value in engine_statistics.items():
+
+                    if isinstance(value, dict):
+                        print(f"  {name}:")
+
+                        for nested_name, nested_value in value.items():
+                            print(f"    {nested_name}: {nested_value}")
+                    else:
+                        print(f"  {name}: {value}")
+
+                if engine.dialect.name != "postgresql" \
+                        or "capacity" not in engine_statistics:
+                    continue
+
+                with engine.connect() as connection:
+                    max_connections = int(connection.exec_driver_sql(
+                        "SHOW max_connections"
+                    ).scalar())
+                    active_connections = connection.exec_driver_sql(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database()"
+                    ).scalar()
+
+                required = workers * engine_statistics["capacity"]
+                print(f"  server max_connections: {max_connections}")
+                print(f"  server connections to database: "
+                      f"{active_connections}")
+                print(
+                    f"  {workers} workers open up to {required} connections"
+                    f" ({required / max_connections:.0%} of max_connections)"
+                )
+
+                if required >= max_connections:
+                    print(
+                        "  WARNING: lower SQLALCHEMY_POOL_SIZE or "
+                        "SQLALCHEMY_MAX_OVERFLOW, the workers can exhaust "
+                        "max_connections"
+                    )
+
     return app
@@ -1,4 +1,11 @@
+from .async_repository_service import AsyncRepositoryService
+from .async_todo_service import AsyncTodoService
 from .repository_service import RepositoryService
 from .todo_service import TodoService
 
-__all__ = ["RepositoryService", "TodoService"]
+__all__ = [
+    "RepositoryService",
+    "TodoService",
+    "AsyncRepositoryService",
+    "AsyncTodoService",
+]
@@ -0,0 +1,48 @@
+class AsyncRepositoryService:
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    async def create(self, data):
+        return await self.repository.create(data)
+
+    async def create_many(self, data):
+        return await self.repository.create_many(data)
+
+    async def get(self, object_id):
+        return await self.repository.get(object_id)
+
+    async def get_many(self, object_ids):
+        return await self.repository.get_many(object_ids)
+
+    async def get_all(self, query_spec=None):
+        return await self.repository.get_all(query_spec)
+
+    async def search(self, query_spec):
+        return await self.repository.search(query_spec)
+
+    def stream_all(self, query_spec=None):
+        return self.repository.stream_all(query_spec)
+
+    async def update(self, object_id, data, precondition=None):
+        return await self.repository.update(
+            object_id, data, precondition
+        )
+
+    async def update_all(self, query_spec, data):
+        return await self.repository.update_all(query_spec, data)
+
+    async def delete(self, object_id):
+        return await self.repository.delete(object_id)
+
+    async def delete_all(self, query_spec):
+        return await self.repository.delete_all(query_spec)
+
+    async def find(self, query_spec):
+        return await self.repository.find(query_spec)
+
+    async def count(self, query_spec=None):
+        return await self.repository.count(query_spec)
+
+    async def exists(self, query_spec):
+        return await self.repository.exists(query_spec)
@@ -0,0 +1,27 @@
+from .async_repository_service import AsyncRepositoryService
+from .todo_service import utc_now
+
+
+class AsyncTodoService(AsyncRepositoryService):
+
+    async def create(self, data):
+        data["created_at"] = utc_now()
+        return await self.repository.create(data)
+
+    async def create_many(self, data):
+        created_at = utc_now()
+
+        for item in data:
+            item["created_at"] = created_at
+
+        return await self.repository.create_many(data)
+
+    async def update(self, object_id, data, precondition=None):
+        data["updated_at"] = utc_now()
+        return await self.repository.update(
+            object_id, data, precondition
+        )
+
+    async def update_all(self, query_spec, data):
+        data["updated_at"] = utc_now()
+        return await self.repository.update_all(query_spec, data)
@@ -6,26 +6,43 @@ class RepositoryService:
     def create(self, data):
         return self.repository.create(data)
 
+    def create_many(self, data):
+        return self.repository.create_many(data)
+
     def get(self, object_id):
         return self.repository.get(object_id)
 
-    def get_all(self, query_params=None):
-        return self.repository.get_all(query_params)
+    def get_many(self, object_ids):
+        return self.repository.get_many(object_ids)
+
+    def get_all(self, query_spec=None):
+        return self.repository.get_all(query_spec)
+
+    def search(self, query_spec):
+        return self.repository.search(query_spec)
+
+    def stream_all(self, query_spec=None):
+        return self.repository.stream_all(query_spec)
+
+    def update(self, object_id, data, precondition=None):
+        return self.repository.update(
+            object_id, data, precondition
+        )
 
-    def update(self, object_id, data):
-        return self.repository.update(object_id, data)
+    def update_all(self, query_spec, data):
+        return self.repository.update_all(query_spec, data)
 
     def delete(self, object_id):
         return self.repository.delete(object_id)
 
-    def delete_all(self, query_params):
-        return self.repository.delete_all(query_params)
+    def delete_all(self, query_spec):
+        return self.repository.delete_all(query_spec)
 
-    def find(self, query_params):
-        return self.repository.find(query_params)
+    def find(self, query_spec):
+        return self.repository.find(query_spec)
 
-    def count(self, query_params=None):
-        return self.repository.count(query_params)
+    def count(self, query_spec=None):
+        return self.repository.count(query_spec)
 
-    def exists(self, query_params):
-        return self.repository.exists(query_params)
+    def exists(self, query_spec):
+        return self.repository.exists(query_spec)
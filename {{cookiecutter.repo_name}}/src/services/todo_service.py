@@ -2,12 +2,35 @@ from datetime import datetime, timezone
 
 from .repository_service import RepositoryService
 
+
+def utc_now():
+    """
+    Returns the aware current utc datetime with which the todo services
+    stamp the todos.
+    """
+    return datetime.now(tz=timezone.utc)
+
+
 class TodoService(RepositoryService):
 
     def create(self, data):
-        data["created_at"] = datetime.now(tz=timezone.utc)
+        data["created_at"] = utc_now()
         return self.repository.create(data)
 
-    def update(self, object_id, data):
-        data["updated_at"] = datetime.now(tz=timezone.utc)
-        return self.repository.update(object_id, data)
+    def create_many(self, data):
+        created_at = utc_now()
+
+        for item in data:
+            item["created_at"] = created_at
+
+        return self.repository.create_many(data)
+
+    def update(self, object_id, data, precondition=None):
+        data["updated_at"] = utc_now()
+        return self.repository.update(
+            object_id, data, precondition
+        )
+
+    def update_all(self, query_spec, data):
+        data["updated_at"] = utc_now()
+        return self.repository.update_all(query_spec, data)
@@ -0,0 +1,68 @@
+import logging
+import time
+from contextlib import contextmanager
+
+from src.domain import STARTUP_TIMING
+
+logger = logging.getLogger(__name__)
+STARTUP_TIMER_EXTENSION = "startup_timer"
+
+
+class StartupTimer:
+    """
+    Records how long each phase of the creation of an app takes.
+    """
+
+    def __init__(self):
+        self.phases = []
+        self.started_at = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def run(self, setup, app, *args, **kwargs):
+        """
+        Calls the setup function of the app as a phase named after it.
+        """
+
+        with self.phase(setup.__name__):
+            return setup(app, *args, **kwargs)
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.started_at
+
+    def to_dict(self):
+        return {
+            "total_ms": self.total * 1000,
+            "phases": {
+                name: duration * 1000 for name, duration in self.phases
+            },
+        }
+
+
+def report_startup(app, timer):
+    """
+    Stores the startup timer of the app in its extensions and logs the
+    phases, at info level when STARTUP_TIMING is enabled.
+    """
+    app.extensions[STARTUP_TIMER_EXTENSION] = timer
+    level = logging.INFO if app.config.get(STARTUP_TIMING, False) \
+        else logging.DEBUG
+
+    if logger.isEnabledFor(level):
+        phases = ", ".join(
+            f"{name} {duration * 1000:.1f}ms"
+            for name, duration in timer.phases
+        )
+        logger.log(
+            level, f"Created app in {timer.total * 1000:.1f}ms: {phases}"
+        )
+
+    return app
@@ -0,0 +1,31 @@
+from src.domain import POOL_STATS_ENABLED
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def test_get_disabled(self):
+        self.app.config[POOL_STATS_ENABLED] = False
+        response = self.client.get('/v1/pool-stats')
+        self.assertEqual(404, response.status_code)
+
+    def test_get(self):
+        self.app.config[POOL_STATS_ENABLED] = True
+        todo_service = self.app.container.todo_service()
+        todo_service.create({"title": "test", "description": "test"})
+
+        response = self.client.get('/v1/pool-stats')
+        self.assertEqual(200, response.status_code)
+        statistics = response.json["engines"]["default"]
+        self.assertEqual("InstrumentedQueuePool", statistics["pool"])
+        self.assertEqual(
+            self.app.config["SQLALCHEMY_POOL_SIZE"], statistics["size"]
+        )
+        self.assertGreaterEqual(statistics["checkout"]["count"], 1)
+        self.assertEqual(
+            statistics["checkout"]["count"],
+            sum(statistics["checkout"]["histogram"].values())
+        )
+
+        for key in ["checked_in", "checked_out", "overflow", "timeout"]:
+            self.assertIn(key, statistics)
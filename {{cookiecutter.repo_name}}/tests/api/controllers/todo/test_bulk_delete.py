@@ -0,0 +1,25 @@
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def test_bulk_delete_todos(self):
+        todo_service = self.app.container.todo_service()
+        todos = todo_service.create_many([
+            {"title": "a", "description": "test"},
+            {"title": "b", "description": "test"},
+            {"title": "b", "description": "test"},
+        ])
+        response = self.client.delete(f'/v1/todo?ids={todos[0].id}')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([todos[0].id], response.json['ids'])
+
+        response = self.client.delete('/v1/todo?title=b')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, response.json['count'])
+        self.assertEqual(
+            0, len(todo_service.get_all({'itemized': True})["items"])
+        )
+
+        response = self.client.delete('/v1/todo')
+        self.assertEqual(400, response.status_code)
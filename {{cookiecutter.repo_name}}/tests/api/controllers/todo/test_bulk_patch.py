@@ -0,0 +1,62 @@
+import json
+
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def test_bulk_update_todos_by_ids(self):
+        todo_service = self.app.container.todo_service()
+        todos = todo_service.create_many([
+            {"title": f"test {index}", "description": "test"}
+            for index in range(3)
+        ])
+        ids = [todos[0].id, todos[2].id]
+        response = self.client.patch(
+            f'/v1/todo?ids={ids[0]},{ids[1]}',
+            data=json.dumps({"completed": True}),
+            content_type='application/json'
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, response.json['count'])
+        self.assertEqual(sorted(ids), sorted(response.json['ids']))
+        self.assertEqual(True, todo_service.get(ids[0]).completed)
+        self.assertEqual(False, todo_service.get(todos[1].id).completed)
+        self.assertEqual(True, todo_service.get(ids[1]).completed)
+
+    def test_bulk_update_todos_by_filter(self):
+        todo_service = self.app.container.todo_service()
+        todos = todo_service.create_many([
+            {"title": "a", "description": "test"},
+            {"title": "b", "description": "test"},
+        ])
+        response = self.client.patch(
+            '/v1/todo?title=b',
+            data=json.dumps({"completed": True}),
+            content_type='application/json'
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([todos[1].id], response.json['ids'])
+        self.assertEqual(False, todo_service.get(todos[0].id).completed)
+
+    def test_bulk_update_todos_without_selection(self):
+        response = self.client.patch(
+            '/v1/todo',
+            data=json.dumps({"completed": True}),
+            content_type='application/json'
+        )
+        self.assertEqual(400, response.status_code)
+
+    def test_bulk_update_todos_field_without_column(self):
+        todo_service = self.app.container.todo_service()
+        todos = todo_service.create_many([
+            {"title": "a", "description": "test"},
+        ])
+        response = self.client.patch(
+            f'/v1/todo?ids={todos[0].id}',
+            data=json.dumps({"status": "done", "completed": True}),
+            content_type='application/json'
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([todos[0].id], response.json['ids'])
+        self.assertEqual(True, todo_service.get(todos[0].id).completed)
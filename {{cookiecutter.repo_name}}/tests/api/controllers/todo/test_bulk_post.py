@@ -0,0 +1,61 @@
+import json
+
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def test_bulk_create_todos(self):
+        todo_service = self.app.container.todo_service()
+        response = self.client.post(
+            '/v1/todo/bulk',
+            data=json.dumps([
+                {"title": "test 1", "description": "test"},
+                {"title": 1},
+                {"title": "test 2", "completed": True},
+            ]),
+            content_type='application/json'
+        )
+        self.assertEqual(201, response.status_code)
+        self.assertEqual(
+            ["test 1", "test 2"],
+            [item["title"] for item in response.json["items"]]
+        )
+        self.assertEqual(False, response.json["items"][0]["completed"])
+        self.assertEqual(True, response.json["items"][1]["completed"])
+        self.assertEqual(
+            response.json["items"][0]["created_at"],
+            response.json["items"][1]["created_at"]
+        )
+        self.assertEqual(1, len(response.json["errors"]))
+        self.assertEqual(1, response.json["errors"][0]["index"])
+        self.assertEqual(
+            2, len(todo_service.get_all({'itemized': True})["items"])
+        )
+
+    def test_bulk_create_todos_ndjson(self):
+        todo_service = self.app.container.todo_service()
+        response = self.client.post(
+            '/v1/todo/bulk',
+            data="\n".join(
+                json.dumps({"title": f"test {index}"}) for index in range(3)
+            ),
+            content_type='application/x-ndjson'
+        )
+        self.assertEqual(201, response.status_code)
+        self.assertEqual(3, len(response.json["items"]))
+        self.assertEqual(
+            3, len(todo_service.get_all({'itemized': True})["items"])
+        )
+
+    def test_bulk_create_todos_atomic(self):
+        todo_service = self.app.container.todo_service()
+        response = self.client.post(
+            '/v1/todo/bulk?atomic=true',
+            data=json.dumps([{"title": "test"}, {"title": 1}]),
+            content_type='application/json'
+        )
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(
+            0, len(todo_service.get_all({'itemized': True})["items"])
+        )
@@ -17,3 +17,11 @@ class Test(AppTestBase):
         self.assertEqual(
             0, len(todo_service.get_all({"itemized": True})["items"])
         )
+
+    def test_delete_not_found(self):
+        response = self.client.delete('/v1/todo/1')
+        self.assertEqual(404, response.status_code)
+        self.assertEqual(
+            "The requested todo was not found",
+            response.json["error_message"]
+        )
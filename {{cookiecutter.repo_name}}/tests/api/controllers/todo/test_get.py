@@ -1,3 +1,14 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from sqlalchemy import event
+
+from src.api.schemas import TodoSchema
+from src.infrastructure import sqlalchemy_db as db
 from tests.resources import AppTestBase
 
 
@@ -17,4 +28,559 @@ class Test(AppTestBase):
         self.assertEqual(todo.id, response.json['id'])
         self.assertEqual(todo.title, response.json['title'])
         self.assertEqual(todo.description, response.json['description'])
-        self.assertEqual(todo.completed, response.json['completed'])
\ No newline at end of file
+        self.assertEqual(todo.completed, response.json['completed'])
+
+    def test_get_max_per_page(self):
+        self.app.config["MAX_PER_PAGE"] = 2
+        todo_service = self.app.container.todo_service()
+        todo_service.create_many([
+            {"title": f"test {index}", "description": "test"}
+            for index in range(3)
+        ])
+
+        response = self.client.get('/v1/todo?per_page=1000000')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, response.json['per_page'])
+        self.assertEqual(2, len(response.json['items']))
+        self.assertEqual(3, response.json['total'])
+
+        todos = todo_service.get_all({"per_page": 1000000})
+        self.assertEqual(2, todos['per_page'])
+
+    def test_get_cursor_pagination(self):
+        todo_service = self.app.container.todo_service()
+
+        for index in range(5):
+            todo_service.create({
+                "title": f"test {index}",
+                "description": "test"
+            })
+
+        response = self.client.get('/v1/todo?cursor=&limit=2')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, len(response.json['items']))
+        self.assertIsNone(response.json['prev_cursor'])
+        self.assertNotIn('total', response.json)
+        first_page_ids = [item['id'] for item in response.json['items']]
+
+        next_cursor = response.json['next_cursor']
+        response = self.client.get(f'/v1/todo?cursor={next_cursor}&limit=2')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, len(response.json['items']))
+        self.assertTrue(
+            set(first_page_ids).isdisjoint(
+                item['id'] for item in response.json['items']
+            )
+        )
+
+        prev_cursor = response.json['prev_cursor']
+        response = self.client.get(f'/v1/todo?cursor={prev_cursor}&limit=2')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            first_page_ids, [item['id'] for item in response.json['items']]
+        )
+        self.assertIsNone(response.json['prev_cursor'])
+
+        next_cursor = response.json['next_cursor']
+        response = self.client.get(f'/v1/todo?cursor={next_cursor}&limit=3')
+        self.assertEqual(3, len(response.json['items']))
+        self.assertIsNone(response.json['next_cursor'])
+
+    def test_get_cursor_pagination_max_limit(self):
+        self.app.config["MAX_PER_PAGE"] = 2
+        todo_service = self.app.container.todo_service()
+        todo_service.create_many([
+            {"title": "buy milk", "description": "test"},
+            {"title": "buy bread", "description": "test"},
+            {"title": "buy soap", "description": "test"},
+        ])
+
+        response = self.client.get('/v1/todo?cursor=&limit=1000000')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, response.json['limit'])
+        self.assertEqual(2, len(response.json['items']))
+
+        response = self.client.get('/v1/todo/search?q=buy&limit=1000000')
+        self.assertEqual(2, len(response.json['items']))
+
+        todos = todo_service.get_all({"cursor": "", "limit": 1000000})
+        self.assertEqual(2, todos['limit'])
+
+    def test_get_invalid_cursor(self):
+        response = self.client.get('/v1/todo?cursor=invalid&limit=2')
+        self.assertEqual(400, response.status_code)
+
+    def test_get_count_strategies(self):
+        todo_service = self.app.container.todo_service()
+
+        for index in range(3):
+            todo_service.create({
+                "title": f"test {index}",
+                "description": "test"
+            })
+
+        response = self.client.get('/v1/todo')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(3, response.json['total'])
+        self.assertEqual('exact', response.json['total_type'])
+
+        response = self.client.get('/v1/todo?count=none')
+        self.assertIsNone(response.json['total'])
+        self.assertEqual('none', response.json['total_type'])
+        self.assertEqual(3, len(response.json['items']))
+
+        response = self.client.get('/v1/todo?count=cached')
+        self.assertEqual(3, response.json['total'])
+        self.assertEqual('cached', response.json['total_type'])
+        todo_service.create({"title": "test", "description": "test"})
+        response = self.client.get('/v1/todo?count=cached')
+        self.assertEqual(3, response.json['total'])
+
+        response = self.client.get('/v1/todo?count=estimated')
+        self.assertIn(response.json['total_type'], ['estimated', 'exact'])
+
+        response = self.client.get('/v1/todo?count=unknown')
+        self.assertEqual(400, response.status_code)
+
+    def test_get_estimated_count_with_filters(self):
+        todo_service = self.app.container.todo_service()
+        todo = todo_service.create({"title": "100%", "description": "test"})
+        explains = []
+
+        def trace(connection, cursor, statement, parameters, *args):
+
+            if statement.startswith("EXPLAIN"):
+                explains.append((statement, parameters))
+
+        # Values with %, datetimes and an expanding IN parameter are
+        # passed as parameters of the plan, not inlined
+        event.listen(db.engine, "before_cursor_execute", trace)
+
+        try:
+            response = self.client.get(
+                f"/v1/todo?count=estimated&title__startswith=100%25"
+                f"&title=100%25&id__in={todo.id},{todo.id + 1}"
+                f"&created_at__gte=2000-01-01T00:00:00"
+            )
+        finally:
+            event.remove(db.engine, "before_cursor_execute", trace)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, len(response.json['items']))
+        self.assertIn(response.json['total_type'], ['estimated', 'exact'])
+
+        if db.engine.dialect.name == "postgresql":
+            self.assertEqual(1, len(explains))
+
+        for statement, parameters in explains:
+            self.assertNotIn("100", statement)
+            self.assertIn("100/%%", parameters.values())
+            self.assertIn("100%", parameters.values())
+
+    def test_get_count_cache_is_bounded(self):
+        todo_repository = self.app.container.todo_repository()
+        todo_repository.COUNT_CACHE_MAX_SIZE = 2
+
+        for index in range(5):
+            response = self.client.get(
+                f'/v1/todo?count=cached&title=todo-{index}'
+            )
+            self.assertEqual(0, response.json['total'])
+
+        self.assertEqual(2, len(todo_repository.get_count_cache()))
+
+    def test_get_streaming_export(self):
+        todo_service = self.app.container.todo_service()
+
+        for index in range(3):
+            todo_service.create({
+                "title": f"test {index}",
+                "description": "test"
+            })
+
+        response = self.client.get(
+            '/v1/todo', headers={"Accept": "application/x-ndjson"}
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("application/x-ndjson", response.mimetype)
+        rows = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual(
+            ["test 0", "test 1", "test 2"], [row["title"] for row in rows]
+        )
+
+        response = self.client.get(
+            '/v1/todo?title=test 1', headers={"Accept": "text/csv"}
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("text/csv", response.mimetype)
+        rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+        self.assertEqual(1, len(rows))
+        self.assertEqual("test 1", rows[0]["title"])
+
+    def test_get_entity_cache(self):
+        self.app.config["ENTITY_CACHES"] = {
+            "SQLTodoRepository": {"max_size": 1024, "ttl": 30}
+        }
+        todo_service = self.app.container.todo_service()
+        todo = todo_service.create({"title": "test", "description": "test"})
+        entity_cache = todo_service.repository.get_entity_cache()
+
+        response = self.client.get(f'/v1/todo/{todo.id}')
+        self.assertEqual(200, response.status_code)
+        response = self.client.get(f'/v1/todo/{todo.id}')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, entity_cache.stats()["hits"])
+
+        self.client.patch(
+            f'/v1/todo/{todo.id}',
+            data=json.dumps({"completed": True}),
+            content_type='application/json'
+        )
+        response = self.client.get(f'/v1/todo/{todo.id}')
+        self.assertEqual(True, response.json['completed'])
+
+    def test_get_query_cache(self):
+        self.app.config["QUERY_CACHE_BACKEND"] = "memory"
+        todo_service = self.app.container.todo_service()
+        todo_service.create({"title": "test", "description": "test"})
+
+        response = self.client.get('/v1/todo?per_page=5')
+        self.assertEqual(1, response.json['total'])
+        cached_response = self.client.get('/v1/todo?per_page=5')
+        self.assertEqual(response.json, cached_response.json)
+
+        todo_service.create({"title": "test", "description": "test"})
+        response = self.client.get('/v1/todo?per_page=5')
+        self.assertEqual(2, response.json['total'])
+        self.assertEqual(2, len(response.json['items']))
+
+    def test_get_query_cache_file_backend(self):
+        self.app.config["QUERY_CACHE_BACKEND"] = "file"
+        directory = tempfile.mkdtemp()
+        self.app.config["QUERY_CACHE_DIRECTORY"] = directory
+        todo_service = self.app.container.todo_service()
+        todo_service.create({"title": "test", "description": "test"})
+
+        response = self.client.get('/v1/todo?per_page=5')
+        self.assertNotEqual([], os.listdir(directory))
+        cached_response = self.client.get('/v1/todo?per_page=5')
+        self.assertEqual(1, response.json['total'])
+        self.assertEqual(response.json, cached_response.json)
+
+    def test_get_conditional(self):
+        todo_service = self.app.container.todo_service()
+        todo = todo_service.create({"title": "test", "description": "test"})
+
+        response = self.client.get(f'/v1/todo/{todo.id}')
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+        response = self.client.get(
+            f'/v1/todo/{todo.id}', headers={"If-None-Match": etag}
+        )
+        self.assertEqual(304, response.status_code)
+        response = self.client.get(
+            f'/v1/todo/{todo.id}',
+            headers={"If-Modified-Since": last_modified}
+        )
+        self.assertEqual(304, response.status_code)
+
+        response = self.client.get('/v1/todo')
+        list_etag = response.headers['ETag']
+        response = self.client.get(
+            '/v1/todo', headers={"If-None-Match": list_etag}
+        )
+        self.assertEqual(304, response.status_code)
+
+        todo_service.create({"title": "test", "description": "test"})
+        response = self.client.get(
+            '/v1/todo', headers={"If-None-Match": list_etag}
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, len(response.json['items']))
+
+    def test_get_conditional_list(self):
+        todo_service = self.app.container.todo_service()
+        todos = todo_service.create_many([
+            {"title": f"test {index}", "description": "test"}
+            for index in range(3)
+        ])
+        statements = []
+
+        def trace(connection, cursor, statement, *args):
+            statements.append(statement.lower())
+
+        event.listen(db.engine, "before_cursor_execute", trace)
+
+        try:
+
+            for url in [
+                '/v1/todo?cursor=&limit=2', '/v1/todo?count=none',
+                '/v1/todo?fields=title&count=none'
+            ]:
+                response = self.client.get(url)
+                etag = response.headers['ETag']
+                response = self.client.get(
+                    url, headers={"If-None-Match": etag}
+                )
+                self.assertEqual(304, response.status_code)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", trace)
+
+        # Neither the pages nor their validators count the rows
+        self.assertEqual(6, len(statements))
+        self.assertFalse(
+            any("count(" in statement for statement in statements)
+        )
+
+        response = self.client.get('/v1/todo?count=none')
+        etag = response.headers['ETag']
+        todo_service.update(todos[2].id, {"title": "updated"})
+        response = self.client.get(
+            '/v1/todo?count=none', headers={"If-None-Match": etag}
+        )
+        self.assertEqual(200, response.status_code)
+        etag = response.headers['ETag']
+        todo_service.delete(todos[2].id)
+        response = self.client.get(
+            '/v1/todo?count=none', headers={"If-None-Match": etag}
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, len(response.json['items']))
+
+    def test_get_compressed(self):
+        todo_service = self.app.container.todo_service()
+        todo_service.create_many([
+            {"title": f"test {index}", "description": "test"}
+            for index in range(50)
+        ])
+
+        response = self.client.get(
+            '/v1/todo?itemize=true', headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("gzip", response.headers["Content-Encoding"])
+        self.assertIn("Accept-Encoding", response.headers.getlist("Vary"))
+        items = json.loads(gzip.decompress(response.data))["items"]
+        self.assertEqual(50, len(items))
+
+        response = self.client.get(
+            '/v1/todo?per_page=1', headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(1, len(response.json["items"]))
+        self.assertEqual(["Accept-Encoding"], response.headers.getlist("Vary"))
+
+        # Uncompressed responses vary as well, a cache must not serve them
+        # to clients that accept a compressed response
+        for headers in [{}, {"Accept-Encoding": "identity"}]:
+            response = self.client.get('/v1/todo?per_page=1', headers=headers)
+            self.assertNotIn("Content-Encoding", response.headers)
+            self.assertEqual(
+                ["Accept-Encoding"], response.headers.getlist("Vary")
+            )
+
+        response = self.client.head(
+            '/v1/todo?itemize=true', headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(["Accept-Encoding"], response.headers.getlist("Vary"))
+
+        response = self.client.get(
+            '/v1/todo',
+            headers={
+                "Accept-Encoding": "gzip",
+                "Accept": "application/x-ndjson"
+            }
+        )
+        self.assertEqual("gzip", response.headers["Content-Encoding"])
+        lines = gzip.decompress(response.data).splitlines()
+        self.assertEqual(50, len(lines))
+
+    def test_get_fields(self):
+        todo_service = self.app.container.todo_service()
+        todo_service.create({"title": "test", "description": "test"})
+
+        response = self.client.get('/v1/todo?fields=id,title')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {"id", "title"}, set(response.json['items'][0].keys())
+        )
+
+        response = self.client.get('/v1/todo?fields=id,unknown')
+        self.assertEqual(400, response.status_code)
+
+    def test_get_read_only_lists(self):
+        todo_service = self.app.container.todo_service()
+
+        for index in range(3):
+            todo_service.create({
+                "title": f"test {index}",
+                "description": "test"
+            })
+
+        response = self.client.get('/v1/todo?per_page=5')
+        self.assertEqual(200, response.status_code)
+
+        # The ORM path must produce the same output
+        todo_service.repository.READ_ONLY_LISTS = False
+        todos = todo_service.get_all({"per_page": 5})
+        self.assertEqual(
+            TodoSchema().dump(todos["items"], many=True),
+            response.json['items']
+        )
+
+    def test_get_filters(self):
+        todo_service = self.app.container.todo_service()
+        todo_service.create_many([
+            {"title": "buy milk", "description": "test", "completed": True},
+            {"title": "buy bread", "description": "test"},
+            {"title": "clean", "description": "test"},
+        ])
+
+        response = self.client.get('/v1/todo?title__startswith=buy&sort=title')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            ["buy bread", "buy milk"],
+            [item['title'] for item in response.json['items']]
+        )
+
+        response = self.client.get('/v1/todo?completed=true')
+        self.assertEqual(1, response.json['total'])
+
+        response = self.client.get(
+            '/v1/todo?created_at__gte=2000-01-01T00:00:00%2B00:00'
+            '&sort=-title'
+        )
+        self.assertEqual(3, response.json['total'])
+        self.assertEqual("clean", response.json['items'][0]['title'])
+
+        # Filters of the same field and operator bind their own values
+        response = self.client.get(
+            '/v1/todo?title=buy milk&title__eq=buy bread'
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(0, response.json['total'])
+        self.assertEqual([], response.json['items'])
+        response = self.client.get(
+            '/v1/todo?title=buy milk&title__eq=buy milk'
+        )
+        self.assertEqual(1, response.json['total'])
+
+        response = self.client.get('/v1/todo?description=test')
+        self.assertEqual(400, response.status_code)
+        response = self.client.get('/v1/todo?completed=maybe')
+        self.assertEqual(400, response.status_code)
+        response = self.client.get('/v1/todo?sort=description')
+        self.assertEqual(400, response.status_code)
+
+    def test_get_cached_statements(self):
+        todo_service = self.app.container.todo_service()
+        todo_service.create_many([
+            {"title": "buy milk", "description": "test", "completed": True},
+            {"title": "clean", "description": "test"},
+        ])
+
+        # Requests of the same shape reuse the statement with other values
+        response = self.client.get('/v1/todo?completed=true')
+        self.assertEqual(["buy milk"], [
+            item['title'] for item in response.json['items']
+        ])
+        response = self.client.get('/v1/todo?completed=false')
+        self.assertEqual(["clean"], [
+            item['title'] for item in response.json['items']
+        ])
+
+        repository = todo_service.repository
+        first = repository.get_query_spec({"completed": "true"})
+        second = repository.get_query_spec({"completed": "false"})
+        self.assertEqual(first.get_shape(), second.get_shape())
+        statement = repository.get_statement(
+            ("page", second.get_shape()),
+            lambda: self.fail("The statement was not cached")
+        )
+        self.assertIsNotNone(statement)
+
+    def test_get_many(self):
+        self.app.config["ENTITY_CACHES"] = {
+            "SQLTodoRepository": {"max_size": 1024, "ttl": 30}
+        }
+        todo_service = self.app.container.todo_service()
+        todos = todo_service.create_many([
+            {"title": f"test {index}", "description": "test"}
+            for index in range(3)
+        ])
+        ids = [todos[2].id, todos[0].id, todos[1].id]
+        missing_id = max(ids) + 1
+
+        response = self.client.get(
+            f'/v1/todo?ids={ids[0]},{missing_id},{ids[1]}&ids={ids[2]}'
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(ids, [item['id'] for item in response.json['items']])
+        self.assertEqual([missing_id], response.json['missing_ids'])
+
+        # Served from the entity cache after the first lookup
+        entity_cache = todo_service.repository.get_entity_cache()
+        result = todo_service.get_many(ids)
+        self.assertEqual(ids, [item.id for item in result['items']])
+        self.assertEqual(3, entity_cache.stats()["hits"])
+
+        response = self.client.get(f'/v1/todo?ids={ids[0]}&fields=title')
+        self.assertEqual([{"title": "test 2"}], response.json['items'])
+        response = self.client.get('/v1/todo?ids=a')
+        self.assertEqual(400, response.status_code)
+
+    def test_search(self):
+        todo_service = self.app.container.todo_service()
+        todo_service.create_many([
+            {"title": "buy milk", "description": "at the store"},
+            {"title": "store receipts", "description": "buy a folder"},
+            {"title": "clean", "description": "the kitchen"},
+            {
+                "title": "milk",
+                "description": "buy oat milk",
+                "completed": True
+            },
+        ])
+
+        response = self.client.get('/v1/todo/search?q=milk')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {"buy milk", "milk"},
+            {item['title'] for item in response.json['items']}
+        )
+
+        # Matches in the title rank higher than in the description
+        response = self.client.get('/v1/todo/search?q=store')
+        self.assertEqual(
+            ["store receipts", "buy milk"],
+            [item['title'] for item in response.json['items']]
+        )
+
+        response = self.client.get('/v1/todo/search?q=buy&completed=false')
+        self.assertEqual(2, len(response.json['items']))
+
+        titles = []
+        cursor = ""
+
+        while cursor is not None:
+            response = self.client.get(
+                f'/v1/todo/search?q=buy&limit=1&fields=title&cursor={cursor}'
+            )
+            self.assertEqual(200, response.status_code)
+            titles.extend(item['title'] for item in response.json['items'])
+            cursor = response.json['next_cursor']
+
+        self.assertEqual(3, len(set(titles)))
+        self.assertEqual(3, len(titles))
+
+        todo = todo_service.find({"title": "clean"})
+        todo_service.update(todo.id, {"description": "buy soap"})
+        response = self.client.get('/v1/todo/search?q=soap')
+        self.assertEqual(
+            [todo.id], [item['id'] for item in response.json['items']]
+        )
+
+        response = self.client.get('/v1/todo/search?q=')
+        self.assertEqual(400, response.status_code)
+        response = self.client.get('/v1/todo/search?q="unbalanced')
+        self.assertEqual(200, response.status_code)
@@ -1,5 +1,11 @@
 import json
+from datetime import datetime, timezone
 
+from sqlalchemy import update
+
+from src.domain import ApiException
+from src.infrastructure import sqlalchemy_db as db
+from src.infrastructure.models import SQLTodo
 from tests.resources import AppTestBase
 
 
@@ -26,3 +32,113 @@ class Test(AppTestBase):
         self.assertEqual(True, response.json['completed'])
         todo = todo_service.get(todo.id)
         self.assertEqual(True, todo.completed)
+
+    def test_update_todo_not_found(self):
+        response = self.client.patch(
+            '/v1/todo/1',
+            data=json.dumps({"completed": True}),
+            content_type='application/json'
+        )
+        self.assertEqual(404, response.status_code)
+        self.assertEqual(
+            "The requested todo was not found",
+            response.json["error_message"]
+        )
+
+    def test_update_todo_if_match(self):
+        todo_service = self.app.container.todo_service()
+        todo = todo_service.create({"title": "test", "description": "test"})
+        etag = self.client.get(f'/v1/todo/{todo.id}').headers['ETag']
+
+        response = self.client.patch(
+            f'/v1/todo/{todo.id}',
+            data=json.dumps({"completed": True}),
+            content_type='application/json',
+            headers={"If-Match": etag}
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response.headers['ETag'])
+
+        response = self.client.patch(
+            f'/v1/todo/{todo.id}',
+            data=json.dumps({"completed": False}),
+            content_type='application/json',
+            headers={"If-Match": etag}
+        )
+        self.assertEqual(412, response.status_code)
+
+    def test_update_todo_if_match_modified_behind_cache(self):
+        self.app.config["ENTITY_CACHES"] = {
+            "SQLTodoRepository": {"max_size": 1024, "ttl": 30}
+        }
+        todo_service = self.app.container.todo_service()
+        todo = todo_service.create({"title": "test", "description": "test"})
+        etag = self.client.get(f'/v1/todo/{todo.id}').headers['ETag']
+
+        # Another process updates the todo, the entity cache of this one
+        # still holds the old version
+        db.session.execute(
+            update(SQLTodo)
+            .where(SQLTodo.id == todo.id)
+            .values(title="other", updated_at=datetime.now(tz=timezone.utc))
+        )
+        db.session.commit()
+        self.assertEqual(
+            etag, self.client.get(f'/v1/todo/{todo.id}').headers['ETag']
+        )
+
+        response = self.client.patch(
+            f'/v1/todo/{todo.id}',
+            data=json.dumps({"completed": True}),
+            content_type='application/json',
+            headers={"If-Match": etag}
+        )
+        self.assertEqual(412, response.status_code)
+        self.assertEqual(
+            "The todo has been modified", response.json["error_message"]
+        )
+        db.session.remove()
+        stored_todo = db.session.get(SQLTodo, todo.id)
+        self.assertEqual("other", stored_todo.title)
+        self.assertFalse(stored_todo.completed)
+
+    def test_update_todo_modified_during_precondition(self):
+        todo_service = self.app.container.todo_service()
+        todo = todo_service.create({"title": "test", "description": "test"})
+
+        def precondition(version):
+            # A write between the check and the update of the todo
+            db.session.execute(
+                update(SQLTodo)
+                .where(SQLTodo.id == todo.id)
+                .values(updated_at=datetime.now(tz=timezone.utc))
+            )
+            return True
+
+        with self.assertRaises(ApiException) as context:
+            todo_service.update(todo.id, {"completed": True}, precondition)
+
+        self.assertEqual(412, context.exception.status_code)
+
+    def test_update_todo_if_match_not_found(self):
+        response = self.client.patch(
+            '/v1/todo/1',
+            data=json.dumps({"completed": True}),
+            content_type='application/json',
+            headers={"If-Match": 'W/"etag"'}
+        )
+        self.assertEqual(404, response.status_code)
+
+    def test_update_todo_field_without_column(self):
+        todo_service = self.app.container.todo_service()
+        todo = todo_service.create({"title": "test", "description": "test"})
+
+        # The status of the schema has no column and is ignored
+        response = self.client.patch(
+            f'/v1/todo/{todo.id}',
+            data=json.dumps({"status": "done", "completed": True}),
+            content_type='application/json'
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(True, response.json['completed'])
+        self.assertNotIn('status', response.json)
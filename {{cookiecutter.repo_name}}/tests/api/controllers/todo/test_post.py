@@ -11,7 +11,7 @@ class Test(AppTestBase):
             0, len(todo_service.get_all({'itemized': True})["items"])
         )
         response = self.client.post(
-            f'/v1/todo',
+            '/v1/todo',
             data=json.dumps(
                 {
                     "title": "test",
@@ -28,3 +28,24 @@ class Test(AppTestBase):
         self.assertEqual(False, response.json['completed'])
         todo = todo_service.get(todo.id)
         self.assertEqual(False, todo.completed)
+
+    def test_create_todo_field_without_column(self):
+        response = self.client.post(
+            '/v1/todo',
+            data=json.dumps({"title": "test", "status": "done"}),
+            content_type='application/json'
+        )
+        self.assertEqual(201, response.status_code)
+        self.assertEqual("test", response.json['title'])
+
+    def test_create_todo_invalid(self):
+        response = self.client.post(
+            '/v1/todo',
+            data=json.dumps({"title": 1, "unknown": "test"}),
+            content_type='application/json'
+        )
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(
+            {"title": "not a valid string.", "unknown": "unknown field."},
+            response.json['error_message']
+        )
@@ -0,0 +1,86 @@
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from marshmallow import Schema, fields, post_dump, pre_load
+
+from src.api.schemas import TodoSchema, compile_schema
+from tests.resources import AppTestBase
+
+Row = namedtuple(
+    "Row", ["id", "title", "description", "completed", "created_at"]
+)
+
+
+
+class HookedSchema(Schema):
+    title = fields.Str()
+
+    @post_dump
+    def upper_title(self, data, **kwargs):
+        data["title"] = data["title"].upper()
+        return data
+
+    @pre_load
+    def strip_title(self, data, **kwargs):
+        return {**data, "title": data["title"].strip()}
+
+
+class DefaultsSchema(Schema):
+    title = fields.Str(dump_default="untitled", load_default="untitled")
+    completed = fields.Bool()
+
+
+class Test(AppTestBase):
+
+    def test_dump_same_as_schema(self):
+        created_at = datetime(2024, 1, 2, 3, 4, tzinfo=timezone.utc)
+        rows = [
+            Row(1, "test", "test", True, created_at),
+            Row(2, "test", None, False, None),
+        ]
+        self.assertEqual(
+            TodoSchema().dump(rows, many=True),
+            compile_schema(TodoSchema).dump(rows, many=True)
+        )
+        self.assertEqual(
+            TodoSchema().dump(rows[0]),
+            compile_schema(TodoSchema).dump(rows[0])
+        )
+
+    def test_dump_coerces_booleans(self):
+        # sqlite returns the booleans of core selects as 0 and 1
+        rows = [
+            Row(1, "test", "test", 1, None), Row(2, "test", "test", 0, None)
+        ]
+        dumped = compile_schema(TodoSchema).dump(rows, many=True)
+        self.assertIs(True, dumped[0]["completed"])
+        self.assertIs(False, dumped[1]["completed"])
+        self.assertEqual({
+            "id": 1, "title": "test", "description": "test",
+            "completed": True, "created_at": None
+        }, compile_schema(TodoSchema).dump({
+            "id": 1, "title": "test", "description": "test",
+            "completed": 1, "created_at": None
+        }))
+
+    def test_hooked_schema_same_as_schema(self):
+        rows = [Row(1, "test", "test", True, None)]
+        serializer = compile_schema(HookedSchema)
+        self.assertEqual(
+            HookedSchema().dump(rows, many=True),
+            serializer.dump(rows, many=True)
+        )
+        self.assertEqual({"title": "TEST"}, serializer.dump(rows[0]))
+        self.assertEqual(
+            {"title": "test"}, serializer.load({"title": " test "})
+        )
+
+    def test_defaults_same_as_schema(self):
+        self.assertEqual(
+            DefaultsSchema().dump({"completed": True}),
+            compile_schema(DefaultsSchema).dump({"completed": True})
+        )
+        self.assertEqual(
+            DefaultsSchema().load({"completed": True}),
+            compile_schema(DefaultsSchema).load({"completed": True})
+        )
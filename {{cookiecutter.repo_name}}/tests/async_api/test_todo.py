@@ -0,0 +1,135 @@
+import asyncio
+import json
+from unittest import skipIf
+
+from tests.resources import AppTestBase
+
+try:
+    import quart
+except ImportError:
+    quart = None
+
+
+@skipIf(quart is None, "The async requirements are not installed")
+class Test(AppTestBase):
+
+    def request(self, method, path, **kwargs):
+        from src.create_async_app import create_async_app
+
+        async def send():
+            app = create_async_app(flask_app=self.app)
+
+            async with app.test_app():
+                response = await getattr(app.test_client(), method)(
+                    path, **kwargs
+                )
+                return response, await response.get_data(as_text=True)
+
+        return asyncio.run(send())
+
+    def create_todo(self, title="test"):
+        return self.app.container.todo_service().create({
+            "title": title, "description": "test"
+        })
+
+    def test_create_todo(self):
+        response, body = self.request(
+            "post", "/v1/todo", json={"title": "test", "description": "test"}
+        )
+        self.assertEqual(201, response.status_code)
+        todo = json.loads(body)
+        self.assertEqual("test", todo["title"])
+        self.assertEqual(
+            "test", self.app.container.todo_service().get(todo["id"]).title
+        )
+
+        # Stamped with an aware utc datetime like the sync service
+        self.assertTrue(todo["created_at"].endswith("+00:00"))
+
+    def test_create_todo_without_data(self):
+        response, body = self.request("post", "/v1/todo", json={})
+        self.assertEqual(400, response.status_code)
+        self.assertIn("error_message", json.loads(body))
+
+    def test_bulk_create_todo(self):
+        response, body = self.request(
+            "post",
+            "/v1/todo/bulk",
+            json=[{"title": "first"}, {"title": 1}]
+        )
+        self.assertEqual(201, response.status_code)
+        self.assertEqual(1, len(json.loads(body)["items"]))
+        self.assertEqual(1, json.loads(body)["errors"][0]["index"])
+
+    def test_retrieve_todo(self):
+        todo = self.create_todo()
+        response, body = self.request("get", f"/v1/todo/{todo.id}")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(todo.id, json.loads(body)["id"])
+
+        response, _ = self.request(
+            "get",
+            f"/v1/todo/{todo.id}",
+            headers={"If-None-Match": response.headers["ETag"]}
+        )
+        self.assertEqual(304, response.status_code)
+
+    def test_retrieve_todo_not_found(self):
+        response, body = self.request("get", "/v1/todo/1")
+        self.assertEqual(404, response.status_code)
+        self.assertEqual(
+            "The requested todo was not found",
+            json.loads(body)["error_message"]
+        )
+
+    def test_get_todos(self):
+        self.create_todo("first")
+        self.create_todo("second")
+        response, body = self.request("get", "/v1/todo?itemized=true")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            ["first", "second"],
+            [todo["title"] for todo in json.loads(body)["items"]]
+        )
+
+    def test_stream_todos(self):
+        self.create_todo("first")
+        self.create_todo("second")
+        response, body = self.request(
+            "get", "/v1/todo", headers={"Accept": "application/x-ndjson"}
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            ["first", "second"],
+            [json.loads(line)["title"] for line in body.splitlines()]
+        )
+
+    def test_update_todo_if_match(self):
+        todo = self.create_todo()
+        response, _ = self.request("get", f"/v1/todo/{todo.id}")
+        etag = response.headers["ETag"]
+
+        response, body = self.request(
+            "patch",
+            f"/v1/todo/{todo.id}",
+            json={"completed": True},
+            headers={"If-Match": etag}
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(True, json.loads(body)["completed"])
+
+        response, _ = self.request(
+            "patch",
+            f"/v1/todo/{todo.id}",
+            json={"completed": False},
+            headers={"If-Match": etag}
+        )
+        self.assertEqual(412, response.status_code)
+
+    def test_delete_todo(self):
+        todo = self.create_todo()
+        response, _ = self.request("delete", f"/v1/todo/{todo.id}")
+        self.assertEqual(204, response.status_code)
+        self.assertEqual(
+            0, self.app.container.todo_service().count()
+        )
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+from src.domain import Todo
+from src.infrastructure import sqlalchemy_db as db
+from src.infrastructure.models import SQLTodo
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def test_dict_round_trip(self):
+        data = {
+            "id": 1,
+            "title": "test",
+            "description": "test",
+            "completed": True,
+            "created_at": datetime(2024, 1, 2, 3, 4, 5),
+            "updated_at": None,
+        }
+        todo = Todo.from_dict({**data, "unknown": "ignored"})
+        self.assertEqual(data, todo.to_dict())
+        self.assertFalse(hasattr(todo, "__dict__"))
+
+    def test_from_partial_dict(self):
+        todo = Todo.from_dict({"title": "test"})
+        self.assertEqual("test", todo.title)
+        self.assertIsNone(todo.description)
+        self.assertIsNone(todo.id)
+        self.assertFalse(todo.completed)
+
+    def test_from_row(self):
+        created_at = datetime(2024, 1, 2, 3, 4, 5)
+        todo = Todo.from_row((1, "test", "test", False, created_at, None))
+        self.assertEqual(
+            {
+                "id": 1,
+                "title": "test",
+                "description": "test",
+                "completed": False,
+                "created_at": created_at,
+                "updated_at": None,
+            },
+            todo.to_dict()
+        )
+
+        todo_service = self.app.container.todo_service()
+        created = todo_service.create({"title": "test", "description": "d"})
+        row = db.session.execute(
+            select(*SQLTodo.__table__.columns)
+            .where(SQLTodo.id == created.id)
+        ).one()
+        instance = db.session.get(SQLTodo, created.id)
+
+        for source in [row, instance]:
+            todo = Todo.from_row(source)
+            self.assertIs(Todo, type(todo))
+            self.assertEqual(created.id, todo.id)
+            self.assertEqual("d", todo.description)
+            self.assertEqual(instance.created_at, todo.created_at)
+
+    def test_from_row_of_mapped_model(self):
+        todo = SQLTodo.from_row((None, "test", "test", True, None, None))
+        self.assertIsInstance(todo, SQLTodo)
+        self.assertEqual("test", todo.title)
+        self.assertTrue(todo.completed)
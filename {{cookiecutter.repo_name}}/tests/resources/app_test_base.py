@@ -27,8 +27,15 @@ class AppTestBase(TestCase):
     def initialize_database(self):
 
         with self.app.app_context():
-            db.drop_all()
-            db.create_all()
+            # Replicas receive the schema of the primary
+            db.drop_all(bind_key=None)
+            db.create_all(bind_key=None)
+
+    def configure(self, config):
+        """
+        Override to change the config of the app of the tests.
+        """
+        pass
 
     def create_app(self):
         self.postgres_container = PostgresContainer(image="postgres:14")
@@ -38,6 +45,7 @@ class AppTestBase(TestCase):
         config["TESTING"] = True
         config[SQLALCHEMY_DATABASE_URI] = \
             self.postgres_container.get_connection_url()
+        self.configure(config)
 
         self.app = create_app(
             config,
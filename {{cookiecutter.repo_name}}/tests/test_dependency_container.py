@@ -0,0 +1,55 @@
+from src.dependency_container import DependencyContainer, \
+    setup_dependency_scopes
+from src.domain import DEPENDENCY_SCOPES, OperationalException
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def configure(self, config):
+        config[DEPENDENCY_SCOPES] = {"todo_service": "request"}
+
+    def test_singleton_scope(self):
+        container = self.app.container
+        self.assertIs(container.todo_repository(), container.todo_repository())
+
+    def test_request_scope(self):
+        service = self.app.container.todo_service()
+        self.assertIs(service, self.app.container.todo_service())
+
+        with self.app.app_context():
+            request_service = self.app.container.todo_service()
+            self.assertIs(request_service, self.app.container.todo_service())
+            self.assertIsNot(service, request_service)
+            # The dependencies keep their own scope
+            self.assertIs(service.repository, request_service.repository)
+
+    def test_transient_scope(self):
+        container = DependencyContainer()
+        setup_dependency_scopes(container, {"todo_repository": "transient"})
+        self.assertIsNot(
+            container.todo_repository(), container.todo_repository()
+        )
+        self.assertIsNot(
+            container.todo_service().repository,
+            container.todo_repository()
+        )
+
+    def test_unknown_scope(self):
+
+        with self.assertRaises(OperationalException):
+            setup_dependency_scopes(
+                DependencyContainer(), {"todo_service": "session"}
+            )
+
+        with self.assertRaises(OperationalException):
+            setup_dependency_scopes(
+                DependencyContainer(), {"user_service": "singleton"}
+            )
+
+    def test_requests_use_the_service(self):
+        todo = self.app.container.todo_service().create({
+            "title": "test", "description": "test"
+        })
+        response = self.client.get(f'/v1/todo/{todo.id}')
+        self.assertEqual(200, response.status_code)
@@ -0,0 +1,106 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+from src import json_provider
+from src.json_provider import FastJSONProvider, ORJSON_ENCODER, \
+    MSGSPEC_ENCODER, STDLIB_ENCODER
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def get_encoders(self):
+        encoders = [STDLIB_ENCODER]
+
+        if json_provider.orjson is not None:
+            encoders.append(ORJSON_ENCODER)
+
+        if json_provider.msgspec is not None:
+            encoders.append(MSGSPEC_ENCODER)
+
+        return encoders
+
+    def test_encoders(self):
+        created_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        value = {
+            "created_at": created_at,
+            "date": date(2024, 1, 2),
+            "amount": Decimal("1.10"),
+            "title": "café",
+        }
+
+        for encoder in self.get_encoders():
+
+            with self.subTest(encoder=encoder):
+                provider = FastJSONProvider(self.app, encoder=encoder)
+                self.assertEqual(encoder, provider.encoder)
+
+                for encoded in [
+                    provider.dumps(value),
+                    provider.dumps_bytes(value).decode(),
+                    provider.dumps_bytes(value, indent=True).decode(),
+                ]:
+                    decoded = json.loads(encoded)
+                    self.assertEqual(
+                        created_at,
+                        datetime.fromisoformat(decoded["created_at"])
+                    )
+                    self.assertEqual("2024-01-02", decoded["date"])
+                    self.assertEqual("1.10", decoded["amount"])
+                    self.assertEqual("café", decoded["title"])
+
+                self.assertEqual(
+                    {"title": "test"}, provider.loads('{"title": "test"}')
+                )
+
+    def test_encoders_same_output(self):
+        value = {
+            "created_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "updated_at": datetime(2024, 1, 2, 3, 4, 5, 6),
+            "items": [
+                {"created_at": datetime(2024, 1, 2, tzinfo=timezone.utc)}
+            ],
+            "title": "test",
+        }
+        expected = FastJSONProvider(self.app, encoder=STDLIB_ENCODER) \
+            .dumps_bytes(value)
+        self.assertIn(b'"2024-01-02T03:04:05+00:00"', expected)
+
+        for encoder in self.get_encoders():
+
+            with self.subTest(encoder=encoder):
+                provider = FastJSONProvider(self.app, encoder=encoder)
+                self.assertEqual(expected, provider.dumps_bytes(value))
+
+    def test_fallback_without_orjson(self):
+
+        with mock.patch.object(json_provider, "orjson", None):
+
+            if json_provider.msgspec is not None:
+                self.assertEqual(
+                    MSGSPEC_ENCODER, FastJSONProvider(self.app).encoder
+                )
+
+            with mock.patch.object(json_provider, "msgspec", None):
+                provider = FastJSONProvider(self.app)
+                self.assertEqual(STDLIB_ENCODER, provider.encoder)
+                self.assertEqual(
+                    '{"amount":"1.10","date":"2024-01-02"}',
+                    provider.dumps_bytes(
+                        {"date": date(2024, 1, 2), "amount": Decimal("1.10")}
+                    ).decode()
+                )
+
+    def test_error_response(self):
+
+        with mock.patch.object(
+            self.app.json, "dumps_bytes", wraps=self.app.json.dumps_bytes
+        ) as dumps_bytes:
+            response = self.client.get('/v1/todo/1')
+
+        self.assertEqual(404, response.status_code)
+        self.assertEqual("application/json", response.mimetype)
+        self.assertIn("error_message", response.json)
+        dumps_bytes.assert_called_once()
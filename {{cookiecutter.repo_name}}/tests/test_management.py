@@ -0,0 +1,58 @@
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import text
+
+from src.infrastructure import sqlalchemy_db as db
+from src.management import include_object
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def test_explain_queries(self):
+        todo_service = self.app.container.todo_service()
+        todo_service.create_many([
+            {"title": f"test {index}", "description": "test"}
+            for index in range(20)
+        ])
+        runner = self.app.test_cli_runner()
+
+        result = runner.invoke(args=["explain-queries"])
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn("SQLTodoRepository", result.output)
+        self.assertIn("title__startswith=a", result.output)
+        self.assertNotIn("FLAGGED", result.output)
+
+    def test_pool_stats(self):
+        runner = self.app.test_cli_runner()
+
+        result = runner.invoke(args=["pool-stats", "--workers", "4"])
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn("InstrumentedQueuePool", result.output)
+        self.assertIn("checked_out", result.output)
+
+    def test_include_object(self):
+
+        with db.engine.begin() as connection:
+            connection.execute(
+                text("CREATE TABLE research (id INTEGER PRIMARY KEY)")
+            )
+
+            try:
+                context = MigrationContext.configure(
+                    connection, opts={"include_object": include_object}
+                )
+                differences = compare_metadata(context, db.metadata)
+            finally:
+                connection.execute(text("DROP TABLE research"))
+
+        # Of the objects that are in the database only, only the table
+        # that is not a search object is reported
+        self.assertEqual(
+            [("remove_table", "research")],
+            [
+                (difference[0], difference[-1].name)
+                for difference in differences
+                if difference[0].startswith("remove_")
+            ]
+        )
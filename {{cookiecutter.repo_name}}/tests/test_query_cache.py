@@ -0,0 +1,79 @@
+import os
+import pickle
+import stat
+import tempfile
+from datetime import datetime, timezone
+
+from src.domain import OperationalException, QUERY_CACHE_BACKEND
+from src.infrastructure.caches import QueryCache, MemoryCacheBackend, \
+    FileCacheBackend, RedisCacheBackend, create_query_cache
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def test_memory_backend_is_bounded(self):
+        backend = MemoryCacheBackend(max_size=2)
+        query_cache = QueryCache(backend, ttl=60)
+
+        for generation in range(10):
+            query_cache.set("todo", generation, "query", {"count": 1})
+            query_cache.invalidate("todo")
+
+        # Only the most recent results are kept, the generation is not
+        # evicted with them
+        self.assertEqual(2, len(backend._entries))
+        self.assertEqual(10, query_cache.get_generation("todo"))
+        self.assertEqual(
+            {"count": 1}, query_cache.get("todo", 9, "query")
+        )
+        self.assertIsNone(query_cache.get("todo", 0, "query"))
+
+    def test_memory_backend_ttl(self):
+        backend = MemoryCacheBackend()
+        backend.set("key", "value", ttl=-1)
+        self.assertIsNone(backend.get("key"))
+        backend.set("key", "value")
+        self.assertEqual("value", backend.get("key"))
+
+    def test_file_backend_round_trip(self):
+        directory = os.path.join(tempfile.mkdtemp(), "query-cache")
+        backend = FileCacheBackend(directory)
+        value = {
+            "count": 1,
+            "items": [
+                {"created_at": datetime(2024, 1, 2, 3, 4, tzinfo=timezone.utc)}
+            ]
+        }
+        backend.set("key", value, ttl=60)
+        self.assertEqual(value, backend.get("key"))
+        self.assertEqual(0o700, stat.S_IMODE(os.stat(directory).st_mode))
+
+    def test_file_backend_rejects_shared_directory(self):
+        directory = tempfile.mkdtemp()
+        os.chmod(directory, 0o777)
+
+        with self.assertRaises(OperationalException):
+            FileCacheBackend(directory)
+
+    def test_file_backend_requires_directory(self):
+
+        with self.assertRaises(OperationalException):
+            create_query_cache({QUERY_CACHE_BACKEND: "file"})
+
+    def test_file_backend_invalid_entry_is_miss(self):
+        backend = FileCacheBackend(tempfile.mkdtemp())
+        backend.set("key", "value")
+
+        with open(backend._path("key"), "wb") as file:
+            file.write(pickle.dumps((None, "value")))
+
+        self.assertIsNone(backend.get("key"))
+
+    def test_redis_backend_invalid_entry_is_miss(self):
+        backend = RedisCacheBackend()
+        entries = {"key": pickle.dumps("value")}
+        backend._command = lambda command, key, *args: entries.get(key)
+        self.assertIsNone(backend.get("key"))
+        entries["key"] = b'{"__cache_type__":"datetime","value":"invalid"}'
+        self.assertIsNone(backend.get("key"))
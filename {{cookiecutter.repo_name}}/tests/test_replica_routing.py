@@ -0,0 +1,82 @@
+from sqlalchemy import event
+
+from src.domain import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_REPLICA_URIS
+from src.infrastructure import sqlalchemy_db as db
+from tests.resources import AppTestBase
+
+UNAVAILABLE_REPLICA_URI = "sqlite:////nonexistent/replica.db"
+
+
+class Test(AppTestBase):
+
+    def configure(self, config):
+        # The primary stands in for a replica that replicates it
+        config[SQLALCHEMY_REPLICA_URIS] = [
+            UNAVAILABLE_REPLICA_URI, config[SQLALCHEMY_DATABASE_URI]
+        ]
+
+    def record_statements(self):
+        statements = {}
+
+        for key, engine in db.engines.items():
+            statements[key] = []
+            event.listen(
+                engine,
+                "before_cursor_execute",
+                lambda *args, key=key: statements[key].append(args[2])
+            )
+
+        return statements
+
+    def create_todo(self):
+        return self.app.container.todo_service().create({
+            "title": "test", "description": "test"
+        })
+
+    def test_get_all_reads_from_replica(self):
+        self.create_todo()
+        statements = self.record_statements()
+
+        for _ in range(2):
+            response = self.client.get('/v1/todo')
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(1, len(response.json["items"]))
+
+        self.assertEqual([], statements[None])
+        self.assertEqual([], statements["replica_0"])
+        self.assertGreater(len(statements["replica_1"]), 0)
+        router = self.app.extensions["replica_router"]
+        self.assertFalse(router.is_available("replica_0"))
+        self.assertTrue(router.is_available("replica_1"))
+
+    def test_get_all_falls_back_to_primary(self):
+        self.create_todo()
+        router = self.app.extensions["replica_router"]
+        router.mark_down("replica_0")
+        router.mark_down("replica_1")
+        statements = self.record_statements()
+
+        response = self.client.get('/v1/todo')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, len(response.json["items"]))
+        self.assertGreater(len(statements[None]), 0)
+        self.assertEqual([], statements["replica_1"])
+
+    def test_read_your_writes(self):
+        response = self.client.post(
+            '/v1/todo', json={"title": "test", "description": "test"}
+        )
+        self.assertEqual(201, response.status_code)
+        self.assertIn("primary_until", response.headers["Set-Cookie"])
+        statements = self.record_statements()
+
+        response = self.client.get('/v1/todo')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, len(response.json["items"]))
+        self.assertGreater(len(statements[None]), 0)
+        self.assertEqual([], statements["replica_1"])
+
+        self.client.delete_cookie("primary_until")
+        response = self.client.get('/v1/todo')
+        self.assertEqual(200, response.status_code)
+        self.assertGreater(len(statements["replica_1"]), 0)
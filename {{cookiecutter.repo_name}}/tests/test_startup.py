@@ -0,0 +1,42 @@
+from src.config import Config
+from src.create_app import create_app
+from src.domain import SQLALCHEMY_DATABASE_URI
+from src.startup import StartupTimer
+from tests.resources import AppTestBase
+
+
+class Test(AppTestBase):
+
+    def create_serving_app(self):
+        config = Config()
+        config["TESTING"] = True
+        config[SQLALCHEMY_DATABASE_URI] = \
+            self.app.config[SQLALCHEMY_DATABASE_URI]
+        return create_app(
+            config, setup_sqlalchemy=False, setup_management=False
+        )
+
+    def test_startup_phases(self):
+        timer = self.app.extensions["startup_timer"]
+        phases = timer.to_dict()["phases"]
+        self.assertIn("setup_blueprints", phases)
+        self.assertIn("setup_management", phases)
+        self.assertIn("setup_dependency_container", phases)
+        self.assertTrue(all(duration >= 0 for duration in phases.values()))
+
+    def test_startup_timer_run(self):
+        timer = StartupTimer()
+        app = timer.run(lambda app, value: app + value, 1, 2)
+        self.assertEqual(3, app)
+        self.assertEqual(["<lambda>"], [name for name, _ in timer.phases])
+
+    def test_serving_app_skips_management(self):
+        app = self.create_serving_app()
+        self.assertNotIn("migrate", app.extensions)
+        self.assertNotIn("pool-stats", app.cli.commands)
+        self.assertNotIn(
+            "setup_management",
+            app.extensions["startup_timer"].to_dict()["phases"]
+        )
+        self.assertIn("migrate", self.app.extensions)
+        self.assertIn("pool-stats", self.app.cli.commands)
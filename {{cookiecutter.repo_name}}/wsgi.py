@@ -1,9 +1,13 @@
 import logging
 import sys
 
-from src.app import app
+from src.config import Config
+from src.create_app import create_app
 
 logging.basicConfig(stream=sys.stderr)
 
+# Serving never runs the management commands, the flask cli uses src/app.py
+app = create_app(Config, setup_management=False)
+
 if __name__ == "__main__":
     app.run()